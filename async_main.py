@@ -0,0 +1,8 @@
+#!/usr/bin/env python3
+"""asyncio listener; the code lives in ultron/async_main.py.
+Kept so `python async_main.py` keeps working from a checkout."""
+
+from ultron.async_main import run
+
+if __name__ == "__main__":
+    run()
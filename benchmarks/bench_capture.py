@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Cost of recording GameQuery sessions with ultron.capture.
+
+  - overhead: position queries against the simulator with and without a
+    CaptureWriter on the MCBot
+  - size: bytes per record on disk vs the same traffic as JSON lines
+  - seek: reading a 10 s window of a long capture through the block index
+    vs decompressing the whole file
+
+    python benchmarks/bench_capture.py [queries] [capture minutes]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ultron.capture import CaptureReader, CaptureWriter
+from ultron.client import MCBot
+from ultron.simulator import start_simulator
+
+
+def bench_overhead(tmp: str, count: int):
+    print(f"\n🎥 Recorder overhead ({count} position queries, pooled)")
+    server = start_simulator(os.path.join(tmp, "latest.log"))
+    results = {}
+    try:
+        for label in ("off", "on"):
+            bot = MCBot(port=server.port)
+            if label == "on":
+                bot.recorder = CaptureWriter(os.path.join(tmp, "overhead.ucap"))
+            bot.send_query({"type": "position"})
+            start = time.perf_counter()
+            for _ in range(count):
+                bot.send_query({"type": "position"})
+            results[label] = time.perf_counter() - start
+            if bot.recorder is not None:
+                bot.recorder.close()
+            bot.close()
+    finally:
+        server.close()
+        server.player.close()
+    for label, elapsed in results.items():
+        print(f"   recorder {label:<3} {count / elapsed:9.0f} q/s  {elapsed / count * 1e6:6.1f} µs/query")
+    print(f"   overhead {(results['on'] - results['off']) / count * 1e6:+.1f} µs/query")
+
+
+def synthetic_session(path: str, minutes: float) -> int:
+    """A long capture: 4 position polls/s, a chat command every few seconds."""
+    rng = random.Random(5)
+    writer = CaptureWriter(path)
+    x = z = 0.0
+    records = 0
+    lines = 0
+    steps = int(minutes * 60 * 4)
+    # Drive the writer's clock by hand so the capture spans `minutes`
+    base = writer._t0
+    for i in range(steps):
+        writer._t0 = base - i * 0.25
+        x += rng.uniform(-1, 1)
+        z += rng.uniform(-1, 1)
+        writer.exchange({"type": "position"}, {"position": {"x": round(x, 3), "y": 60.0, "z": round(z, 3),
+                                                             "yaw": rng.uniform(-180, 180), "pitch": 0.0,
+                                                             "health": 20.0, "food": 20}}, 0.0004)
+        lines += 1
+        records += 1
+        if i % 16 == 0:
+            writer.log_block(f"[12:00:00] [Render thread/INFO]: [CHAT] <Steve> my farm {i}\n".encode())
+            writer.exchange({"type": "send_chat", "message": "#farm"},
+                            {"result": {"success": True, "message": "Message sent"}}, 0.0003)
+            records += 2
+    writer.close()
+    return records
+
+
+def bench_size_and_seek(tmp: str, minutes: float):
+    path = os.path.join(tmp, "long.ucap")
+    records = synthetic_session(path, minutes)
+    reader = CaptureReader(path)
+    jsonl = 0
+    for record in reader.records():
+        jsonl += len(record.payload) + 1
+    size = os.path.getsize(path) + os.path.getsize(path + ".idx")
+    print(f"\n💾 Size ({minutes:g} min, {records} records, {len(reader.blocks)} blocks)")
+    print(f"   capture + index {size / 1e3:9.1f} kB  {size / records:6.1f} B/record")
+    print(f"   JSON lines      {jsonl / 1e3:9.1f} kB  {jsonl / records:6.1f} B/record  ({jsonl / size:.1f}x larger)")
+
+    middle = reader.start + (reader.end - reader.start) / 2
+    start = time.perf_counter()
+    window = sum(1 for _ in reader.records(middle, middle + 10))
+    seek = time.perf_counter() - start
+    start = time.perf_counter()
+    scanned = sum(1 for r in reader.records() if middle <= r.time <= middle + 10)
+    scan = time.perf_counter() - start
+    assert window == scanned, (window, scanned)
+    print(f"\n⏩ 10 s window from the middle ({window} records)")
+    print(f"   indexed seek {seek * 1000:8.2f} ms")
+    print(f"   full scan    {scan * 1000:8.2f} ms  ({scan / seek:.0f}x)")
+
+    # A crash mid-block: the torn block is skipped, and recording resumes after the last good one
+    with open(path, "r+b") as f:
+        f.truncate(os.path.getsize(path) - 10)
+    os.remove(path + ".idx")
+    kept = len(CaptureReader(path))
+    with CaptureWriter(path) as writer:
+        writer.exchange({"type": "position"}, None, 0.001)
+    after = CaptureReader(path)
+    assert len(after) == kept + 2, (len(after), kept)
+    print(f"\n🩹 Torn last block: {records + 1 - kept} records dropped, resumed at {after.end:.1f}s")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    minutes = float(sys.argv[2]) if len(sys.argv) > 2 else 60
+    with tempfile.TemporaryDirectory() as tmp:
+        bench_overhead(tmp, count)
+        bench_size_and_seek(tmp, minutes)
+
+
+if __name__ == "__main__":
+    main()
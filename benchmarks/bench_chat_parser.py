@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: legacy per-line chat parsing vs chat_parser.
+
+Builds a synthetic latest.log (mostly non-chat noise, like a busy server)
+and times the old listener loop (decode + strip + split every line) against
+scan_chat over the raw blocks the LogTailer hands to the listener.
+
+    python benchmarks/bench_chat_parser.py [size_mb] [chat_percent]
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ultron.chat_parser import scan_chat
+
+NOISE = [
+    b"[12:00:01] [Render thread/INFO]: Loaded 12 advancements",
+    b"[12:00:01] [Server thread/WARN]: Can't keep up! Is the server overloaded? Running 2050ms or 41 ticks behind",
+    b"[12:00:02] [Render thread/INFO]: [Baritone] Pathing took 123ms, 512 nodes considered",
+    b"[12:00:02] [Worker-Main-4/INFO]: Reloading ResourceManager: vanilla, fabric",
+    b"[12:00:03] [Render thread/WARN]: Received passengers for unknown entity",
+]
+CHAT = [
+    b"[12:00:04] [Render thread/INFO]: [CHAT] <Steve> farm home",
+    b"[12:00:04] [Render thread/INFO]: [CHAT] <Alex> my farm is at 10 64 -20",
+    b"[12:00:05] [Render thread/INFO]: [CHAT] Notch whispers to you: go home",
+    b"[12:00:05] [Render thread/INFO]: [CHAT] Server restarting in 5 minutes",
+]
+
+
+def build_log(size_mb: float, chat_percent: float):
+    rng = random.Random(42)
+    lines, size = [], 0
+    while size < size_mb * 1024 * 1024:
+        line = rng.choice(CHAT if rng.random() * 100 < chat_percent else NOISE)
+        lines.append(line)
+        size += len(line) + 1
+    return lines, size
+
+
+def legacy(raw_lines):
+    """The listener loop from main() before chat_parser."""
+    events = []
+    for raw in raw_lines:
+        line = raw.decode('utf-8').strip()
+        if "[CHAT] <" in line:
+            user_and_msg = line.split("[CHAT] <", 1)[1]
+            user, msg = user_and_msg.split(">", 1)
+            events.append((user.strip(), msg.strip(), "chat"))
+        elif "[CHAT]" in line and "whispers to you:" in line:
+            after_chat = line.split("[CHAT]", 1)[1].strip()
+            user, msg = after_chat.split("whispers to you:", 1)
+            events.append((user.strip(), msg.strip(), "whisper"))
+    return events
+
+
+def legacy_from_block(block):
+    return legacy(block.split(b"\n")[:-1])
+
+
+def compiled(block):
+    return list(scan_chat(block))
+
+
+def bench(fn, block, size, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(block)
+        best = min(best, time.perf_counter() - start)
+    return result, best, size / best / (1024 * 1024)
+
+
+def main():
+    size_mb = float(sys.argv[1]) if len(sys.argv) > 1 else 16
+    chat_percent = float(sys.argv[2]) if len(sys.argv) > 2 else 2
+    raw_lines, size = build_log(size_mb, chat_percent)
+    block = b"\n".join(raw_lines) + b"\n"
+    print(f"📄 Synthetic log: {size / 1024 / 1024:.1f} MB, {len(raw_lines)} lines, ~{chat_percent}% chat")
+
+    old_events, old_time, old_rate = bench(legacy_from_block, block, size)
+    new_events, new_time, new_rate = bench(compiled, block, size)
+    assert [tuple(e) for e in new_events] == old_events, "parsers disagree"
+
+    print(f"   legacy:   {old_time * 1000:8.1f} ms  {old_rate:8.1f} MB/s")
+    print(f"   compiled: {new_time * 1000:8.1f} ms  {new_rate:8.1f} MB/s")
+    print(f"   speedup:  {old_time / new_time:.1f}x ({len(new_events)} chat events)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Decode throughput of GameQuery replies: legacy text framing vs ultron.codec.
+
+Builds `blocks` replies shaped like the mod's (one dict per non-air block)
+and measures, for every installed JSON backend:
+  - decode only: bytes -> dict
+  - framed: replies streamed over a socketpair and read back, the legacy
+    way (makefile('r') + readline + strip + json.loads) vs LineReader
+    (recv_into + memoryview framing)
+
+    python benchmarks/bench_codec.py [range] [replies]
+"""
+
+import json
+import os
+import random
+import socket
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ultron.codec import BACKENDS, LineReader, get_codec
+
+BLOCK_TYPES = ["stone", "dirt", "grass_block", "wheat[age=7]", "oak_log", "chest", "white_bed", "water"]
+
+
+def blocks_reply(r: int) -> dict:
+    rng = random.Random(42)
+    blocks = [{"type": f"Block{{minecraft:{rng.choice(BLOCK_TYPES)}}}", "x": x, "y": y, "z": z}
+              for x in range(-r, r + 1) for y in range(-r, r + 1) for z in range(-r, r + 1)
+              if rng.random() < 0.6]
+    return {"blocks": {"blocks": blocks}}
+
+
+def installed_codecs():
+    codecs = []
+    for name in BACKENDS:
+        try:
+            codecs.append(get_codec(name))
+        except ImportError:
+            print(f"   ({name} not installed)")
+    return codecs
+
+
+def bench_decode(payload: bytes, codecs, seconds: float = 1.0):
+    print(f"\n🧮 Decode only ({len(payload) / 1e6:.2f} MB reply)")
+    for codec in codecs:
+        n, start = 0, time.perf_counter()
+        while time.perf_counter() - start < seconds:
+            codec.decode(payload)
+            n += 1
+        elapsed = time.perf_counter() - start
+        print(f"   {codec.name:<8} {n / elapsed:8.1f} replies/s  {n * len(payload) / elapsed / 1e6:7.1f} MB/s")
+
+
+def _stream(payload: bytes, count: int):
+    """Socket pair with a thread writing `count` copies of payload."""
+    reader, writer = socket.socketpair()
+
+    def write():
+        with writer:
+            for _ in range(count):
+                writer.sendall(payload)
+
+    threading.Thread(target=write, daemon=True).start()
+    return reader
+
+
+def bench_framed(payload: bytes, count: int, codecs):
+    print(f"\n📡 Framed over a socket ({count} replies)")
+    results = {}
+
+    sock = _stream(payload, count)
+    start = time.perf_counter()
+    with sock, sock.makefile('r', encoding='utf-8') as f:
+        for _ in range(count):
+            json.loads(f.readline().strip())
+    results["legacy json"] = time.perf_counter() - start
+
+    for codec in codecs:
+        sock = _stream(payload, count)
+        start = time.perf_counter()
+        with sock:
+            reader = LineReader(sock, codec)
+            for _ in range(count):
+                reader.receive()
+        results[f"reader {codec.name}"] = time.perf_counter() - start
+
+    base = results["legacy json"]
+    for name, elapsed in results.items():
+        print(f"   {name:<15} {count / elapsed:8.1f} replies/s  "
+              f"{count * len(payload) / elapsed / 1e6:7.1f} MB/s  ({base / elapsed:.2f}x)")
+
+
+def main():
+    r = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    reply = blocks_reply(r)
+    payload = json.dumps(reply).encode() + b"\n"
+    print(f"🧱 blocks reply, range {r}: {len(reply['blocks']['blocks'])} blocks, {len(payload) / 1e6:.2f} MB")
+    codecs = installed_codecs()
+    bench_decode(payload, codecs)
+    bench_framed(payload, count, codecs)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+End-to-end benchmarks against the local GameQuery simulator.
+
+    queries  queries/sec and p50/p99 round trip for one-shot sockets, the
+             connection pool and pipelined batches
+    pickup   time from a chat line hitting latest.log to the listener
+             seeing the parsed command
+    farm     wall time of farm_command, and of a three-farm tour against
+             three separate farm trips
+    inventory  clearing junk from a full inventory: one drop query per slot
+             against Inventory.keep_only's planned, pipelined burst
+
+    python benchmarks/bench_gamequery.py [queries|pickup|farm|inventory|all] [latency_ms]
+"""
+
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from ultron.chat_parser import scan_chat
+from ultron.client import MCBot
+from ultron.log_tail import get_tailer
+from ultron.simulator import start_simulator
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def report(label, latencies, elapsed, count):
+    print(f"   {label:<12} {count / elapsed:9.0f} q/s   p50 {percentile(latencies, 50) * 1000:7.3f} ms   "
+          f"p99 {percentile(latencies, 99) * 1000:7.3f} ms")
+
+
+def bench_queries(server, n=2000, batch_size=50):
+    print(f"\n⚡ Query throughput ({n} position queries, {server.latency * 1000:.1f} ms injected latency)")
+    for label, pooled in (("one-shot", False), ("pooled", True)):
+        client = MCBot("127.0.0.1", server.port, pooled=pooled)
+        latencies = []
+        start = time.perf_counter()
+        for _ in range(n):
+            t0 = time.perf_counter()
+            client.send_query({"type": "position"})
+            latencies.append(time.perf_counter() - t0)
+        report(label, latencies, time.perf_counter() - start, n)
+        client.close()
+
+    client = MCBot("127.0.0.1", server.port)
+    latencies = []
+    start = time.perf_counter()
+    for _ in range(n // batch_size):
+        t0 = time.perf_counter()
+        client.batch([{"type": "position"}] * batch_size)
+        latencies.append((time.perf_counter() - t0) / batch_size)
+    report(f"batch({batch_size})", latencies, time.perf_counter() - start, n // batch_size * batch_size)
+    client.close()
+
+
+def bench_pickup(server, log_path, n=200):
+    print(f"\n📨 Log-to-command pickup ({n} chat lines)")
+    cursor = get_tailer(log_path).subscribe(chunks=True)
+    written = {}
+    latencies = []
+    done = threading.Event()
+
+    def listen():
+        # Same loop shape as main.listen_for_chat
+        for block in cursor.follow_chunks():
+            now = time.perf_counter()
+            for user, msg, kind in scan_chat(block):
+                if msg.startswith("bench "):
+                    latencies.append(now - written[msg])
+                    if len(latencies) == n:
+                        done.set()
+                        return
+
+    threading.Thread(target=listen, daemon=True).start()
+    time.sleep(0.2)
+    for i in range(n):
+        msg = f"bench {i}"
+        written[msg] = time.perf_counter()
+        server.player.say("Steve", msg)
+        time.sleep(0.01)
+    done.wait(10)
+    cursor.close()
+    if not latencies:
+        print("   ❌ listener saw no chat lines")
+        return
+    print(f"   pickup       p50 {percentile(latencies, 50) * 1000:7.2f} ms   p99 {percentile(latencies, 99) * 1000:7.2f} ms"
+          f"   mean {statistics.mean(latencies) * 1000:.2f} ms   ({len(latencies)}/{n} seen)")
+
+
+def bench_farm(server, log_path, workdir):
+    print("\n🚜 End-to-end farm routine")
+    os.environ["LOG_PATH"] = log_path
+    os.environ["FARMS_DB"] = os.path.join(workdir, "farms.db")
+    os.environ["TRAVEL_TIMES_FILE"] = os.path.join(workdir, "travel_times.json")
+    os.environ["FARM_TOUR_WINDOW"] = "0"
+    from ultron import main
+
+    home = tuple(server.player.pos)
+    main.HOME_COORDS = home
+    offsets = [(40, 0, 0), (40, 0, 40), (0, 0, 40)]
+    for i, (dx, dy, dz) in enumerate(offsets):
+        farm = (home[0] + dx, home[1] + dy, home[2] + dz)
+        main.get_farms().set(f"Farmer{i}", farm)
+        server.player.world.place(int(farm[0]) - 2, int(farm[1]), int(farm[2]), "chest")
+    client = main.MCBot("127.0.0.1", server.port)
+
+    start = time.perf_counter()
+    main.farm_command(client, "Farmer0", log_path=log_path)
+    single = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for i in range(len(offsets)):
+        main.farm_command(client, f"Farmer{i}", log_path=log_path)
+    sequential = time.perf_counter() - start
+
+    start = time.perf_counter()
+    main.farm_tour(client, [(f"Farmer{i}", main.get_farms().get(f"Farmer{i}")) for i in range(len(offsets))],
+                   log_path=log_path)
+    tour = time.perf_counter() - start
+    client.close()
+
+    print(f"\n   farm_command        {single:6.1f} s")
+    print(f"   3 farms, one by one {sequential:6.1f} s")
+    print(f"   3 farms, one tour   {tour:6.1f} s  ({sequential / tour:.2f}x)")
+
+
+JUNK_INVENTORY = (["cobblestone"] * 12 + ["dirt"] * 8 + ["wheat_seeds"] * 6 + ["wheat"] * 4
+                  + ["diamond_pickaxe", "iron_axe", "bread", "cooked_beef", "rotten_flesh", "bone"])
+
+
+def bench_inventory(server, runs=5):
+    print(f"\n🎒 Clearing junk from {len(JUNK_INVENTORY)} stacks ({server.latency * 1000:.1f} ms injected latency)")
+
+    def fill():
+        with server.player.lock:
+            server.player.inventory = {slot: (item, 64) for slot, item in enumerate(JUNK_INVENTORY)}
+
+    client = MCBot("127.0.0.1", server.port)
+    client.inventory.probe()
+    keep = {slot for slot, item in enumerate(JUNK_INVENTORY) if item in ("diamond_pickaxe", "iron_axe", "bread", "cooked_beef")}
+    serial, bulk, queries = [], [], 0
+    for _ in range(runs):
+        fill()
+        start = time.perf_counter()
+        for slot in range(len(JUNK_INVENTORY)):
+            if slot not in keep:
+                client.send_query({"type": "drop_item", "slot": slot})
+        serial.append(time.perf_counter() - start)
+
+        fill()
+        client.inventory.invalidate()
+        start = time.perf_counter()
+        client.inventory.keep_only(("tools", "food"))
+        bulk.append(time.perf_counter() - start)
+        left = {item for item, _ in server.player.inventory.values()}
+        assert left == {"diamond_pickaxe", "iron_axe", "bread", "cooked_beef"}, left
+    queries = len(JUNK_INVENTORY) - len(keep)
+    client.close()
+    print(f"   one query per slot  {statistics.median(serial) * 1000:7.1f} ms  ({queries} round trips)")
+    print(f"   keep_only burst     {statistics.median(bulk) * 1000:7.1f} ms  "
+          f"(snapshot + {client.inventory.queries_saved // runs} fewer queries, one batch)")
+
+
+def main():
+    suite = sys.argv[1] if len(sys.argv) > 1 else "all"
+    latency = float(sys.argv[2]) / 1000 if len(sys.argv) > 2 else 0.0
+    workdir = tempfile.mkdtemp(prefix="ultron-bench-")
+    log_path = os.path.join(workdir, "latest.log")
+    server = start_simulator(log_path, latency=latency, speed=20.0, farm_time=2.0)
+    print(f"🧪 Simulator on port {server.port}, log {log_path}")
+    try:
+        if suite in ("queries", "all"):
+            bench_queries(server)
+        if suite in ("pickup", "all"):
+            bench_pickup(server, log_path)
+        if suite in ("inventory", "all"):
+            bench_inventory(server)
+        if suite in ("farm", "all"):
+            bench_farm(server, log_path, workdir)
+    finally:
+        server.close()
+
+
+if __name__ == "__main__":
+    main()
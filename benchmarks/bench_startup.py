@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Cold-start cost of the bot: how long `import ultron.main` takes in a fresh
+interpreter, and which imports it goes to (from `python -X importtime`).
+
+Also checks that the optional, slow dependencies (requests, keyboard,
+dotenv, asyncio, numpy, sqlite3) are not pulled in by the import itself.
+
+    python benchmarks/bench_startup.py [runs] [module]
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LAZY = ("requests", "keyboard", "dotenv", "asyncio", "numpy", "sqlite3")
+
+
+def run_python(args, env):
+    return subprocess.run([sys.executable] + args, cwd=ROOT, env=env, capture_output=True, text=True)
+
+
+def parse_importtime(stderr):
+    """{module: (self_us, cumulative_us)} from -X importtime output."""
+    rows = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative, name = line.split(":", 1)[1].split("|")
+        rows[name.strip()] = (int(self_us), int(cumulative))
+    return rows
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    module = sys.argv[2] if len(sys.argv) > 2 else "ultron.main"
+    env = dict(os.environ, PYTHONPATH=ROOT + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    # Warm the bytecode cache so every run measures the same thing
+    run_python(["-c", f"import {module}"], env)
+
+    print(f"🚀 Startup: import {module} ({runs} runs)")
+    walls = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = run_python(["-c", f"import {module}"], env)
+        walls.append(time.perf_counter() - start)
+        if result.returncode != 0:
+            print(result.stderr)
+            return
+    baseline = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        run_python(["-c", "pass"], env)
+        baseline.append(time.perf_counter() - start)
+    print(f"   interpreter + import   median {statistics.median(walls) * 1000:6.1f} ms")
+    print(f"   bare interpreter       median {statistics.median(baseline) * 1000:6.1f} ms")
+    print(f"   import only            ~{(statistics.median(walls) - statistics.median(baseline)) * 1000:6.1f} ms")
+
+    samples = [parse_importtime(run_python(["-X", "importtime", "-c", f"import {module}"], env).stderr)
+               for _ in range(min(runs, 5))]
+    names = set().union(*samples)
+    cumulative = {name: statistics.median(s[name][1] for s in samples if name in s) for name in names}
+    self_time = {name: statistics.median(s[name][0] for s in samples if name in s) for name in names}
+    print(f"\n   {'cumulative':>10}  {'self':>8}  module")
+    for name in sorted(cumulative, key=cumulative.get, reverse=True)[:15]:
+        print(f"   {cumulative[name] / 1000:8.1f}ms  {self_time[name] / 1000:6.1f}ms  {name}")
+
+    check = run_python(["-c", f"import sys, {module}; print(' '.join(m for m in {LAZY!r} if m in sys.modules))"], env)
+    loaded = check.stdout.split()
+    if loaded:
+        print(f"\n   ⚠️ Loaded at import time: {', '.join(loaded)}")
+    else:
+        print(f"\n   ✅ None of {', '.join(LAZY)} loaded at import time")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,8 @@
+#!/usr/bin/env python3
+"""Bot fleet orchestrator; the code lives in ultron/orchestrator.py.
+Kept so `python orchestrator.py` keeps working from a checkout."""
+
+from ultron.orchestrator import main
+
+if __name__ == "__main__":
+    main()
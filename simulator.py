@@ -0,0 +1,8 @@
+#!/usr/bin/env python3
+"""GameQuery simulator; the code lives in ultron/simulator.py.
+Kept so `python simulator.py` keeps working from a checkout."""
+
+from ultron.simulator import main
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,9 @@
+import os
+import tempfile
+
+# Tests that reach ultron.main's shared state (opened on first use) keep it out of the checkout
+_state = tempfile.mkdtemp(prefix="ultron-tests-")
+for name, default in (("FARMS_DB", "farms.db"), ("TRAVEL_TIMES_FILE", "travel_times.json"),
+                      ("PLANS_FILE", "plans.json"), ("REPLAY_CHECKPOINT", "log_checkpoint.json")):
+    os.environ[name] = os.path.join(_state, default)
+os.environ.setdefault("LOG_PATH", os.path.join(_state, "latest.log"))
@@ -0,0 +1,61 @@
+import asyncio
+import json
+import threading
+
+from ultron.async_bot import AsyncInputController
+
+
+async def http_server(responses):
+    """Minimal keep-alive HTTP server; records (path, body) per connection."""
+    seen = []
+
+    async def handle(reader, writer):
+        conn = []
+        seen.append(conn)
+        while True:
+            request = await reader.readline()
+            if not request:
+                break
+            length = 0
+            while (line := await reader.readline()) not in (b"\r\n", b""):
+                name, _, value = line.decode().partition(":")
+                if name.lower() == "content-length":
+                    length = int(value)
+            conn.append((request.split()[1].decode(), json.loads(await reader.readexactly(length))))
+            writer.write(responses.pop(0) if responses else
+                         b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\nok")
+            await writer.drain()
+        writer.close()
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    return server, seen
+
+
+def test_posts_share_one_connection_without_threads():
+    async def run():
+        chunked = b"HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\n2\r\nok\r\n0\r\n\r\n"
+        server, seen = await http_server([chunked])
+        port = server.sockets[0].getsockname()[1]
+        inputs = AsyncInputController(f"http://127.0.0.1:{port}/api")
+        threads = threading.active_count()
+        assert await inputs.set(holdUse=True)
+        assert await inputs.set(holdUse=True)   # unchanged: skipped
+        assert await inputs.set(holdUse=False)
+        assert threading.active_count() == threads
+        await inputs.close()
+        server.close()
+        return seen, inputs
+
+    seen, inputs = asyncio.run(run())
+    assert len(seen) == 1
+    assert [path for path, _ in seen[0]] == ["/api/lock-inputs"] * 2
+    assert seen[0][1][1]["holdUse"] is False
+    assert inputs.posts == 2 and inputs.skipped == 1
+
+
+def test_unreachable_cheat_utils_fails_cleanly():
+    async def run():
+        inputs = AsyncInputController("http://127.0.0.1:1/api", timeout=0.5)
+        return await inputs.post("lock-inputs", {"holdUse": False})
+
+    assert asyncio.run(run()) is False
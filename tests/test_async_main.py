@@ -0,0 +1,67 @@
+import asyncio
+
+from ultron import async_main
+
+
+class FakeClient:
+    def __init__(self):
+        self.sent = []
+
+    async def send_chat_message(self, message):
+        self.sent.append(message)
+        return {"result": {"success": True}}
+
+
+def test_handle_chat_uses_the_command_table(monkeypatch):
+    async def run():
+        client = FakeClient()
+        routines = async_main.RoutineRunner()
+        running = asyncio.Event()
+
+        async def fake_home(client):
+            running.set()
+            await asyncio.sleep(60)
+
+        monkeypatch.setattr(async_main, "home_command", fake_home)
+        assert await async_main.handle_chat(client, "alex", "find a diamond_ore", routines)
+        assert await async_main.handle_chat(client, "alex", "Follow me", routines)
+        assert not await async_main.handle_chat(client, "alex", "farmer joe says hi", routines)
+        assert await async_main.handle_chat(client, "alex", "go home", routines)
+        await asyncio.wait_for(running.wait(), 1)
+        assert await async_main.handle_chat(client, "alex", "stop", routines)
+        await asyncio.sleep(0)
+        return client.sent, routines.task.cancelled()
+
+    sent, cancelled = asyncio.run(run())
+    assert sent == ["#goto diamond_ore", "#follow player alex", "#stop"]
+    assert cancelled
+
+
+def test_cancelled_farm_turns_farming_settings_off(monkeypatch):
+    class Farms:
+        def get(self, player, name=None):
+            return type("Farm", (), {"coords": (1, 60, 1)})()
+
+    async def forever(client, timeout=300):
+        await asyncio.sleep(60)
+
+    async def run():
+        client = FakeClient()
+
+        async def goto(*args, **kwargs):
+            return True
+
+        client.goto = goto
+        task = asyncio.ensure_future(async_main.farm_command(client, "alex"))
+        while "#farm" not in client.sent:
+            await asyncio.sleep(0)
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        return client.sent
+
+    monkeypatch.setattr(async_main.sync_main, "get_farms", Farms)
+    monkeypatch.setattr(async_main, "wait_for_farm_completion", forever)
+    assert asyncio.run(run())[-2:] == ["#settings allowBreak false", "#settings allowPlace false"]
@@ -0,0 +1,117 @@
+import os
+import random
+import threading
+import zlib
+
+import pytest
+
+from ultron.capture import EXCHANGE, LOG, SESSION, CaptureReader, CaptureWriter, index_path
+
+LOG_BLOCK = (b"[12:00:00] [Render thread/INFO]: Loaded 12 advancements\n"
+             b"[12:00:01] [Render thread/INFO]: [CHAT] <Steve> farm home\n"
+             b"[12:00:02] [Render thread/INFO]: [CHAT] [Baritone] Farm goal reached")
+
+
+def record_session(path, steps=200, seed=1, **options):
+    """A capture whose clock is driven by hand: one record every 0.1 s."""
+    rng = random.Random(seed)
+    expected = []
+    writer = CaptureWriter(path, meta={"bot": "test"}, **options)
+    base = writer._t0
+    for i in range(steps):
+        writer._t0 = base - i * 0.1
+        if i % 10 == 9:
+            writer.log_block(LOG_BLOCK)
+            expected += [(LOG, LOG_BLOCK.split(b"\n")[1]), (LOG, LOG_BLOCK.split(b"\n")[2])]
+        elif i % 7 == 0:
+            queries = [{"type": "position"}, {"type": "get_block", "x": i, "y": 60, "z": -i}]
+            replies = [{"position": {"x": rng.random(), "y": 60.0, "z": 0.0}}, None]
+            writer.exchanges(queries, replies, 0.002)
+            expected += [(EXCHANGE, (queries[0], replies[0])), (EXCHANGE, (queries[1], None))]
+        else:
+            query = {"type": "send_chat", "message": f"#goto {i} 60 {-i}"}
+            reply = {"result": {"success": True, "message": "Message sent ✅"}}
+            writer.exchange(query, reply, 0.001)
+            expected.append((EXCHANGE, (query, reply)))
+    writer.close()
+    return expected
+
+
+def decoded(reader, records):
+    out = []
+    for record in records:
+        if record.kind == EXCHANGE:
+            duration, query, reply = reader.decode_exchange(record.payload)
+            assert 0 < duration < 0.01
+            out.append((EXCHANGE, (query, reply)))
+        elif record.kind == LOG:
+            out.append((LOG, record.payload))
+    return out
+
+
+@pytest.mark.parametrize("block_records", [1, 16, 512])
+def test_write_read_round_trip(tmp_path, block_records):
+    path = str(tmp_path / "session.ucap")
+    expected = record_session(path, block_records=block_records, flush_interval=3.0)
+    reader = CaptureReader(path)
+    assert len(reader) == len(expected) + 1  # plus the session record
+    assert reader.session()["bot"] == "test"
+    assert decoded(reader, reader.records()) == expected
+    assert reader.start == pytest.approx(0.0, abs=0.1)
+    assert reader.end == pytest.approx(19.9, abs=0.1)
+    summary = reader.summary()
+    assert summary["failed_queries"] == sum(1 for kind, item in expected if kind == EXCHANGE and item[1] is None)
+    assert summary["records"]["session"] == 1
+
+
+def test_time_windows_match_a_full_scan(tmp_path):
+    path = str(tmp_path / "session.ucap")
+    record_session(path, block_records=8)
+    reader = CaptureReader(path)
+    every = list(reader.records())
+    rng = random.Random(2)
+    for _ in range(30):
+        lo = rng.uniform(-1, 21)
+        hi = lo + rng.uniform(0, 5)
+        assert list(reader.records(lo, hi)) == [r for r in every if lo <= r.time <= hi]
+    assert list(reader.records(kinds=(SESSION,))) == every[:1]
+
+
+def test_missing_index_and_torn_block_resume(tmp_path):
+    path = str(tmp_path / "session.ucap")
+    record_session(path, block_records=8)
+    full = len(CaptureReader(path))
+    os.remove(index_path(path))
+    assert len(CaptureReader(path)) == full  # rebuilt by scanning block headers
+
+    with open(path, "r+b") as f:
+        f.truncate(os.path.getsize(path) - 3)  # crash mid-block
+    kept = len(CaptureReader(path))
+    assert full - 8 <= kept < full
+    with CaptureWriter(path) as writer:
+        writer.exchange({"type": "position"}, None, 0.0)
+    after = CaptureReader(path)
+    assert len(after) == kept + 2  # a new session record and the exchange
+    assert after.end >= 19.0  # the clock continues from the old capture
+
+
+def test_blocks_are_compressed_off_the_recording_thread(tmp_path, monkeypatch):
+    from ultron import capture
+
+    threads = set()
+    original = zlib.compressobj
+
+    def compressobj(*args, **kwargs):
+        threads.add(threading.current_thread().name)
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(capture.zlib, "compressobj", compressobj)
+    path = str(tmp_path / "s.ucap")
+    writer = CaptureWriter(path, block_records=4)
+    for i in range(20):
+        writer.exchange({"type": "position"}, {"position": {"x": i}}, 0.001)
+    writer.flush()
+    assert writer.stats()["blocks"] == 6 and writer.stats()["queued_blocks"] == 0
+    writer.close()
+    assert threads == {"capture-writer"}
+    assert sum(1 for record in CaptureReader(path).records() if record.kind == EXCHANGE) == 20
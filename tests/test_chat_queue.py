@@ -0,0 +1,160 @@
+import threading
+
+from ultron.chat_queue import ChatQueue
+
+
+class Baritone:
+    """Records sends; the first one blocks until released so later messages queue up."""
+
+    def __init__(self, fail=()):
+        self.sent = []
+        self.fail = set(fail)
+        self.release = threading.Event()
+        self.started = threading.Event()
+
+    def send(self, message):
+        if not self.sent:
+            self.started.set()
+            self.release.wait(5)
+        self.sent.append(message)
+        return {"result": {"success": message not in self.fail}}
+
+
+def blocked_queue(baritone):
+    queue = ChatQueue(baritone.send)
+    first = queue.submit("#farm")
+    assert baritone.started.wait(2)
+    return queue, first
+
+
+def result(item):
+    assert item.done.wait(2)
+    return item.response["result"]
+
+
+def test_redundant_settings_are_dropped():
+    baritone = Baritone()
+    baritone.release.set()
+    queue = ChatQueue(baritone.send)
+    assert queue.send("#settings allowBreak true")["result"]["success"]
+    repeat = queue.send("#settings allowBreak true")["result"]
+    assert repeat["skipped"] and repeat["success"]
+    queue.send("#settings allowBreak false")
+    queue.close()
+    assert baritone.sent == ["#settings allowBreak true", "#settings allowBreak false"]
+    assert queue.stats()["dropped"] == 1
+
+
+def test_failed_setting_is_forgotten_and_resent():
+    baritone = Baritone(fail={"#settings allowPlace true"})
+    baritone.release.set()
+    queue = ChatQueue(baritone.send)
+    assert not queue.send("#settings allowPlace true")["result"]["success"]
+    queue.send("#settings allowPlace true")
+    queue.close()
+    assert baritone.sent == ["#settings allowPlace true"] * 2
+
+
+def test_newer_goto_supersedes_a_waiting_one():
+    baritone = Baritone()
+    queue, first = blocked_queue(baritone)
+    older = queue.submit("#goto 1 60 1")
+    newer = queue.submit("#goto 2 60 2")
+    assert older is not newer
+    superseded = result(older)
+    assert superseded["skipped"] and not superseded["success"]
+    baritone.release.set()
+    assert result(newer)["success"]
+    queue.close()
+    assert baritone.sent == ["#farm", "#goto 2 60 2"]
+
+
+def test_stop_drops_waiting_gotos_and_waiting_stops_merge():
+    baritone = Baritone()
+    queue, first = blocked_queue(baritone)
+    goto = queue.submit("#goto 1 60 1")
+    stop = queue.submit("#stop")
+    again = queue.submit("#stop")
+    assert again is stop
+    assert not result(goto)["success"]
+    baritone.release.set()
+    assert result(stop)["success"]
+    # Right after a #stop with nothing queued in between, another is redundant
+    assert queue.send("#stop")["result"]["skipped"]
+    queue.close()
+    assert baritone.sent == ["#farm", "#stop"]
+
+
+def test_superseded_goto_fails_fast_in_mcbot(monkeypatch):
+    from ultron.client import MCBot
+
+    bot = MCBot(port=1)
+    monkeypatch.setattr(bot, "look_at", lambda x, y, z: None)
+    monkeypatch.setattr(bot.chat, "send", lambda message, timeout=30: {
+        "result": {"success": False, "message": "superseded by a newer #goto", "skipped": True}})
+    monkeypatch.setattr(bot, "get_position", lambda max_age=None: pytest_fail())
+    assert bot.goto(5, 60, 5) is False
+    assert bot.last_trip is None
+
+
+def pytest_fail():
+    raise AssertionError("a superseded goto must not poll for arrival")
+
+
+def test_async_queue_dedups_settings_and_rate_limits():
+    import asyncio
+
+    from ultron.async_bot import AsyncChatQueue
+
+    async def run():
+        sent = []
+
+        async def send(message):
+            sent.append(message)
+            return {"result": {"success": True}}
+
+        queue = AsyncChatQueue(send, chat_rate=20, chat_burst=1)
+        await queue.send("#settings allowBreak true")
+        repeat = await queue.send("#settings allowBreak true")
+        await asyncio.gather(queue.send("hello"), queue.send("world"))
+        await queue.close()
+        return sent, repeat, queue.stats()
+
+    sent, repeat, stats = asyncio.run(run())
+    assert repeat["result"]["skipped"]
+    assert sent == ["#settings allowBreak true", "hello", "world"]
+    assert stats["dropped"] == 1 and stats["rate_limited_seconds"] > 0
+
+
+def test_async_goto_is_superseded_and_fails_fast():
+    import asyncio
+
+    from ultron.async_bot import AsyncMCBot
+
+    async def run():
+        bot = AsyncMCBot(port=1)
+        release = asyncio.Event()
+        sent = []
+
+        async def send(message):
+            if not sent:
+                await release.wait()
+            sent.append(message)
+            return {"result": {"success": True}}
+
+        async def look_at(x, y, z):
+            return None
+
+        bot.chat._send = send
+        bot.look_at = look_at
+        bot.chat.submit("#farm")
+        await asyncio.sleep(0)
+        older = asyncio.ensure_future(bot.goto(1, 60, 1))
+        await asyncio.sleep(0)
+        bot.chat.submit("#goto 2 60 2")
+        arrived = await asyncio.wait_for(older, 2)
+        release.set()
+        await bot.close()
+        return arrived, bot.last_trip
+
+    assert asyncio.run(run()) == (False, None)
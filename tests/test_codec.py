@@ -0,0 +1,71 @@
+import random
+import socket
+import threading
+
+import pytest
+
+from ultron.codec import BACKENDS, LineReader, get_codec
+
+MESSAGES = [
+    {"type": "position"},
+    {"position": {"x": -4188.5, "y": 59.0, "z": 4259.25, "yaw": 12.5}},
+    {"blocks": {"blocks": [{"type": "Block{minecraft:white_bed}", "x": i, "y": 60, "z": -i} for i in range(300)]}},
+    {"result": {"success": True, "message": "Message sent — ✅"}},
+    [],
+]
+
+
+def codecs():
+    found = []
+    for name in BACKENDS:
+        try:
+            found.append(get_codec(name))
+        except ImportError:
+            pass
+    return found
+
+
+@pytest.mark.parametrize("codec", codecs(), ids=lambda c: c.name)
+def test_encode_decode_round_trip(codec):
+    for message in MESSAGES:
+        line = codec.encode_line(message)
+        assert line.endswith(b"\n") and line.count(b"\n") == 1
+        assert codec.decode(memoryview(line)[:-1]) == message
+
+
+@pytest.mark.parametrize("size", [8, 64, 1 << 16])
+def test_line_reader_frames_split_stream(size):
+    codec = get_codec("json")
+    payload = b"".join(codec.encode_line(m) for m in MESSAGES)
+    # Blank lines and CRLF endings are tolerated between replies
+    payload = b"\r\n" + payload.replace(b"\n", b"\r\n", 1) + b"\n" + codec.encode_line(MESSAGES[0])
+    ours, theirs = socket.socketpair()
+    rng = random.Random(size)
+
+    def send():
+        pos = 0
+        while pos < len(payload):
+            step = rng.randint(1, 97)
+            theirs.sendall(payload[pos:pos + step])
+            pos += step
+        theirs.close()
+
+    sender = threading.Thread(target=send)
+    sender.start()
+    reader = LineReader(ours, codec, size=size)
+    try:
+        assert [reader.receive() for _ in range(len(MESSAGES) + 1)] == MESSAGES + [MESSAGES[0]]
+        with pytest.raises(ConnectionError):
+            reader.receive()
+    finally:
+        sender.join()
+        ours.close()
+
+
+def test_read_line_returns_raw_bytes_then_none():
+    ours, theirs = socket.socketpair()
+    theirs.sendall(b'{"a":1}\n\n{"b":2}\n')
+    theirs.close()
+    reader = LineReader(ours, get_codec("json"), size=4)
+    assert [reader.read_line() for _ in range(4)] == [b'{"a":1}', b"", b'{"b":2}', None]
+    ours.close()
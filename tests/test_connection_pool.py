@@ -0,0 +1,110 @@
+import json
+import socket
+import threading
+import time
+
+import pytest
+
+from ultron.client import MCBot
+from ultron.connection_pool import ConnectionPool, retry_safe
+
+
+class LineServer:
+    """Answers each query line with {"ok": n}; closes a connection after
+    `per_connection` replies if set. Records every query it read."""
+
+    def __init__(self, per_connection=None):
+        self.per_connection = per_connection
+        self.received = []
+        self.conns = []
+        self.sock = socket.create_server(("127.0.0.1", 0))
+        self.port = self.sock.getsockname()[1]
+        threading.Thread(target=self._accept, daemon=True).start()
+
+    def _accept(self):
+        while True:
+            try:
+                conn, _ = self.sock.accept()
+            except OSError:
+                return
+            self.conns.append(conn)
+            threading.Thread(target=self._serve, args=(conn,), daemon=True).start()
+
+    def _serve(self, conn):
+        served = 0
+        with conn, conn.makefile("rb") as f:
+            for line in f:
+                query = json.loads(line)
+                self.received.append(query)
+                conn.sendall(json.dumps({"ok": len(self.received)}).encode() + b"\n")
+                served += 1
+                if self.per_connection and served >= self.per_connection:
+                    return
+
+    def drop_all(self):
+        for conn in self.conns:
+            try:
+                conn.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+    def close(self):
+        self.sock.close()
+
+
+@pytest.fixture
+def server():
+    s = LineServer(per_connection=1)
+    yield s
+    s.close()
+
+
+def test_retry_safe():
+    assert retry_safe([{"type": "position"}, {"type": "get_block"}])
+    assert not retry_safe([{"type": "position"}, {"type": "drop_item", "slot": 1}])
+
+
+def test_unsafe_batch_is_not_resent(server):
+    bot = MCBot(port=server.port)
+    try:
+        drops = [{"type": "drop_item", "slot": s} for s in range(3)]
+        replies = bot.batch(drops)
+    finally:
+        bot.close()
+    assert replies[0] == {"ok": 1}
+    assert replies[1:] == [None, None]
+    # The server only ever saw the one query it answered (the rest were lost
+    # with the connection and not sent again)
+    assert [q["slot"] for q in server.received] == [0]
+
+
+def test_safe_batch_is_resent(server):
+    bot = MCBot(port=server.port)
+    try:
+        replies = bot.batch([{"type": "get_block", "x": x, "y": 0, "z": 0} for x in range(3)])
+    finally:
+        bot.close()
+    assert all(r is not None for r in replies)
+    assert [q["x"] for q in server.received] == [0, 1, 2]
+
+
+def test_stale_idle_socket_is_replaced_before_writing():
+    server = LineServer()
+    restarts = []
+    pool = ConnectionPool("127.0.0.1", server.port, size=2, on_stale=lambda: restarts.append(1))
+    try:
+        with pool.connection() as conn:
+            assert conn.request({"type": "send_chat", "message": "hi"}) == {"ok": 1}
+        server.drop_all()
+        # Wait until the close has reached our side
+        deadline = time.monotonic() + 2
+        while not conn.is_stale() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        with pool.connection() as conn2:
+            assert conn2 is not conn
+            assert conn2.request({"type": "send_chat", "message": "again"}) == {"ok": 2}
+        assert restarts == [1]
+        assert [q["message"] for q in server.received] == ["hi", "again"]
+    finally:
+        pool.close()
+        server.close()
@@ -0,0 +1,49 @@
+import pytest
+
+from ultron import main
+from ultron.dispatcher import CommandContext
+from ultron.farm_registry import FarmRegistry
+
+
+class Job:
+    def __init__(self, ctx):
+        self.ctx = ctx
+
+
+class Jobs:
+    def __init__(self, queued):
+        self.queued = queued
+        self.recorded = []
+
+    def take(self, phrase):
+        taken, self.queued = self.queued, []
+        return taken
+
+    def record(self, job, ok):
+        self.recorded.append((job.ctx.user, ok))
+
+
+class Dispatcher:
+    log_path = None
+
+    def __init__(self, jobs):
+        self.jobs = jobs
+
+
+def test_joined_jobs_recorded_as_failed_when_tour_raises(tmp_path, monkeypatch):
+    registry = FarmRegistry(str(tmp_path / "farms.db"), legacy_path=None)
+    registry.set("Steve", (0, 60, 0))
+    registry.set("Alex", (50, 60, 0))
+    monkeypatch.setattr(main, "get_farms", lambda: registry)
+    monkeypatch.setattr(main, "FARM_TOUR_WINDOW", 0)
+
+    def broken_tour(*args, **kwargs):
+        raise RuntimeError("connection lost")
+    monkeypatch.setattr(main, "farm_tour", broken_tour)
+
+    jobs = Jobs([Job(CommandContext(None, "Alex", "farm home", "", None))])
+    ctx = CommandContext(None, "Steve", "farm home", "", Dispatcher(jobs))
+    with pytest.raises(RuntimeError, match="connection lost"):
+        main.farm_home_handler(ctx)
+    assert jobs.recorded == [("Alex", False)]
+    registry.close()
@@ -0,0 +1,47 @@
+from ultron import farm_registry
+from ultron.farm_registry import FarmRegistry
+
+
+def test_remove_persists_and_compacts(tmp_path, monkeypatch):
+    monkeypatch.setattr(farm_registry, "COMPACT_AFTER", 2)
+    path = str(tmp_path / "farms.db")
+    registry = FarmRegistry(path, legacy_path=None)
+    for i in range(4):
+        registry.set("Steve", (i * 100, 60, 0), f"f{i}")
+    compactions = []
+    original = registry.compact
+    monkeypatch.setattr(registry, "compact", lambda: (compactions.append(1), original()))
+
+    assert registry.remove("Steve", "F1")
+    assert not registry.remove("Steve", "f1")
+    assert registry.remove("Steve", "f2")
+    assert compactions == [1]
+    assert [f.name for f, _ in registry.near((0, 60, 0), limit=5)] == ["f0", "f3"]
+    registry.close()
+
+    reopened = FarmRegistry(path, legacy_path=None)
+    assert [f.name for f in reopened.farms_for("Steve")] == ["f0", "f3"]
+    reopened.close()
+
+
+def test_forget_farm_command(tmp_path, monkeypatch):
+    from ultron import main
+    from ultron.dispatcher import CommandContext
+
+    registry = FarmRegistry(str(tmp_path / "farms.db"), legacy_path=None)
+    registry.set("Steve", (1, 2, 3))
+    monkeypatch.setattr(main, "get_farms", lambda: registry)
+
+    class Client:
+        def __init__(self):
+            self.sent = []
+
+        def send_chat_message(self, msg):
+            self.sent.append(msg)
+
+    client = Client()
+    main.forget_farm_handler(CommandContext(client, "Steve", "forget farm", "", None))
+    main.forget_farm_handler(CommandContext(client, "Steve", "forget farm", "", None))
+    assert registry.get("Steve") is None
+    assert client.sent == ["Forgot your farm main", "Steve, you have no farm called main"]
+    registry.close()
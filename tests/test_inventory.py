@@ -0,0 +1,67 @@
+from ultron.inventory import Inventory, ItemStack
+
+
+def stacks(*items):
+    return {slot: ItemStack(slot, item, 1) for slot, item in enumerate(items)}
+
+
+def test_plan_drops_uses_names_only_where_they_cannot_hit_kept_stacks():
+    slots = stacks("wheat", "wheat", "wheat_seeds", "wheat_seeds", "dirt", "dirt", "stone")
+    # "wheat" would also hit the seeds, so wheat goes slot by slot
+    assert Inventory.plan_drops(slots, {0, 1}) == [
+        {"type": "drop_item", "slot": 0}, {"type": "drop_item", "slot": 1}]
+    assert Inventory.plan_drops(slots, {2, 3, 4, 5, 6}) == [
+        {"type": "drop_item", "name": "dirt"}, {"type": "drop_item", "name": "wheat_seeds"},
+        {"type": "drop_item", "slot": 6}]
+    # Dropping both wheat and seeds: one name covers all four stacks
+    assert Inventory.plan_drops(slots, {0, 1, 2, 3}) == [{"type": "drop_item", "name": "wheat"}]
+
+
+class Mod:
+    """GameQuery stand-in; `inventories` are the successive inventory replies."""
+
+    def __init__(self, *inventories, supported=True):
+        self.inventories = list(inventories)
+        self.supported = supported
+        self.sent = []
+
+    def send_query(self, query):
+        self.sent.append(query)
+        if not self.supported:
+            return {"error": "Unknown query type: inventory"}
+        items = self.inventories.pop(0) if len(self.inventories) > 1 else self.inventories[0]
+        return {"inventory": {"items": [{"slot": s, "item": f"minecraft:{i}", "count": 1}
+                                        for s, i in enumerate(items)]}}
+
+    def batch(self, queries):
+        self.sent.extend(queries)
+        return [{"result": {"success": True}} for _ in queries]
+
+
+def test_unprobed_or_unsupported_inventory_never_drops_by_name():
+    mod = Mod(supported=False)
+    inventory = Inventory(mod)
+    assert inventory.drop_all(["log"]) == 0
+    assert mod.sent == []  # no inventory query until probed
+    assert inventory.probe() is False
+    assert inventory.drop_all(["log"]) == 0
+    assert inventory.keep_only() == 0
+    assert mod.sent == [{"type": "inventory"}]
+
+
+def test_name_drop_replanned_against_fresh_snapshot():
+    # Cached snapshot has only oak logs; by the time we drop, a stripped log was picked up
+    mod = Mod(["oak_log", "oak_log"], ["oak_log", "oak_log", "stripped_oak_log"])
+    inventory = Inventory(mod)
+    assert inventory.probe() is True
+    assert inventory.drop_all(["oak_log"]) == 2
+    assert mod.sent[-2:] == [{"type": "drop_item", "slot": 0}, {"type": "drop_item", "slot": 1}]
+    assert [s.item for s in inventory.snapshot().values()] == ["stripped_oak_log"]
+
+
+def test_keep_only_in_one_batch():
+    mod = Mod(["diamond_pickaxe", "bread", "dirt", "dirt", "cobblestone"])
+    inventory = Inventory(mod)
+    inventory.probe()
+    assert inventory.keep_only(("tools", "food")) == 2
+    assert mod.sent[-2:] == [{"type": "drop_item", "name": "dirt"}, {"type": "drop_item", "slot": 4}]
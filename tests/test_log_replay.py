@@ -0,0 +1,78 @@
+import gzip
+
+import pytest
+
+from ultron import log_replay
+from ultron.log_replay import Checkpoint, LogReplayer, read_blocks
+
+
+def chat_lines(count, start=0):
+    return b"".join(f"[12:{i // 60 % 60:02d}:{i % 60:02d}] [Render thread/INFO]: [CHAT] <Steve> line {i}\n".encode()
+                    for i in range(start, start + count))
+
+
+def write_gz(path, *members):
+    with open(path, "wb") as f:
+        for member in members:
+            f.write(gzip.compress(member))
+
+
+@pytest.mark.parametrize("members, gz_read", [(1, 97), (3, 97), (40, 97), (400, 4096)])
+def test_gz_blocks_offsets_match_plain_file(tmp_path, monkeypatch, members, gz_read):
+    monkeypatch.setattr(log_replay, "GZ_READ", gz_read)
+    content = chat_lines(400)
+    step = -(-len(content) // members)
+    parts = [content[i:i + step] for i in range(0, len(content), step)]
+    write_gz(tmp_path / "a.log.gz", *parts)
+    (tmp_path / "a.log").write_bytes(content)
+    line_ends = {i + 1 for i, byte in enumerate(content) if byte == 10}
+
+    for start in (0, len(chat_lines(123))):
+        gz = list(read_blocks(str(tmp_path / "a.log.gz"), start, block_size=512))
+        plain = list(read_blocks(str(tmp_path / "a.log"), start, block_size=512))
+        assert b"".join(block for _, block in gz) == content[start:]
+        assert b"".join(block for _, block in plain) == content[start:]
+        pos = start
+        for offset, block in gz:
+            assert offset == pos + len(block) and offset in line_ends
+            pos = offset
+
+
+def test_checkpoint_follows_latest_into_its_archive(tmp_path):
+    logs = tmp_path / "logs"
+    logs.mkdir()
+    latest = logs / "latest.log"
+    before, after = chat_lines(100), chat_lines(5, start=100)
+    latest.write_bytes(before)
+
+    checkpoint = Checkpoint(str(tmp_path / "checkpoint.json"))
+    checkpoint.update(str(latest), len(before))
+    checkpoint.save()
+    reloaded = Checkpoint(str(tmp_path / "checkpoint.json"))
+    assert (reloaded.offset, reloaded.head) == (len(before), log_replay.FINGERPRINT_BYTES)
+    assert reloaded.matches(str(latest))
+
+    # The game gzips latest.log into an archive (after writing a bit more) and starts over
+    # (written in several gzip members, as appending tools do)
+    write_gz(logs / "2024-05-01-1.log.gz", before[:1000], before[1000:], after)
+    latest.write_bytes(chat_lines(3, start=200))
+    assert not reloaded.matches(str(latest))
+    assert reloaded.matches(str(logs / "2024-05-01-1.log.gz"))
+
+    replayer = LogReplayer(str(logs))
+    missed = [event.msg for event in replayer.missed(reloaded, str(latest))]
+    assert missed == [f"line {i}" for i in (100, 101, 102, 103, 104, 200, 201, 202)]
+
+
+def test_checkpoint_of_short_file_fingerprints_only_what_was_read(tmp_path):
+    latest = tmp_path / "latest.log"
+    latest.write_bytes(chat_lines(2))
+    checkpoint = Checkpoint(str(tmp_path / "checkpoint.json"))
+    checkpoint.update(str(latest), len(chat_lines(2)))
+    assert checkpoint.head == len(chat_lines(2))
+    with open(latest, "ab") as f:
+        f.write(chat_lines(200, start=2))
+    assert checkpoint.matches(str(latest))
+    # Truncated and rewritten: a new file
+    latest.write_bytes(b"[12:00:00] [main/INFO]: Loading Minecraft\n" * 3)
+    assert not checkpoint.matches(str(latest))
@@ -0,0 +1,58 @@
+import os
+
+from ultron.log_tail import LogTailer
+
+
+def write(path, data, mode="ab"):
+    with open(path, mode) as f:
+        f.write(data)
+
+
+def bump_mtime(path):
+    # Some filesystems have coarse timestamps; make each rewrite visible
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+
+def test_rotation_keeps_an_unterminated_last_line(tmp_path):
+    path = str(tmp_path / "latest.log")
+    write(path, b"")
+    tailer = LogTailer(path)
+    cursor = tailer.subscribe()
+    write(path, b"[10:00:00] one\n[10:00:01] two")
+    assert cursor.read_lines() == ["[10:00:00] one"]
+
+    os.rename(path, str(tmp_path / "2024-01-01-1.log"))
+    write(path, b"[11:00:00] three\n")
+    assert cursor.read_lines() == ["[10:00:01] two", "[11:00:00] three"]
+    assert tailer.rotations == 1
+    tailer.close()
+
+
+def test_truncation_rewinds(tmp_path):
+    path = str(tmp_path / "latest.log")
+    write(path, b"[10:00:00] old line that is fairly long\n")
+    tailer = LogTailer(path)
+    cursor = tailer.subscribe()
+    write(path, b"[12:00:00] new\n", mode="wb")
+    bump_mtime(path)
+    assert cursor.read_lines() == ["[12:00:00] new"]
+    tailer.close()
+
+
+def test_truncate_and_rewrite_past_the_offset_is_detected(tmp_path):
+    path = str(tmp_path / "latest.log")
+    write(path, b"[10:00:00] old\n")
+    tailer = LogTailer(path)
+    cursor = tailer.subscribe()
+    # Rewritten between two pumps and already longer than what we had read
+    write(path, b"[12:00:00] new session\n[12:00:01] second line\n", mode="wb")
+    bump_mtime(path)
+    assert cursor.read_lines() == ["[12:00:00] new session", "[12:00:01] second line"]
+    assert tailer.rotations == 1
+
+    write(path, b"[12:00:02] appended\n")
+    bump_mtime(path)
+    assert cursor.read_lines() == ["[12:00:02] appended"]
+    assert tailer.rotations == 1
+    tailer.close()
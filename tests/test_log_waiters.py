@@ -0,0 +1,9 @@
+from ultron.log_waiters import PatternMatcher
+
+
+def test_matcher_finds_overlapping_and_prefix_patterns():
+    matcher = PatternMatcher(["Farm", "farming complete", "ing c", "x.y"])
+    assert matcher.search("[Baritone] FARMING COMPLETE") == {"farm", "farming complete", "ing c"}
+    # Patterns are literal text, not regex
+    assert matcher.search("xzy") == set()
+    assert matcher.search("a x.y b") == {"x.y"}
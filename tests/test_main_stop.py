@@ -0,0 +1,45 @@
+import threading
+import time
+
+from ultron import main
+from ultron.dispatcher import CommandContext
+
+
+class FakeClient:
+    def __init__(self):
+        self.chat = []
+
+    def send_chat_message(self, message):
+        self.chat.append(message)
+
+
+def test_escape_cancels_the_running_job(tmp_path, monkeypatch):
+    log = tmp_path / "latest.log"
+    log.write_text("")
+    pressed = threading.Event()
+    monkeypatch.setattr(main, "_keyboard", object())
+    monkeypatch.setattr(main, "esc_pressed", lambda: pressed.is_set())
+    client = FakeClient()
+    result = {}
+    done = threading.Event()
+
+    def routine(ctx):
+        result["match"] = main.tail_log_and_wait_for(["never written"], timeout=30,
+                                                     cancel=ctx.cancel, log_path=str(log))
+        done.set()
+
+    main.dispatcher.jobs.submit("wait", CommandContext(client, "Steve", "wait", "", main.dispatcher), routine)
+    main.watch_escape(client, interval=0.01)
+    time.sleep(0.1)
+    start = time.monotonic()
+    pressed.set()
+    assert done.wait(5), "ESC didn't stop the job"
+    pressed.clear()
+    assert time.monotonic() - start < 2
+    assert result["match"] is None
+    assert client.chat == ["#stop"]
+    # The worker survived and still takes jobs
+    ran = threading.Event()
+    main.dispatcher.jobs.submit("next", CommandContext(client, "Steve", "next", "", main.dispatcher),
+                                lambda ctx: ran.set())
+    assert ran.wait(5)
@@ -0,0 +1,116 @@
+import time
+
+import pytest
+
+from ultron.plans import DEFAULT_PLANS, PlanExecutor
+
+
+def nap(seconds=0.3, uses=(), **extra):
+    return {"sleep": seconds, "uses": list(uses), **extra}
+
+
+def timed(plan):
+    executor = PlanExecutor(client=None)
+    start = time.monotonic()
+    assert executor.run(plan) is True
+    elapsed = time.monotonic() - start
+    executor.close()
+    return elapsed, executor.stats
+
+
+@pytest.mark.parametrize("plan, expected, overlapped", [
+    ([nap(), nap(overlap=True)], 0.3, 1),                            # overlap starts alongside its predecessor
+    ([nap(overlap=True), nap()], 0.3, 1),                            # the next step doesn't depend on it
+    ([nap(overlap=True), nap(overlap=True)], 0.3, 1),
+    ([nap(), nap(0.2, overlap=True), nap()], 0.6, 1),                # waits for its predecessor chain only
+    ([nap(), nap(0.5, overlap=True), nap(), nap(0.1)], 0.7, 2),
+    ([nap(uses=["view"]), nap(uses=["view"], overlap=True)], 0.6, 0),  # shared resource
+    ([nap(overlap=True, uses=["view"]), nap(uses=["view"])], 0.6, 0),
+    ([nap(), nap()], 0.6, 0),
+])
+def test_overlap_timing(plan, expected, overlapped):
+    elapsed, stats = timed(plan)
+    assert expected - 0.02 <= elapsed < expected + 0.15
+    assert stats["overlapped"] == overlapped
+
+
+def test_failed_background_step_stops_the_plan():
+    ran = []
+    hooks = {"fail": lambda ex, v: False, "mark": lambda ex, v: ran.append(1) or True}
+    executor = PlanExecutor(client=None, hooks=hooks)
+    plan = [{"call": "fail", "on_fail": "stop"}, nap(0.1, overlap=True), {"call": "mark"},
+            {"call": "mark", "always": True}]
+    assert executor.run(plan) is False
+    assert ran == [1]
+    executor.close()
+
+
+class Player:
+    """Walks for `walk` seconds after a #goto, then stands still."""
+
+    def __init__(self, walk=0.4):
+        self.walk = walk
+        self.started = None
+        self.looked_at = None
+        self.sent = []
+
+    def send_chat_message(self, msg):
+        self.sent.append(msg)
+        self.started = time.monotonic()
+
+    def get_position(self, max_age=None):
+        moving = min(time.monotonic() - self.started, self.walk)
+        return (moving * 10, 60.0, 0.0, 0.0, 0.0)
+
+    def look_at(self, x, y, z):
+        self.looked_at = (x, y, z)
+
+
+class World:
+    def __init__(self, player):
+        self.player = player
+        self.lookups = []
+
+    def find_nearest(self, client, kind, radius):
+        self.lookups.append(time.monotonic() - self.player.started)
+        return (40, 60, 1), 1.0
+
+
+def test_sleep_plan_prefetches_bed_lookup_during_arrival_wait():
+    player = Player()
+    world = World(player)
+    plan = [dict(step) for step in DEFAULT_PLANS["sleep"][:3]]
+    executor = PlanExecutor(player, world=world)
+    assert executor.run(plan, {"bed": "white_bed", "bed_name": "white bed"}) is True
+    executor.close()
+    assert executor.stats["prefetched"] == 1
+    assert executor.stats["prefetch_hits"] == 1
+    assert player.looked_at == (40, 60, 1)
+    # Looked up once the player had stopped, not while walking
+    assert len(world.lookups) == 1 and world.lookups[0] >= player.walk
+
+
+def test_background_steps_and_prefetches_land_in_the_routine_trace(tmp_path, monkeypatch):
+    import json
+
+    from ultron.tracing import TRACER
+
+    monkeypatch.setattr(TRACER, "sample_rate", 1.0)
+    monkeypatch.setattr(TRACER, "directory", str(tmp_path))
+
+    def inner(executor, vars):
+        with TRACER.span("hook work"):
+            return True
+
+    player = Player(walk=0.1)
+    executor = PlanExecutor(player, world=World(player), hooks={"inner": inner})
+    plan = [dict(step) for step in DEFAULT_PLANS["sleep"][:3]] + [nap(0.1), {"call": "inner", "overlap": True}]
+    with TRACER.trace("sleep"):
+        assert executor.run(plan, {"bed": "white_bed", "bed_name": "white bed"}) is True
+    executor.close()
+    with open(TRACER.written[-1]) as f:
+        events = json.load(f)["traceEvents"]
+    names = {event["name"] for event in events}
+    assert {"sleep", "hook work", "call", "prefetch lookup"} <= names
+    main_tid = next(event["tid"] for event in events if event["name"] == "sleep")
+    assert any(event["name"] == "hook work" and event["tid"] != main_tid for event in events)
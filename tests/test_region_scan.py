@@ -0,0 +1,119 @@
+import pytest
+
+from ultron import region_scan
+from ultron.region_scan import MAX_SCAN_BLOCKS, RegionScanner, VoxelGrid, grid_from_blocks
+
+
+@pytest.fixture(params=["numpy", "fallback"])
+def storage(request, monkeypatch):
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(region_scan, "np", None)
+    return request.param
+
+
+def fill(grid):
+    """Every cell its own type, so the palette outgrows a byte."""
+    names = {}
+    ox, oy, oz = grid.origin
+    sx, sy, sz = grid.shape
+    for x in range(ox, ox + sx):
+        for y in range(oy, oy + sy):
+            for z in range(oz, oz + sz):
+                names[(x, y, z)] = f"block_{x}_{y}_{z}"
+                grid.set(x, y, z, names[(x, y, z)])
+    return names
+
+
+@pytest.mark.parametrize("side", [7, 8])  # odd and even cell counts
+def test_more_than_255_types(storage, side):
+    grid = VoxelGrid((10, 60, -5), (side, side, side))
+    grid.set(10, 60, -5, "stone")
+    names = fill(grid)
+    assert len(grid.palette) > 256
+    assert all(grid.get(*c) == name for c, name in names.items())
+    grid.set(11, 61, -4, "stone")
+    assert grid.get(11, 61, -4) == "stone"
+    assert grid.count("stone") == 1
+    if storage == "fallback":
+        assert len(grid.data) == side ** 3
+
+
+def test_find_count_within(storage):
+    grid = VoxelGrid((0, 0, 0), (5, 5, 5))
+    grid.set(1, 1, 1, "white_bed")
+    grid.set(4, 4, 4, "white_bed")
+    grid.set(2, 2, 2, "wheat[age=7]")
+    grid.set(3, 2, 2, "wheat[age=3]")
+    assert grid.count("white_bed") == 2
+    assert grid.count("wheat") == 2
+    assert grid.count("wheat[age=7]") == 1
+    assert [tuple(c) for c in grid.find("white_bed")] == [(1, 1, 1), (4, 4, 4)]
+    hits = grid.within("white_bed", (0, 0, 0), 3)
+    assert [c for c, _ in hits] == [(1, 1, 1)]
+    assert grid.nearest("white_bed", (5, 5, 5))[0] == (4, 4, 4)
+    assert grid.histogram()["white_bed"] == 2
+
+
+def test_grid_from_blocks(storage):
+    blocks = [{"type": "Block{minecraft:chest}", "x": 1, "y": 60, "z": 2},
+              {"type": "Block{minecraft:stone}", "x": 50, "y": 60, "z": 2}]
+    grid = grid_from_blocks(blocks, (0, 60, 0), 3)
+    assert grid.get(1, 60, 2) == "chest"
+    assert grid.count("stone") == 0
+
+
+class FakeClient:
+    pool = None
+
+    def __init__(self):
+        self.queries = 0
+
+    def batch(self, queries):
+        self.queries += len(queries)
+        return [{"block": "Block{minecraft:stone}" if q["y"] < 60 else "Block{minecraft:air}"} for q in queries]
+
+
+def test_scan_streams_tiles(storage):
+    client = FakeClient()
+    scanner = RegionScanner(client, tile=(4, 4, 4), workers=2)
+    grid = scanner.scan((0, 58, 0), (9, 61, 9))
+    assert client.queries == 400
+    assert scanner.last_stats["tiles"] == 3 * 1 * 3
+    assert grid.count("stone") == 200
+    assert grid.count("air") == 200
+
+
+def test_radius_64_fits_the_limit():
+    assert (2 * 64 + 1) ** 3 <= MAX_SCAN_BLOCKS
+    assert RegionScanner(FakeClient()).scan((0, 0, 0), (200, 200, 200)) is None
+
+
+def test_scan_around_limits_height_by_default():
+    client = FakeClient()
+    grid = RegionScanner(client).scan_around((0, 60, 0), 10)
+    assert grid.shape == (21, 9, 21)
+    assert client.queries == 21 * 9 * 21
+
+
+def test_count_command_scans_around_the_bot():
+    from ultron import main
+    from ultron.dispatcher import CommandContext
+
+    class Client(FakeClient):
+        def __init__(self):
+            super().__init__()
+            self.sent = []
+
+        def get_position(self):
+            return (0.5, 60.0, 0.5, 0.0, 0.0)
+
+        def send_chat_message(self, msg):
+            self.sent.append(msg)
+
+    client = Client()
+    command, args = main.commands.match("count stone 3")
+    command.handler(CommandContext(client, "Steve", "count stone 3", args))
+    assert client.queries == 7 * 9 * 7
+    assert client.sent == ["40 stone within 3 blocks, nearest at 0 59 0 (1m)"]
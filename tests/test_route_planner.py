@@ -0,0 +1,54 @@
+import itertools
+import random
+
+import pytest
+
+from ultron.route_planner import RoutePlanner, TravelModel
+
+HOME = (0.0, 64.0, 0.0)
+
+
+def cost(planner, start, stops, order, end=HOME):
+    return planner._path_cost([start] + [stops[i] for i in order] + [end])
+
+
+def test_beats_nearest_neighbour_on_a_zigzag():
+    # Nearest-neighbour bounces left and right along the line; the tour should sweep once
+    stops = [(x, 64.0, 0.0) for x in (10, -22, 45, -95, 200, -420)]
+    planner = RoutePlanner(TravelModel())
+    greedy = planner._nearest_neighbour(HOME, stops)
+    plan = planner.plan(HOME, stops, HOME)
+    assert plan.time < cost(planner, HOME, stops, greedy) * 0.8
+    assert plan.distance == pytest.approx(2 * 420 + 2 * 200)
+    assert plan.distance_saved > 0 and plan.time_saved > 0
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_matches_brute_force_on_small_tours(seed):
+    rng = random.Random(seed)
+    stops = [(rng.uniform(-500, 500), 64.0, rng.uniform(-500, 500)) for _ in range(6)]
+    start = (rng.uniform(-500, 500), 64.0, rng.uniform(-500, 500))
+    planner = RoutePlanner(TravelModel())
+    plan = planner.plan(start, stops, HOME)
+    best = min(cost(planner, start, stops, order) for order in itertools.permutations(range(6)))
+    greedy = cost(planner, start, stops, planner._nearest_neighbour(start, stops))
+    assert sorted(plan.order) == list(range(6))
+    assert plan.time <= greedy + 1e-9
+    # 2-opt + or-opt is a heuristic, but on six stops it should land within a few percent
+    assert plan.time <= best * 1.05
+
+
+def test_learned_slow_leg_is_avoided_and_persisted(tmp_path):
+    path = str(tmp_path / "travel_times.json")
+    model = TravelModel(path)
+    a, b = (100.0, 64.0, 0.0), (100.0, 64.0, 100.0)
+    planner = RoutePlanner(model)
+    assert planner.plan(HOME, [b, a], HOME).order == [1, 0]  # nearer stop first
+    # A ravine between a and b: walking a -> b takes ten minutes, b -> a is fine
+    for _ in range(10):
+        model.record(a, b, 600)
+        model.record(b, a, 25)
+    reloaded = TravelModel(path)
+    assert reloaded.estimate(a, b) > 500
+    assert reloaded.estimate(b, a) < 30
+    assert RoutePlanner(reloaded).plan(HOME, [a, b], HOME).order == [1, 0]
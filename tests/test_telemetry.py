@@ -0,0 +1,49 @@
+import time
+
+from ultron.client import MCBot
+from ultron.telemetry import PlayerState, TelemetrySampler
+
+
+def test_background_poller_follows_sparse_readers():
+    fetched = []
+
+    def fetch():
+        fetched.append(time.monotonic())
+        return PlayerState(len(fetched), 60, 0)  # always "moving"
+
+    sampler = TelemetrySampler(fetch, ttl=0.05, min_interval=0.05, max_interval=0.4)
+    sampler.start()
+    try:
+        for _ in range(8):
+            sampler.get()
+            time.sleep(0.3)
+    finally:
+        sampler.stop()
+    stats = sampler.stats()
+    assert stats["reads"] == 8
+    # A poller racing at min_interval would have sent ~50 queries by now
+    assert stats["background_fetches"] <= 4
+    assert stats["fetches"] == len(fetched) <= 12
+
+
+def test_background_poller_speeds_up_without_readers():
+    positions = iter(range(1000))
+    sampler = TelemetrySampler(lambda: PlayerState(next(positions), 60, 0),
+                               min_interval=0.02, max_interval=0.5)
+    sampler.start()
+    time.sleep(0.3)
+    sampler.stop()
+    assert sampler.stats()["background_fetches"] >= 6
+    assert sampler.stats()["reads"] == 0
+
+
+def test_goto_reports_wire_queries_apart_from_reads(monkeypatch):
+    bot = MCBot(port=1)
+    replies = iter([{"x": 0, "y": 60, "z": 0}, {"x": 5, "y": 60, "z": 0}, {"x": 10, "y": 60, "z": 0}])
+    monkeypatch.setattr(bot, "send_query", lambda query: {"position": next(replies)})
+    monkeypatch.setattr(bot, "send_chat_message", lambda msg: {"result": {"success": True}})
+    monkeypatch.setattr(bot, "look_at", lambda x, y, z: None)
+    bot.telemetry.get()  # someone else just read the position
+    assert bot.goto(10, 60, 0, tolerance=1) is True
+    assert bot.last_trip.reads == 3
+    assert bot.last_trip.wire_queries == 2
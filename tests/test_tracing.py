@@ -0,0 +1,35 @@
+import json
+import threading
+
+from ultron.chat_queue import ChatQueue
+from ultron.tracing import TRACER
+
+
+def test_chat_sends_are_recorded_in_the_submitters_trace(tmp_path, monkeypatch):
+    monkeypatch.setattr(TRACER, "sample_rate", 1.0)
+    monkeypatch.setattr(TRACER, "directory", str(tmp_path))
+
+    def send(message):
+        with TRACER.span("query", type="send_chat"):
+            return {"result": {"success": True}}
+
+    queue = ChatQueue(send)
+    with TRACER.trace("farm"):
+        queue.send("#settings allowBreak true")
+        queue.send("hello")
+    queue.close()
+    with open(TRACER.written[-1]) as f:
+        events = json.load(f)["traceEvents"]
+    sends = [e for e in events if e["name"] == "chat send"]
+    assert [e["args"]["message"] for e in sends] == ["#settings allowBreak true", "hello"]
+    assert sum(e["name"] == "query" for e in events) == 2
+    assert all(e["tid"] != threading.get_ident() for e in sends)
+
+
+def test_untraced_submitters_record_nothing(tmp_path, monkeypatch):
+    monkeypatch.setattr(TRACER, "sample_rate", 0.0)
+    monkeypatch.setattr(TRACER, "directory", str(tmp_path))
+    queue = ChatQueue(lambda message: {"result": {"success": True}})
+    queue.send("hi")
+    queue.close()
+    assert not any(tmp_path.iterdir())
@@ -0,0 +1,87 @@
+import math
+import random
+import threading
+
+from ultron.world_cache import WorldCache, scanned_blocks
+
+
+def bed(x, y, z):
+    return {"type": "Block{minecraft:white_bed}", "x": x, "y": y, "z": z}
+
+
+class FakeClient:
+    def __init__(self, scan_reply):
+        self.scan_reply = scan_reply
+
+    def get_position(self):
+        return None
+
+    def batch(self, queries):
+        return [{"position": {"x": 0, "y": 60, "z": 0}}, self.scan_reply]
+
+    @staticmethod
+    def parse_position(reply):
+        p = reply["position"]
+        return p["x"], p["y"], p["z"]
+
+
+def test_failed_scan_keeps_cached_blocks():
+    cache = WorldCache()
+    cache.ingest([bed(2, 60, 1)], (0, 60, 0), 5)
+    for failed in (None, {"error": "Unknown query type: blocks"}):
+        found = cache.find_nearest(FakeClient(failed), "white_bed", radius=5)
+        assert found is not None and found[0] == (2, 60, 1)
+    assert cache.stats()["failed_scans"] == 2
+
+
+def test_empty_scan_still_clears():
+    cache = WorldCache()
+    cache.ingest([bed(2, 60, 1)], (0, 60, 0), 5)
+    reply = {"blocks": {"blocks": []}}
+    assert scanned_blocks(reply) == []
+    assert cache.find_nearest(FakeClient(reply), "white_bed", radius=5) is None
+
+
+def test_nearest_matches_brute_force():
+    rng = random.Random(3)
+    cache = WorldCache()
+    beds = [(rng.randint(-80, 80), rng.randint(40, 80), rng.randint(-80, 80)) for _ in range(300)]
+    cache.ingest([bed(*b) for b in beds], (0, 60, 0), 80)
+    for _ in range(50):
+        pos = (rng.uniform(-90, 90), rng.uniform(40, 80), rng.uniform(-90, 90))
+        coord, dist = cache.nearest("white_bed", pos)
+        assert math.isclose(dist, min(math.dist(b, pos) for b in beds))
+
+
+def test_concurrent_updates_and_lookups():
+    cache = WorldCache()
+    errors = []
+    stop = threading.Event()
+
+    def writer(seed):
+        rng = random.Random(seed)
+        try:
+            while not stop.is_set():
+                c = (rng.randint(-40, 40), 60, rng.randint(-40, 40))
+                cache.ingest([bed(c[0] + 1, 60, c[2])] if rng.random() < 0.5 else [], c, 5)
+        except Exception as e:
+            errors.append(e)
+
+    def reader():
+        try:
+            while not stop.is_set():
+                cache.nearest("white_bed", (0, 60, 0))
+                cache.is_fresh((0, 60, 0), 5)
+                cache.stats()
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=writer, args=(i,)) for i in range(2)]
+    threads += [threading.Thread(target=reader) for _ in range(2)]
+    for t in threads:
+        t.start()
+    threading.Event().wait(0.5)
+    stop.set()
+    for t in threads:
+        t.join()
+    assert not errors
@@ -0,0 +1,27 @@
+"""
+Minecraft Ultron: a GameQuery/Baritone farming bot.
+
+Importing the package is cheap; the client classes load on first access:
+
+    from ultron import MCBot
+"""
+
+__version__ = "0.2.0"
+
+_LAZY = {
+    "MCBot": "client",
+    "AsyncMCBot": "async_bot",
+    "PlayerState": "telemetry",
+}
+
+__all__ = list(_LAZY)
+
+
+def __getattr__(name):
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module 'ultron' has no attribute {name!r}")
+    from importlib import import_module
+    value = getattr(import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
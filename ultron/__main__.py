@@ -0,0 +1,5 @@
+"""`python -m ultron` starts the chat listener, like the `ultron` command."""
+
+from .main import main
+
+main()
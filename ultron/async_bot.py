@@ -0,0 +1,520 @@
+"""
+Asyncio client for the GameQuery Minecraft mod.
+Same surface as MCBot in client.py, but every call is a coroutine so one
+event loop can drive the chat listener, movement monitoring and Cheat Utils
+input locking side by side.
+"""
+
+import asyncio
+import json
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+# MCBot's reply parsing is reused so both clients agree on the payload shapes
+from .client import MCBot
+from .chat_queue import CHAT_BURST, CHAT_RATE, _ChatRules, _Outgoing
+from .codec import MAX_LINE, get_codec
+from .connection_pool import retry_safe
+from .input_control import CHEAT_UTILS_URL, INPUT_FIELDS, Step, check_inputs
+from .movement import MovementTracker, MOVING, ARRIVED
+from .telemetry import PlayerState
+
+
+class _Stream:
+    """One pooled asyncio connection; `served` > 0 means it has been reused."""
+    __slots__ = ("reader", "writer", "served")
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+        self.served = 0
+
+
+class _AsyncOutgoing(_Outgoing):
+    __slots__ = ()
+
+    def __init__(self, message: str, kind: Optional[str]):
+        super().__init__(message, kind)
+        self.done = asyncio.Event()
+
+
+class AsyncChatQueue(_ChatRules):
+    """asyncio version of ChatQueue: the same buckets, `#settings` dedup and
+    `#goto`/`#stop` merging, sent in order by one task on the event loop."""
+
+    def __init__(self, send: Callable[[str], Awaitable[Optional[Dict[str, Any]]]],
+                 chat_rate: float = CHAT_RATE, chat_burst: int = CHAT_BURST):
+        super().__init__(chat_rate, chat_burst)
+        self._send = send
+        self._wake: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._sending: Optional[_Outgoing] = None
+
+    def submit(self, message: str) -> _Outgoing:
+        """Queue a message; the returned item's `done` is set once it is sent
+        (or was dropped as redundant)."""
+        item, queued = self._admit(message, _AsyncOutgoing)
+        if queued:
+            if self._wake is None:
+                self._wake = asyncio.Event()
+            self._wake.set()
+            if self._task is None or self._task.done():
+                self._task = asyncio.ensure_future(self._run())
+        return item
+
+    async def send(self, message: str, timeout: Optional[float] = 30) -> Optional[Dict[str, Any]]:
+        """Queue a message and wait for its reply (None on timeout)."""
+        item = self.submit(message)
+        try:
+            await asyncio.wait_for(item.done.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        return item.response
+
+    async def _acquire(self, bucket) -> None:
+        delay = bucket.wait_time()
+        while delay > 0:
+            bucket.waited += delay
+            await asyncio.sleep(delay)
+            delay = bucket.wait_time()
+        bucket.tokens -= 1
+
+    async def _run(self):
+        while True:
+            while not self._queue:
+                self._wake.clear()
+                await self._wake.wait()
+            await self._acquire(self._bucket_for(self._queue[0]))
+            if not self._queue:
+                # A #stop emptied the queue while we waited for the token
+                continue
+            item = self._sending = self._take()
+            try:
+                response = await self._send(item.message)
+            except Exception as e:
+                print(f"❌ Error sending '{item.message}': {e}")
+                response = None
+            self._sent(item, response)
+            self._sending = None
+            item.finish(response)
+
+    async def close(self):
+        """Stop the sender task and release anyone still waiting."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._sending is not None:
+            self._sending.finish(None)
+            self._sending = None
+        while self._queue:
+            self._queue.popleft().finish(None)
+
+
+class AsyncInputController:
+    """asyncio version: same diffing, with timed steps on the event loop.
+
+    Posts are plain HTTP/1.1 over one keep-alive asyncio connection, the
+    same way the GameQuery side talks to the mod, so no thread is involved.
+    """
+
+    def __init__(self, base_url: str = CHEAT_UTILS_URL, timeout: float = 2.0):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        url = urlsplit(self.base_url)
+        self._http_host = url.hostname or "localhost"
+        self._http_port = url.port or 80
+        self._http_path = url.path.rstrip("/")
+        self._http: Optional[Tuple[asyncio.StreamReader, asyncio.StreamWriter]] = None
+        self._http_lock: Optional[asyncio.Lock] = None
+        self.desired: Dict[str, bool] = dict.fromkeys(INPUT_FIELDS, False)
+        self.applied: Optional[Dict[str, bool]] = None
+        self.posts = 0
+        self.skipped = 0
+        self._lock: Optional[asyncio.Lock] = None
+        self._tasks: set = set()
+
+    def _disconnect(self):
+        if self._http is not None:
+            self._http[1].close()
+            self._http = None
+
+    async def _request(self, endpoint: str, body: bytes) -> int:
+        """One POST on the keep-alive connection; returns the status code."""
+        if self._http is None:
+            self._http = await asyncio.open_connection(self._http_host, self._http_port)
+        reader, writer = self._http
+        head = (f"POST {self._http_path}/{endpoint} HTTP/1.1\r\n"
+                f"Host: {self._http_host}:{self._http_port}\r\n"
+                f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n")
+        writer.write(head.encode('latin-1') + body)
+        await writer.drain()
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionError("Cheat Utils closed the connection")
+        status = int(status_line.split()[1])
+        length, chunked, close = None, False, False
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode('latin-1').partition(":")
+            name, value = name.strip().lower(), value.strip().lower()
+            if name == "content-length":
+                length = int(value)
+            elif name == "transfer-encoding":
+                chunked = "chunked" in value
+            elif name == "connection":
+                close = value == "close"
+        # The body isn't used, but it has to be read to reuse the connection
+        if chunked:
+            while True:
+                size = int((await reader.readline()).split(b";")[0], 16)
+                await reader.readexactly(size + 2)
+                if size == 0:
+                    break
+        elif length is not None:
+            await reader.readexactly(length)
+        else:
+            await reader.read()
+            close = True
+        if close:
+            self._disconnect()
+        return status
+
+    async def post(self, endpoint: str, payload: Dict[str, Any]) -> bool:
+        """POST `payload` to /api/<endpoint> on the shared connection."""
+        if self._http_lock is None:
+            self._http_lock = asyncio.Lock()
+        body = json.dumps(payload).encode('utf-8')
+        async with self._http_lock:
+            for attempt in range(2):
+                reused = self._http is not None
+                try:
+                    status = await asyncio.wait_for(self._request(endpoint, body), self.timeout)
+                    break
+                except (OSError, ValueError, IndexError, asyncio.IncompleteReadError, asyncio.TimeoutError) as e:
+                    # A half-read response would desync the next one
+                    self._disconnect()
+                    if reused and attempt == 0 and not isinstance(e, asyncio.TimeoutError):
+                        # Cheat Utils dropped the idle keep-alive; lock-inputs
+                        # carries the whole state, so posting it again is safe
+                        continue
+                    print(f"Error posting {endpoint} with {payload}:", e)
+                    return False
+        self.posts += 1
+        if status != 200:
+            print(f"❌ {self.base_url}/{endpoint} returned {status}")
+        return status == 200
+
+    async def set(self, **changes: bool) -> bool:
+        check_inputs(changes)
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            self.desired.update(changes)
+            if self.desired == self.applied:
+                self.skipped += 1
+                return True
+            payload = dict(self.desired)
+            ok = await self.post("lock-inputs", payload)
+            self.applied = payload if ok else None
+            return ok
+
+    async def release_all(self) -> bool:
+        for task in list(self._tasks):
+            task.cancel()
+        return await self.set(**dict.fromkeys(INPUT_FIELDS, False))
+
+    async def _play(self, steps: List[Step]):
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        for offset, changes in steps:
+            delay = start + offset - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            await self.set(**changes)
+
+    def sequence(self, steps: Iterable[Step]) -> "asyncio.Task":
+        """Schedule the steps on the running loop; await the task to wait for the last one."""
+        steps = sorted(steps, key=lambda step: step[0])
+        for _, changes in steps:
+            check_inputs(changes)
+        task = asyncio.ensure_future(self._play(steps))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    def hold(self, field: str, seconds: float) -> "asyncio.Task":
+        return self.sequence([(0.0, {field: True}), (seconds, {field: False})])
+
+    async def close(self):
+        for task in list(self._tasks):
+            task.cancel()
+        self._disconnect()
+
+    def stats(self) -> Dict[str, int]:
+        return {"posts": self.posts, "skipped": self.skipped, "pending": len(self._tasks)}
+
+
+class AsyncMCBot:
+    def __init__(self, host: str = "localhost", port: int = 25566, pool_size: int = 4, timeout: float = 5,
+                 telemetry_ttl: float = 0.1, cheat_utils_url: str = CHEAT_UTILS_URL,
+                 chat_rate: float = CHAT_RATE, chat_burst: int = CHAT_BURST):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.pool_size = pool_size
+        self.codec = get_codec()
+        self._idle: List[_Stream] = []
+        self._slots: Optional[asyncio.Semaphore] = None
+        self.last_trip = None
+        # Same TTL cache + coalescing as MCBot.telemetry, with a shared future
+        self.telemetry_ttl = telemetry_ttl
+        self._state: Optional[PlayerState] = None
+        self._state_fetch: Optional[asyncio.Future] = None
+        self.position_fetches = 0
+        self.inputs = AsyncInputController(cheat_utils_url)
+        # Same rate limits, #settings dedup and #goto/#stop merging as MCBot.chat
+        self.chat = AsyncChatQueue(self._send_chat_now, chat_rate=chat_rate, chat_burst=chat_burst)
+
+    async def _acquire(self) -> _Stream:
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.pool_size)
+        await self._slots.acquire()
+        while self._idle:
+            stream = self._idle.pop()
+            if not stream.reader.at_eof():
+                return stream
+            # The mod closed it (usually a restart); reconnect before writing anything
+            print(f"🔁 Reconnecting to {self.host}:{self.port}")
+            stream.writer.close()
+            # The game restarted, so Baritone is back on its default settings
+            self.chat.settings.forget()
+        try:
+            reader, writer = await asyncio.wait_for(asyncio.open_connection(self.host, self.port, limit=MAX_LINE),
+                                                    self.timeout)
+        except BaseException:
+            self._slots.release()
+            raise
+        return _Stream(reader, writer)
+
+    def _release(self, stream: _Stream, broken: bool = False):
+        if broken:
+            stream.writer.close()
+        else:
+            self._idle.append(stream)
+        self._slots.release()
+
+    async def _roundtrip(self, stream: _Stream, queries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Pipeline queries on one stream; returns the replies that arrived
+        before the server hung up (if it did)."""
+        encode = self.codec.encode_line
+        stream.writer.write(b"".join([encode(q) for q in queries]))
+        await stream.writer.drain()
+        replies = []
+        for _ in queries:
+            line = await asyncio.wait_for(stream.reader.readline(), self.timeout)
+            if not line:
+                break
+            replies.append(self.codec.decode(line))
+        return replies
+
+    async def _batch_once(self, queries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        stream = await self._acquire()
+        reused = stream.served > 0
+        try:
+            replies = await self._roundtrip(stream, queries)
+        except (ConnectionError, BrokenPipeError):
+            self._release(stream, broken=True)
+            if not reused:
+                raise
+            replies = []
+        except BaseException:
+            self._release(stream, broken=True)
+            raise
+        else:
+            stream.served += len(replies)
+            # A short read means the server hung up, so the stream can't be reused
+            self._release(stream, broken=len(replies) < len(queries))
+        if not replies and reused and retry_safe(queries):
+            # Dropped before any reply; reads are safe to send again
+            print(f"🔁 Reconnecting to {self.host}:{self.port}")
+            await self._close_idle()
+            return await self._batch_once(queries)
+        return replies
+
+    async def close(self):
+        """Stop the chat sender and close idle pooled connections."""
+        await self.chat.close()
+        await self._close_idle()
+
+    async def _close_idle(self):
+        idle, self._idle = self._idle, []
+        for stream in idle:
+            stream.writer.close()
+
+    async def send_query(self, query: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Send a query to the Minecraft client and return the response."""
+        replies = await self.batch([query])
+        return replies[0]
+
+    async def batch(self, queries: List[Dict[str, Any]]) -> List[Optional[Dict[str, Any]]]:
+        """Send many queries in one write and return the replies in order."""
+        replies: List[Optional[Dict[str, Any]]] = []
+        try:
+            while len(replies) < len(queries):
+                rest = queries[len(replies):]
+                if replies and not retry_safe(rest):
+                    # Chat, drops and clicks may already have run; don't send them twice
+                    print(f"⚠️ Connection dropped mid-batch; not resending {len(rest)} queries that may have run")
+                    break
+                got = await self._batch_once(rest)
+                if not got:
+                    raise ConnectionError(f"Connection to {self.host}:{self.port} closed by server")
+                replies.extend(got)
+            if len(replies) == len(queries):
+                return replies
+        except asyncio.TimeoutError:
+            print(f"❌ Timeout connecting to {self.host}:{self.port}")
+        except ConnectionRefusedError:
+            print(f"❌ Connection refused to {self.host}:{self.port}")
+            print("   Make sure Minecraft is running with the GameQuery mod loaded")
+        except Exception as e:
+            print(f"❌ Error: {e}")
+        return replies + [None] * (len(queries) - len(replies))
+
+    async def _simple_action(self, query: Dict[str, Any], default: str):
+        response = await self.send_query(query)
+        if response:
+            result = response.get("result", {})
+            if result.get("success"):
+                print(f"✅ {result.get('message', default)}")
+            else:
+                print(f"❌ Failed: {result.get('error', 'Unknown error')}")
+        return response
+
+    async def send_chat_message(self, message: str):
+        """Send a chat message as the player, through the outbound queue."""
+        response = await self.chat.send(message)
+        if response and response.get("result", {}).get("skipped"):
+            print(f"⏭️ Skipping '{message}': {response['result']['message']}")
+        return response
+
+    async def _send_chat_now(self, message: str):
+        print(f"\n💬 Sending chat message: '{message}'")
+        return await self._simple_action({"type": "send_chat", "message": message}, 'Message sent')
+
+    async def drop_item_from_slot(self, slot: int):
+        """Drop an item from a specific inventory slot."""
+        print(f"\n🗑️ Dropping item from slot {slot}...")
+        return await self._simple_action({"type": "drop_item", "slot": slot}, 'Item dropped')
+
+    async def drop_items_by_name(self, item_name: str):
+        """Drop all items matching a name."""
+        print(f"\n🗑️ Dropping items matching '{item_name}'...")
+        return await self._simple_action({"type": "drop_item", "name": item_name}, 'Items dropped')
+
+    async def rotate_player(self, yaw: float = None, pitch: float = None):
+        """Rotate the player to a specific direction."""
+        rotation_desc = []
+        query = {"type": "rotate"}
+        if yaw is not None:
+            rotation_desc.append(f"yaw: {yaw}°")
+            query["yaw"] = yaw
+        if pitch is not None:
+            rotation_desc.append(f"pitch: {pitch}°")
+            query["pitch"] = pitch
+        print(f"\n🔄 Rotating player ({', '.join(rotation_desc)})...")
+        self._state = None
+        return await self._simple_action(query, 'Player rotated')
+
+    async def look_at(self, x: float, y: float, z: float):
+        response = await self.send_query({"type": "point_to_xyz", "x": x, "y": y, "z": z})
+        self._state = None
+        return response
+
+    async def get_position(self, max_age: Optional[float] = None) -> Optional[PlayerState]:
+        """Current player state; concurrent callers share one `position` query."""
+        max_age = self.telemetry_ttl if max_age is None else max_age
+        state = self._state
+        if state is not None and state.age <= max_age:
+            return state
+        if self._state_fetch is None:
+            self._state_fetch = asyncio.ensure_future(self._fetch_state())
+        # Shielded so one caller being cancelled doesn't fail the others
+        return await asyncio.shield(self._state_fetch)
+
+    async def _fetch_state(self) -> Optional[PlayerState]:
+        self.position_fetches += 1
+        try:
+            state = MCBot.parse_position(await self.send_query({"type": "position"}))
+            if state is not None:
+                self._state = state
+            return state
+        finally:
+            self._state_fetch = None
+
+    async def goto(self, x: float, y: float, z: float, tolerance: float = 2, max_wait: Optional[float] = None):
+        """Walk to (x, y, z) with Baritone. Returns True on arrival, False if stuck or timed out."""
+        print(f"Going to {x} {y} {z}")
+        await self.look_at(x, y, z)
+        reply = await self.send_chat_message(f"#goto {x} {y} {z}")
+        if reply and reply.get("result", {}).get("skipped") and not reply["result"].get("success"):
+            # Replaced by a newer #goto or a #stop before it was sent
+            self.last_trip = None
+            return False
+        tracker = MovementTracker(target=(x, y, z), tolerance=tolerance, max_wait=max_wait)
+        fetches = self.position_fetches
+        while tracker.update(await self.get_position()) == MOVING:
+            await asyncio.sleep(tracker.next_delay())
+        tracker.stats.wire_queries = self.position_fetches - fetches
+        self.last_trip = tracker.stats
+        print(f"📍 goto {x} {y} {z}: {tracker.summary()}")
+        return tracker.state == ARRIVED
+
+    async def _click(self, kind: str):
+        response = await self.send_query({"type": kind})
+        if response and "error" in response:
+            print(f"❌ Error: {response['error']}")
+        return response
+
+    async def right_click(self):
+        return await self._click("right_click")
+
+    async def left_click(self):
+        return await self._click("left_click")
+
+    async def attack(self):
+        return await self._click("attack")
+
+    async def open_container(self):
+        return await self._click("open_container")
+
+    async def cheat_utils_post(self, endpoint: str, payload: dict):
+        return await self.inputs.post(endpoint, payload)
+
+    async def press_right_click(self):
+        return await self.inputs.set(holdUse=True)
+
+    async def release_right_click(self):
+        return await self.inputs.set(holdUse=False)
+
+    def right_click_hold(self, seconds: float = 0.5) -> "asyncio.Task":
+        """Hold use for `seconds` in the background; await the task to wait for the release."""
+        return self.inputs.hold("holdUse", seconds)
+
+    async def get_block(self, x, y, z):
+        """Get information about the block at the specified coordinates."""
+        response = await self.send_query({"type": "get_block", "x": x, "y": y, "z": z})
+        if not response:
+            print(f"❌ Failed to get block at ({x}, {y}, {z})")
+            return None
+        return response
+
+    async def get_blocks_in_range(self, range_size: int = 5):
+        """Get all blocks in a cubic range around the player."""
+        return MCBot.parse_blocks(await self.send_query({"type": "blocks", "range": range_size}))
@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+Minecraft Ultron - asyncio edition
+Runs the chat listener, farm/sleep/home routines and Cheat Utils input
+locking on one event loop using AsyncMCBot, so a long farm run never blocks
+command pickup.
+"""
+
+import asyncio
+import math
+from typing import Optional
+
+from . import main as sync_main
+from .async_bot import AsyncMCBot
+from .chat_parser import scan_chat
+from .dispatcher import CommandContext, CommandRegistry
+from .log_tail import get_tailer
+from .log_waiters import get_waiters
+from .movement import MovementTracker, MOVING, ARRIVED
+
+LOG_PATH = sync_main.LOG_PATH
+BOT_NAME = sync_main.BOT_NAME
+HOME_COORDS = sync_main.HOME_COORDS
+
+# --- Utilities ---
+
+async def tail_log_and_wait_for(targets, timeout=60):
+    """Monitor log file for specific messages without blocking the loop."""
+    print(f"🕵️ Waiting for any of {targets} in logs...")
+    waiter = get_waiters(LOG_PATH).register(targets, timeout=timeout)
+    try:
+        match = await asyncio.wrap_future(waiter)
+    except asyncio.CancelledError:
+        get_waiters(LOG_PATH).cancel(waiter)
+        raise
+    if match is None:
+        print(f"❌ Timeout: none of {targets} found.")
+        return None
+    print(f"✅ Found in log: {match.line.strip()}")
+    return match.pattern
+
+async def wait_for_farm_completion(client: AsyncMCBot, timeout: int = 300):
+    """Wait for farming to complete by monitoring log file."""
+    print("🌾 Monitoring farming progress via log file...")
+    result = await tail_log_and_wait_for(["Farm failed", "goal reached"], timeout=timeout)
+
+    if result is None:
+        print(f"❌ Timeout: Farming did not complete within {timeout} seconds")
+        return False
+    elif "Farm failed" in result:
+        print("❌ Farming failed!")
+        return False
+    else:
+        print("✅ Farming completed successfully!")
+        return True
+
+async def wait_for_arrival(client: AsyncMCBot, tolerance=0.2, stable_required=1, check_interval=1.0, max_wait=60):
+    """
+    Wait until the player stops moving (moves less than `tolerance` blocks over
+    `stable_required` * `check_interval` seconds).
+    Returns True if arrived, False if timeout.
+    """
+    tracker = MovementTracker(tolerance=tolerance, settle_time=stable_required * check_interval,
+                              max_interval=check_interval, max_wait=max_wait)
+    while tracker.update(await client.get_position()) == MOVING:
+        await asyncio.sleep(tracker.next_delay())
+    print(f"📍 Arrival check: {tracker.summary()}")
+    if tracker.state != ARRIVED:
+        print("❌ Timeout waiting for arrival.")
+        return False
+    return True
+
+# --- Routines ---
+
+async def _farming_settings_off(client: AsyncMCBot):
+    await client.send_chat_message("#settings allowBreak false")
+    await client.send_chat_message("#settings allowPlace false")
+
+async def farm_command(client: AsyncMCBot, player: str = None, farm_name: str = None):
+    farm = sync_main.get_farms().get(player, farm_name)
+    if farm is None:
+        print(f"⚠️ No farm '{farm_name or 'main'}' registered for player '{player}'.")
+        return False
+
+    fx, fy, fz = farm.coords
+    hx, hy, hz = HOME_COORDS
+
+    print(f"🚜 Starting farm routine for {player}...")
+
+    print(f"🚶 Walking to farm at ({fx}, {fy}, {fz})...")
+    await client.goto(fx, fy, fz, tolerance=2)
+
+    # The chat queue sends these in order, so no sleeps between them
+    try:
+        print("⚙️ Enabling farming settings...")
+        await client.send_chat_message("#settings allowBreak true")
+        await client.send_chat_message("#settings allowPlace true")
+
+        print("🌾 Starting farming...")
+        await client.send_chat_message("#farm")
+        farming_success = await wait_for_farm_completion(client)
+    finally:
+        # Also when `stop` cancels the routine: Baritone must not keep
+        # breaking and placing blocks. Shielded so a second cancel can't skip it
+        print("⚙️ Disabling farming settings...")
+        await asyncio.shield(_farming_settings_off(client))
+
+    print(f"🔄 Returning to farm at ({fx}, {fy}, {fz}) to deposit items...")
+    await client.goto(fx, fy, fz, tolerance=2)
+    print("📦 Going to chest...")
+    await client.send_chat_message("#goto chest")
+    print("⏳ Waiting for arrival at chest...")
+    await wait_for_arrival(client, tolerance=0.2, stable_required=2)
+
+    print(f"🏠 Returning home to ({hx}, {hy}, {hz})...")
+    await client.goto(hx, hy, hz, tolerance=2)
+
+    if farming_success:
+        print(f"✅ Farming complete for {player}!")
+        return True
+    print(f"❌ Farming failed for {player}, but returned home safely.")
+    return False
+
+async def sleep_command(client: AsyncMCBot, bed_type: str = "white_bed"):
+    print(f"🛏️ Going to nearest {bed_type.replace('_', ' ')} with Baritone...")
+    await client.send_chat_message(f"#goto {bed_type}")
+
+    print("⏳ Waiting for arrival at bed...")
+    if not await wait_for_arrival(client, tolerance=0.2, stable_required=1):
+        print("Failed to arrive at bed in time.")
+        return False
+
+    print("🔎 Searching for bed to look at and right-click...")
+    world = sync_main.get_world()
+    pos = await client.get_position()
+    if pos is None or not world.is_fresh(pos[:3], 5):
+        position, scan = await client.batch([{"type": "position"}, {"type": "blocks", "range": 5}])
+        pos = sync_main.MCBot.parse_position(position)
+        if pos is not None:
+            world.ingest_reply(scan, pos[:3], 5)
+    found = world.nearest(bed_type, pos[:3], max_distance=5 * math.sqrt(3)) if pos else None
+    bed_coords = found[0] if found else None
+    if bed_coords:
+        print(f"👀 Looking at {bed_type.replace('_', ' ')} at {bed_coords}")
+        await client.look_at(*bed_coords)
+        await asyncio.sleep(0.5)
+        print("Right clicking")
+        await client.right_click_hold(0.5)
+    else:
+        print(f"❌ No {bed_type.replace('_', ' ')} found nearby!")
+    return True
+
+async def home_command(client: AsyncMCBot):
+    hx, hy, hz = HOME_COORDS
+    print(f"🏠 Going home to ({hx}, {hy}, {hz})...")
+    await client.goto(hx, hy, hz, tolerance=2)
+    print("⏳ Waiting for arrival at home...")
+    if await wait_for_arrival(client, tolerance=0.2, stable_required=3):
+        print("✅ Arrived at home!")
+        return True
+    print("❌ Failed to arrive at home in time.")
+    return False
+
+# --- Listener ---
+
+class RoutineRunner:
+    """One routine task at a time: the event-loop stand-in for the sync
+    Dispatcher's job queue, handed to handlers as `ctx.dispatcher`."""
+
+    def __init__(self):
+        self.name: Optional[str] = None
+        self.task: Optional[asyncio.Task] = None
+
+    def start(self, name: str, coro, user: str):
+        if self.task and not self.task.done():
+            print(f"⏳ Busy with {self.name}, ignoring '{name}' from {user}")
+            coro.close()
+            return
+        self.name = name
+        self.task = asyncio.create_task(coro)
+
+    def cancel(self):
+        if self.task and not self.task.done():
+            print(f"🛑 Cancelling {self.name} routine")
+            self.task.cancel()
+
+# Same word-prefix table as the sync bot; background handlers return the
+# routine coroutine, which runs as a task so the listener keeps reading
+commands = CommandRegistry()
+
+@commands.command("my farm is at")
+async def set_farm_handler(ctx):
+    try:
+        coords = tuple(map(float, ctx.args.split()))
+        if len(coords) == 3:
+            sync_main.get_farms().set(ctx.user, coords)
+            print(f"✅ Set farm for {ctx.user} to {coords}")
+            await ctx.client.send_chat_message(f"Your farm is at {coords}")
+    except Exception as e:
+        print(f"❌ Failed to set farm for {ctx.user}: {e}")
+
+@commands.command("farm", exact=True)
+async def farm_here_handler(ctx):
+    await ctx.client.send_chat_message("#farm")
+
+@commands.command("farm home", background=True)
+def farm_home_handler(ctx):
+    return farm_command(ctx.client, ctx.user, ctx.args.split()[0] if ctx.args else None)
+
+@commands.command("sleep", background=True)
+def sleep_handler(ctx):
+    return sleep_command(ctx.client, ctx.args.split()[0] if ctx.args else "white_bed")
+
+@commands.command("go home", background=True)
+def go_home_handler(ctx):
+    return home_command(ctx.client)
+
+@commands.command("stop")
+async def stop_handler(ctx):
+    ctx.dispatcher.cancel()
+    await ctx.client.send_chat_message("#stop")
+
+@commands.command("follow me")
+async def follow_handler(ctx):
+    await ctx.client.send_chat_message(f"#follow player {ctx.user}")
+
+@commands.command("find a")
+async def find_handler(ctx):
+    if ctx.args:
+        await ctx.client.send_chat_message(f"#goto {ctx.args}")
+
+async def handle_chat(client: AsyncMCBot, user: str, msg: str, routines: RoutineRunner) -> bool:
+    """React to one chat command. Returns False if no command matched."""
+    found = commands.match(msg.strip())
+    if found is None:
+        return False
+    command, args = found
+    ctx = CommandContext(client, user, msg.strip(), args, routines)
+    if command.background:
+        routines.start(command.name, command.handler(ctx), user)
+    else:
+        await command.handler(ctx)
+    return True
+
+async def listen(client: AsyncMCBot):
+    """Follow the log and dispatch chat commands until cancelled."""
+    routines = RoutineRunner()
+    with get_tailer(LOG_PATH).subscribe(chunks=True) as cursor:
+        while True:
+            for event in scan_chat(b"".join(cursor.read_chunks())):
+                user, msg, kind = event
+                if user == BOT_NAME:
+                    continue  # Ignore messages sent by the bot itself
+                print(f"📝 Detected {kind} from {user}: {msg}")
+                await handle_chat(client, user, msg, routines)
+            await cursor.wait_async(3600)
+
+# --- Entry Point ---
+
+async def main():
+    print("🎮 Minecraft Ultron - asyncio Edition")
+    print("=====================================")
+
+    if not LOG_PATH:
+        print("❌ LOG_PATH is not set; point it at your latest.log in .env")
+        return
+
+    client = AsyncMCBot(sync_main.GAMEQUERY_HOST, sync_main.GAMEQUERY_PORT,
+                        telemetry_ttl=sync_main.TELEMETRY_TTL, chat_rate=sync_main.CHAT_RATE)
+    print("\n🔗 Testing connection to GameQuery server...")
+    if await client.send_query({"type": "position"}) is None:
+        print("❌ Cannot connect to GameQuery server")
+        return
+    print("✅ Connected to GameQuery server!")
+
+    print("\n🕵️ Listening for chat commands in Minecraft...")
+    try:
+        await listen(client)
+    finally:
+        await client.close()
+
+def run():
+    """Console entry point."""
+    asyncio.run(main())
+
+if __name__ == "__main__":
+    run()
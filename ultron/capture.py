@@ -0,0 +1,764 @@
+#!/usr/bin/env python3
+"""
+Record and replay GameQuery sessions.
+
+A capture is an append-only binary file of what the bot exchanged with the
+game: every query with its reply, when it was sent and how long it took, and
+the [CHAT] lines the log tailer read (commands, whispers, Baritone reports).
+Each record is
+
+    kind (u8) | time (f64, seconds since the capture started) | length (u32) | payload
+
+and records are gathered into blocks, compressed with zlib and a preset
+dictionary of protocol boilerplate, each prefixed with
+
+    b"UB" | compressed length (u32) | records (u32) | first time (f64) | last time (f64)
+
+A `<capture>.idx` sidecar has one entry per block, so readers jump straight to
+a point in time and only decompress from there. The index is rebuilt from the
+block headers if it's missing or behind, and a block cut short by a crash is
+dropped (and truncated away when recording resumes into the same file).
+
+Replay serves a capture as a GameQuery server plus a latest.log, so MCBot and
+main() run unmodified against it, on the recorded clock or as fast as the bot
+goes, for offline profiling and regression runs:
+
+    ultron-capture info session.ucap
+    ultron-capture dump session.ucap [--from 30 --to 45] [--kind log]
+    ultron-capture replay session.ucap [--speed 2 | --fast] [--record replayed.ucap]
+
+Recording is opt-in: set CAPTURE_FILE for main(), or hand a CaptureWriter to
+MCBot(recorder=...) and LogTailer.recorder.
+"""
+
+import argparse
+import atexit
+import json
+import math
+import os
+import queue
+import shutil
+import socket
+import struct
+import tempfile
+import threading
+import time
+import zlib
+from bisect import bisect_left, bisect_right
+from collections import deque
+from itertools import accumulate
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from .codec import get_codec
+
+MAGIC = b"UCAP1\n"
+BLOCK = struct.Struct("<2sIIdd")   # b"UB", compressed length, records, first time, last time
+RECORD = struct.Struct("<BdI")     # kind, time, payload length
+INDEX = struct.Struct("<QIIdd")    # block offset, compressed length, records, first time, last time
+DURATION = struct.Struct("<f")     # exchange payload prefix: seconds the query took
+
+# Record kinds
+SESSION, EXCHANGE, LOG = 0, 1, 2
+KIND_NAMES = {SESSION: "session", EXCHANGE: "exchange", LOG: "log"}
+
+# A block is written once it holds this many records or spans this many seconds
+# (so a crash loses at most that much)
+BLOCK_RECORDS = 512
+FLUSH_INTERVAL = 5.0
+COMPRESS_LEVEL = 6
+# Preset zlib dictionary of protocol boilerplate, so even small blocks compress
+# well. Part of the file format: changing it means a new MAGIC.
+ZDICT = (b'[Render thread/INFO]: [CHAT] [Baritone] Goal reached Farm goal reached <'
+         b'{"type":"blocks","range":{"blocks":{"blocks":[{"type":"Block{minecraft:stone}","x":'
+         b'{"type":"inventory"}{"inventory":{"items":[{"slot":"item":"minecraft:"count":'
+         b'{"type":"drop_item","slot":"name":{"type":"point_to_xyz","x":'
+         b'[{"type":"send_chat","message":"#{"result":{"success":true,"message":"Message sent"}}]'
+         b'[{"type":"position"},{"position":{"x":,"y":,"z":,"yaw":,"pitch":0.0,'
+         b'"health":20.0,"maxHealth":20.0,"food":20,"level":"experience":}}]')
+# Log lines worth keeping: chat, whispers and Baritone's reports all carry it
+LOG_MARKER = b"[CHAT]"
+# Queries whose replies depend on when they're asked, not on what came before;
+# replay answers them from the recorded timeline instead of in order
+POLLED = frozenset({"position"})
+# Fast replay: how long a log line waits for the queries recorded before it
+STALL_TIMEOUT = 5.0
+
+
+class BlockInfo(NamedTuple):
+    offset: int
+    length: int
+    records: int
+    first: float
+    last: float
+
+    @property
+    def end(self) -> int:
+        return self.offset + BLOCK.size + self.length
+
+
+class Record(NamedTuple):
+    kind: int
+    time: float
+    payload: bytes
+
+
+def index_path(path: str) -> str:
+    return path + ".idx"
+
+
+def query_key(query: Dict[str, Any]) -> str:
+    return json.dumps(query, sort_keys=True, separators=(",", ":"))
+
+
+def _scan_blocks(fh, offset: int, size: int) -> List[BlockInfo]:
+    """Block headers from `offset` on, stopping at the first torn block."""
+    blocks = []
+    while offset + BLOCK.size <= size:
+        fh.seek(offset)
+        magic, length, records, first, last = BLOCK.unpack(fh.read(BLOCK.size))
+        block = BlockInfo(offset, length, records, first, last)
+        if magic != b"UB" or block.end > size:
+            break
+        blocks.append(block)
+        offset = block.end
+    return blocks
+
+
+def load_index(path: str) -> List[BlockInfo]:
+    """Blocks of a capture: the .idx entries that fit the file, then any
+    blocks written after the index was last updated."""
+    size = os.path.getsize(path)
+    blocks: List[BlockInfo] = []
+    try:
+        with open(index_path(path), 'rb') as f:
+            data = f.read()
+        for entry in INDEX.iter_unpack(data[:len(data) - len(data) % INDEX.size]):
+            block = BlockInfo(*entry)
+            if block.end > size:
+                break
+            blocks.append(block)
+    except FileNotFoundError:
+        pass
+    with open(path, 'rb') as fh:
+        if fh.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a capture file")
+        blocks.extend(_scan_blocks(fh, blocks[-1].end if blocks else len(MAGIC), size))
+    return blocks
+
+
+class CaptureWriter:
+    """Append records to a capture file. Thread-safe; closes itself at exit.
+
+    Recording only appends to an in-memory block under the lock; full blocks
+    are compressed and written by a background thread, so the query path
+    never waits on zlib. Recording into an existing capture continues its
+    clock, so one file can hold several sessions back to back.
+    """
+
+    def __init__(self, path: str, block_records: int = BLOCK_RECORDS, flush_interval: float = FLUSH_INTERVAL,
+                 level: int = COMPRESS_LEVEL, meta: Optional[Dict[str, Any]] = None, codec=None):
+        self.path = path
+        self.block_records = block_records
+        self.flush_interval = flush_interval
+        self.level = level
+        self.codec = codec or get_codec()
+        self._lock = threading.Lock()
+        # Sealed blocks waiting for the writer thread; the file lock orders
+        # its writes against flush()/close()/stats()
+        self._sealed: "queue.Queue[Optional[Tuple[bytearray, int, float, float]]]" = queue.Queue()
+        self._file_lock = threading.Lock()
+        self._writer: Optional[threading.Thread] = None
+        self._closed = False
+        self._buf = bytearray()
+        self._count = 0
+        self._first = math.inf
+        self._last = -math.inf
+        self.records = 0
+        self.raw_bytes = 0
+        self.blocks = 0
+
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        resume = 0.0
+        if os.path.exists(path) and os.path.getsize(path) > 0:
+            blocks = load_index(path)
+            self._fh = open(path, 'r+b')
+            # Drop a torn last block so new blocks follow the last good one
+            self._fh.truncate(blocks[-1].end if blocks else len(MAGIC))
+            self._fh.seek(0, os.SEEK_END)
+            with open(index_path(path), 'wb') as idx:
+                idx.write(b"".join(INDEX.pack(*block) for block in blocks))
+            resume = max((block.last for block in blocks), default=0.0)
+            self.blocks = len(blocks)
+        else:
+            self._fh = open(path, 'wb')
+            self._fh.write(MAGIC)
+            open(index_path(path), 'wb').close()
+        self._idx = open(index_path(path), 'ab')
+        self._t0 = time.monotonic() - resume
+        atexit.register(self.close)
+        self._add(SESSION, self.now(), json.dumps({"started": time.time(), "pid": os.getpid(),
+                                                   **(meta or {})}).encode('utf-8'))
+
+    def now(self) -> float:
+        return time.monotonic() - self._t0
+
+    def _add(self, kind: int, t: float, payload: bytes):
+        with self._lock:
+            if self._closed:
+                return
+            self._buf += RECORD.pack(kind, t, len(payload))
+            self._buf += payload
+            self._count += 1
+            self._first = min(self._first, t)
+            self._last = max(self._last, t)
+            self.records += 1
+            self.raw_bytes += RECORD.size + len(payload)
+            if self._count >= self.block_records or self._last - self._first >= self.flush_interval:
+                self._seal()
+
+    def _seal(self):
+        """Hand the buffered records to the writer thread. Caller holds the lock."""
+        if not self._count:
+            return
+        self._sealed.put((self._buf, self._count, self._first, self._last))
+        self._buf = bytearray()
+        self._count = 0
+        self._first, self._last = math.inf, -math.inf
+        if self._writer is None:
+            self._writer = threading.Thread(target=self._write_blocks, name="capture-writer", daemon=True)
+            self._writer.start()
+
+    def _write_blocks(self):
+        while True:
+            sealed = self._sealed.get()
+            try:
+                if sealed is None:
+                    return
+                self._write_block(*sealed)
+            except Exception as e:
+                print(f"❌ Capture block not written: {e}")
+            finally:
+                self._sealed.task_done()
+
+    def _write_block(self, buf: bytearray, count: int, first: float, last: float):
+        compressor = zlib.compressobj(self.level, zdict=ZDICT)
+        data = compressor.compress(buf) + compressor.flush()
+        with self._file_lock:
+            offset = self._fh.tell()
+            block = BlockInfo(offset, len(data), count, first, last)
+            self._fh.write(BLOCK.pack(b"UB", *block[1:]))
+            self._fh.write(data)
+            self._fh.flush()
+            # Index after the block it points at, so the index never runs ahead of the file
+            self._idx.write(INDEX.pack(*block))
+            self._idx.flush()
+            self.blocks += 1
+
+    # --- Recording ---
+
+    def exchange(self, query: Dict[str, Any], reply: Optional[Dict[str, Any]], duration: float):
+        """One query and its reply (None if it failed), `duration` seconds after it was sent."""
+        line = self.codec.encode_line([query, reply])
+        self._add(EXCHANGE, self.now() - duration, DURATION.pack(duration) + line[:-1])
+
+    def exchanges(self, queries: List[Dict[str, Any]], replies: List[Optional[Dict[str, Any]]], duration: float):
+        """A pipelined batch: all sent together, the time split evenly between them."""
+        if not queries:
+            return
+        start = self.now() - duration
+        share = DURATION.pack(duration / len(queries))
+        for query, reply in zip(queries, replies):
+            self._add(EXCHANGE, start, share + self.codec.encode_line([query, reply])[:-1])
+
+    def log_block(self, block: bytes):
+        """Keep the [CHAT] lines of a block of whole log lines."""
+        pos = block.find(LOG_MARKER)
+        if pos < 0:
+            return
+        t = self.now()
+        while pos >= 0:
+            start = block.rfind(b"\n", 0, pos) + 1
+            end = block.find(b"\n", pos)
+            if end < 0:
+                end = len(block)
+            self._add(LOG, t, block[start:end])
+            pos = block.find(LOG_MARKER, end)
+
+    def flush(self):
+        """Write everything recorded so far, and wait until it's on disk."""
+        with self._lock:
+            if self._closed:
+                return
+            self._seal()
+        self._sealed.join()
+
+    def close(self):
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._seal()
+            writer = self._writer
+        if writer is not None:
+            self._sealed.put(None)
+            writer.join()
+        with self._file_lock:
+            self._fh.close()
+            self._idx.close()
+            self._fh = None
+        atexit.unregister(self.close)
+
+    def __enter__(self) -> "CaptureWriter":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock, self._file_lock:
+            written = self._fh.tell() if self._fh is not None else os.path.getsize(self.path)
+            return {"records": self.records, "blocks": self.blocks, "raw_bytes": self.raw_bytes,
+                    "file_bytes": written, "buffered": self._count, "queued_blocks": self._sealed.qsize()}
+
+
+class CaptureReader:
+    """Random access to a capture through its block index."""
+
+    def __init__(self, path: str, codec=None):
+        self.path = path
+        self.codec = codec or get_codec()
+        self.blocks = load_index(path)
+        # Records are stamped when a query was sent but written when it
+        # returned, so block time ranges can overlap. Seek on the running max
+        # of `last` and stop on the running min of `first` (from the end).
+        self._reach = list(accumulate((b.last for b in self.blocks), max))
+        self._floor = list(accumulate((b.first for b in reversed(self.blocks)), min))[::-1]
+
+    @property
+    def start(self) -> float:
+        return self._floor[0] if self.blocks else 0.0
+
+    @property
+    def end(self) -> float:
+        return self._reach[-1] if self.blocks else 0.0
+
+    def __len__(self) -> int:
+        return sum(block.records for block in self.blocks)
+
+    def read_block(self, fh, block: BlockInfo) -> List[Record]:
+        fh.seek(block.offset + BLOCK.size)
+        data = zlib.decompressobj(zdict=ZDICT).decompress(fh.read(block.length))
+        records, pos = [], 0
+        while pos < len(data):
+            kind, t, n = RECORD.unpack_from(data, pos)
+            pos += RECORD.size
+            records.append(Record(kind, t, data[pos:pos + n]))
+            pos += n
+        return records
+
+    def records(self, start: Optional[float] = None, end: Optional[float] = None,
+                kinds: Optional[Tuple[int, ...]] = None) -> Iterator[Record]:
+        """Records stamped within [start, end], in file order."""
+        lo = -math.inf if start is None else start
+        hi = math.inf if end is None else end
+        first = bisect_left(self._reach, lo)
+        with open(self.path, 'rb') as fh:
+            for i in range(first, len(self.blocks)):
+                if self._floor[i] > hi:
+                    break
+                for record in self.read_block(fh, self.blocks[i]):
+                    if lo <= record.time <= hi and (kinds is None or record.kind in kinds):
+                        yield record
+
+    def decode_exchange(self, payload: bytes) -> Tuple[float, Dict[str, Any], Optional[Dict[str, Any]]]:
+        """(duration, query, reply) of an EXCHANGE record."""
+        duration, = DURATION.unpack_from(payload)
+        query, reply = self.codec.decode(memoryview(payload)[DURATION.size:])
+        return duration, query, reply
+
+    def session(self) -> Dict[str, Any]:
+        """Metadata of the first recorded session."""
+        for record in self.records(kinds=(SESSION,)):
+            return json.loads(record.payload)
+        return {}
+
+    def summary(self) -> Dict[str, Any]:
+        kinds: Dict[str, int] = {}
+        queries: Dict[str, int] = {}
+        raw = failed = 0
+        for record in self.records():
+            name = KIND_NAMES.get(record.kind, str(record.kind))
+            kinds[name] = kinds.get(name, 0) + 1
+            raw += RECORD.size + len(record.payload)
+            if record.kind == EXCHANGE:
+                _, query, reply = self.decode_exchange(record.payload)
+                kind = query.get("type", "unknown")
+                queries[kind] = queries.get(kind, 0) + 1
+                failed += reply is None
+        size = os.path.getsize(self.path)
+        return {"path": self.path, "span": self.end - self.start, "blocks": len(self.blocks),
+                "records": kinds, "queries": queries, "failed_queries": failed,
+                "raw_bytes": raw, "file_bytes": size, "ratio": raw / size if size else 0.0}
+
+
+class ReplayServer:
+    """GameQuery server that answers from a capture and writes its log lines.
+
+    With speed > 0 the recorded clock is followed (2.0 = twice as fast): log
+    lines appear when they did, polled queries get the reply recorded at
+    that moment and every reply waits out its recorded latency. With speed
+    0 nothing waits on the clock: a log line is written as soon as the bot
+    has sent every query recorded before it (or after `stall` seconds if it
+    never does), and polls step through the recorded replies without running
+    ahead of the next query the bot hasn't sent yet.
+
+    Other queries are matched to the first unused recording of the same
+    query, falling back to the first unused one of the same type.
+    """
+
+    def __init__(self, reader: CaptureReader, log_path: str, speed: float = 1.0,
+                 start: Optional[float] = None, end: Optional[float] = None,
+                 host: str = "127.0.0.1", port: int = 0, stall: float = STALL_TIMEOUT):
+        self.speed = speed
+        self.stall = stall
+        records = sorted(reader.records(start, end), key=lambda r: r.time)
+        self.origin = records[0].time if records else 0.0
+        self.span = records[-1].time - self.origin if records else 0.0
+        self._exchanges: List[Tuple[float, float, Optional[Dict[str, Any]]]] = []
+        self._by_key: Dict[str, deque] = {}
+        self._by_type: Dict[str, deque] = {}
+        self._polls: Dict[str, Tuple[List[float], List[Tuple[float, Any]]]] = {}
+        # (time, exchanges recorded before it, line)
+        self._lines: List[Tuple[float, int, bytes]] = []
+        for record in records:
+            if record.kind == EXCHANGE:
+                duration, query, reply = reader.decode_exchange(record.payload)
+                kind = query.get("type", "unknown")
+                if kind in POLLED:
+                    times, replies = self._polls.setdefault(kind, ([], []))
+                    times.append(record.time)
+                    replies.append((duration, reply))
+                    continue
+                i = len(self._exchanges)
+                self._exchanges.append((record.time, duration, reply))
+                self._by_key.setdefault(query_key(query), deque()).append(i)
+                self._by_type.setdefault(kind, deque()).append(i)
+            elif record.kind == LOG:
+                self._lines.append((record.time, len(self._exchanges), record.payload))
+        self._used = bytearray(len(self._exchanges))
+        self._next = 0                # first exchange the bot hasn't sent yet
+        self._reached = self.origin   # fast mode: recorded time the bot has caught up with
+        self._poll_at = {kind: -1 for kind in self._polls}
+        self._cond = threading.Condition()
+        self._started: Optional[float] = None
+        self._last_query = time.monotonic()
+        self._fed = threading.Event()
+        self._closed = threading.Event()
+        self.served = self.polls = self.misses = self.stalls = self.skipped = self.lines = 0
+
+        folder = os.path.dirname(log_path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        self._log = open(log_path, 'ab')
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._sock.bind((host, port))
+        self._sock.listen(64)
+        self.host, self.port = self._sock.getsockname()
+
+    def start(self) -> "ReplayServer":
+        threading.Thread(target=self._accept, name="replay-accept", daemon=True).start()
+        return self
+
+    def go(self):
+        """Start the recorded clock and the log lines (once the bot is listening)."""
+        self._started = time.monotonic()
+        threading.Thread(target=self._feed, name="replay-log", daemon=True).start()
+
+    def clock(self) -> float:
+        """Recorded time the replay is at."""
+        if self._started is None:
+            return self.origin
+        return self.origin + (time.monotonic() - self._started) * self.speed
+
+    # --- Answering queries ---
+
+    def _take(self, candidates: Optional[deque]) -> Optional[int]:
+        while candidates:
+            i = candidates.popleft()
+            if not self._used[i]:
+                return i
+        return None
+
+    def _poll(self, kind: str) -> Tuple[float, Any]:
+        times, replies = self._polls[kind]
+        if self.speed > 0:
+            i = bisect_right(times, self.clock()) - 1
+        else:
+            limit = self._exchanges[self._next][0] if self._next < len(self._exchanges) else math.inf
+            i = self._poll_at[kind]
+            if i + 1 < len(times) and times[i + 1] <= limit:
+                i += 1
+            i = max(i, bisect_right(times, self._reached) - 1)
+        i = self._poll_at[kind] = max(i, 0)
+        self.polls += 1
+        return replies[i]
+
+    def answer(self, query: Dict[str, Any]) -> Tuple[float, Dict[str, Any]]:
+        """(recorded latency, reply) for a query."""
+        kind = query.get("type", "unknown")
+        with self._cond:
+            self._last_query = time.monotonic()
+            if kind in self._polls:
+                duration, reply = self._poll(kind)
+            else:
+                i = self._take(self._by_key.get(query_key(query)))
+                if i is None:
+                    i = self._take(self._by_type.get(kind))
+                if i is None:
+                    self.misses += 1
+                    return 0.0, {"error": f"Not in capture: {kind}"}
+                self._used[i] = 1
+                self.served += 1
+                while self._next < len(self._used) and self._used[self._next]:
+                    self._next += 1
+                t, duration, reply = self._exchanges[i]
+                self._reached = max(self._reached, t)
+                self._cond.notify_all()
+        if reply is None:
+            reply = {"error": "No reply in capture (the query failed when recorded)"}
+        return duration, reply
+
+    def _accept(self):
+        while not self._closed.is_set():
+            try:
+                conn, _ = self._sock.accept()
+            except OSError:
+                return
+            conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            threading.Thread(target=self._serve, args=(conn,), daemon=True).start()
+
+    def _serve(self, conn: socket.socket):
+        reader = conn.makefile('rb')
+        codec = get_codec()
+        try:
+            for line in reader:
+                if not line.strip():
+                    continue
+                try:
+                    duration, reply = self.answer(codec.decode(line))
+                except (ValueError, TypeError, AttributeError) as e:
+                    duration, reply = 0.0, {"error": f"Bad query: {e}"}
+                if self.speed > 0 and duration > 0:
+                    time.sleep(duration / self.speed)
+                conn.sendall(codec.encode_line(reply))
+        except OSError:
+            pass
+        finally:
+            reader.close()
+            conn.close()
+
+    # --- Log lines ---
+
+    def _wait_for(self, gate: int):
+        """Fast mode: block until the bot has sent the first `gate` exchanges."""
+        with self._cond:
+            deadline = time.monotonic() + self.stall
+            while self._next < gate and not self._closed.is_set():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    # The bot went another way than the recording; stop waiting for those
+                    self.stalls += 1
+                    for i in range(self._next, gate):
+                        if not self._used[i]:
+                            self._used[i] = 1
+                            self.skipped += 1
+                    self._next = gate
+                    while self._next < len(self._used) and self._used[self._next]:
+                        self._next += 1
+                    break
+                self._cond.wait(remaining)
+
+    def _feed(self):
+        for t, gate, line in self._lines:
+            if self.speed > 0:
+                delay = (t - self.origin) / self.speed - (time.monotonic() - self._started)
+                if delay > 0 and self._closed.wait(delay):
+                    return
+            else:
+                self._wait_for(gate)
+                with self._cond:
+                    self._reached = max(self._reached, t)
+            if self._closed.is_set():
+                return
+            self._log.write(line + b"\n")
+            self._log.flush()
+            self.lines += 1
+        self._fed.set()
+
+    def done(self) -> bool:
+        """Every log line is out and the bot has sent everything recorded (or gone quiet)."""
+        if not self._fed.is_set():
+            return False
+        with self._cond:
+            return self._next >= len(self._exchanges) or time.monotonic() - self._last_query > self.stall
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return {"served": self.served, "polls": self.polls, "misses": self.misses,
+                    "unsent": len(self._used) - sum(self._used), "stalls": self.stalls,
+                    "skipped": self.skipped, "lines": self.lines, "total_lines": len(self._lines)}
+
+    def close(self):
+        self._closed.set()
+        with self._cond:
+            self._cond.notify_all()
+        self._sock.close()
+        self._log.close()
+
+
+# --- Command line ---
+
+def _parse_time(value: Optional[float], reader: CaptureReader) -> Optional[float]:
+    """--from/--to are seconds from the start of the capture."""
+    return None if value is None else reader.start + value
+
+
+def _info(args) -> int:
+    summary = CaptureReader(args.capture).summary()
+    if args.json:
+        print(json.dumps(summary, indent=2))
+        return 0
+    print(f"🎥 {summary['path']}: {summary['span']:.1f}s in {summary['blocks']} blocks, "
+          f"{summary['file_bytes'] / 1e3:.1f} kB ({summary['ratio']:.1f}x compressed)")
+    for kind, count in summary["records"].items():
+        print(f"   {kind:<9} {count}")
+    for kind, count in sorted(summary["queries"].items(), key=lambda q: -q[1]):
+        print(f"   · {kind:<14} {count}")
+    if summary["failed_queries"]:
+        print(f"   ⚠️ {summary['failed_queries']} queries failed when recorded")
+    return 0
+
+
+def _dump(args) -> int:
+    reader = CaptureReader(args.capture)
+    kinds = None if args.kind is None else tuple(k for k, name in KIND_NAMES.items() if name == args.kind)
+    for record in reader.records(_parse_time(args.start, reader), _parse_time(args.end, reader), kinds):
+        t = record.time - reader.start
+        if record.kind == EXCHANGE:
+            duration, query, reply = reader.decode_exchange(record.payload)
+            text = f"{json.dumps(query)} -> {json.dumps(reply)}"
+            if len(text) > args.width:
+                text = text[:args.width - 1] + "…"
+            print(f"{t:10.3f}  {duration * 1000:7.1f}ms  {text}")
+        else:
+            print(f"{t:10.3f}  {KIND_NAMES.get(record.kind, '?'):>9}  {record.payload.decode('utf-8', 'replace')}")
+    return 0
+
+
+def _copy_state(workdir: str, env: str, default: str) -> str:
+    """Copy a state file main() writes to into the replay directory, so a
+    replay starts from the current state without changing it."""
+    source = os.environ.get(env, default)
+    target = os.path.join(workdir, os.path.basename(default))
+    if os.path.exists(source) and not os.path.exists(target):
+        shutil.copyfile(source, target)
+    os.environ[env] = target
+    return target
+
+
+def _replay(args) -> int:
+    reader = CaptureReader(args.capture)
+    speed = 0.0 if args.fast else args.speed
+    server = ReplayServer(reader, os.path.join(args.dir, "latest.log"), speed=speed,
+                          start=_parse_time(args.start, reader), end=_parse_time(args.end, reader),
+                          port=args.port, stall=args.stall).start()
+    meta = reader.session()
+    pace = "as fast as possible" if speed == 0 else f"at {speed:g}x"
+    print(f"▶️ Replaying {args.capture} ({server.span:.1f}s) {pace} on {server.host}:{server.port}, log in {args.dir}")
+
+    # main() reads its settings when it's imported
+    os.environ.update(LOG_PATH=os.path.join(args.dir, "latest.log"), GAMEQUERY_HOST=server.host,
+                      GAMEQUERY_PORT=str(server.port), REPLAY_CHECKPOINT="", CAPTURE_FILE=args.record or "")
+    if meta.get("bot"):
+        os.environ["BOT_NAME"] = meta["bot"]
+    _copy_state(args.dir, "FARMS_DB", "farms.db")
+    _copy_state(args.dir, "TRAVEL_TIMES_FILE", "travel_times.json")
+    from . import main as bot
+    from .log_tail import get_tailer
+
+    threading.Thread(target=bot.main, name="replay-main", daemon=True).start()
+    # Hold the log lines back until main() is following the log
+    tailer = get_tailer(bot.LOG_PATH)
+    deadline = time.monotonic() + 30
+    while not tailer.subscribers:
+        if time.monotonic() > deadline:
+            print("❌ main() never started listening to the log")
+            server.close()
+            return 1
+        time.sleep(0.01)
+
+    start = time.perf_counter()
+    server.go()
+    try:
+        while not server.done():
+            time.sleep(0.05)
+    except KeyboardInterrupt:
+        print("\n⏹️ Replay stopped")
+    elapsed = time.perf_counter() - start
+    server.close()
+
+    stats = server.stats()
+    print(f"\n⏱️ Replayed {server.span:.1f}s of recorded session in {elapsed:.1f}s "
+          f"({server.span / elapsed if elapsed else 0:.1f}x)")
+    print(f"   {stats['served']} queries answered, {stats['polls']} polls, {stats['lines']}/{stats['total_lines']} log lines")
+    if stats["misses"] or stats["unsent"] or stats["stalls"]:
+        print(f"   ⚠️ Diverged from the recording: {stats['misses']} queries not in the capture, "
+              f"{stats['unsent']} recorded queries never sent, {stats['stalls']} stalls")
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Inspect and replay GameQuery session captures")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    info = sub.add_parser("info", help="what a capture holds")
+    info.add_argument("capture")
+    info.add_argument("--json", action="store_true")
+
+    dump = sub.add_parser("dump", help="print records")
+    dump.add_argument("capture")
+    dump.add_argument("--from", dest="start", type=float, help="seconds from the start of the capture")
+    dump.add_argument("--to", dest="end", type=float)
+    dump.add_argument("--kind", choices=sorted(KIND_NAMES.values()))
+    dump.add_argument("--width", type=int, default=160, help="truncate exchanges to this many characters")
+
+    replay = sub.add_parser("replay", help="run main() against a capture")
+    replay.add_argument("capture")
+    replay.add_argument("--speed", type=float, default=1.0, help="multiple of the recorded pace")
+    replay.add_argument("--fast", action="store_true", help="don't wait on the recorded clock at all")
+    replay.add_argument("--from", dest="start", type=float, help="seconds from the start of the capture")
+    replay.add_argument("--to", dest="end", type=float)
+    replay.add_argument("--dir", help="where the replayed log and state copies go (default: a temp dir)")
+    replay.add_argument("--port", type=int, default=0)
+    replay.add_argument("--record", help="capture the replayed session too, for comparing runs")
+    replay.add_argument("--stall", type=float, default=STALL_TIMEOUT,
+                        help="fast mode: seconds to wait for queries the bot may never send")
+
+    args = parser.parse_args(argv)
+    try:
+        if args.command == "info":
+            return _info(args)
+        if args.command == "dump":
+            return _dump(args)
+        args.dir = args.dir or tempfile.mkdtemp(prefix="ultron-replay-")
+        return _replay(args)
+    except (OSError, ValueError) as e:
+        print(f"❌ {e}")
+        return 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,68 @@
+"""
+Fast chat/whisper parsing for Minecraft log lines.
+
+Most of latest.log is not chat, so scan_chat() runs one precompiled pattern
+over raw blocks of log bytes: the regex engine jumps from one `[CHAT]` marker
+to the next, and only the user/message groups of matching lines are decoded.
+"""
+
+import re
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Union
+
+CHAT_MARKER = b"[CHAT]"
+
+# [CHAT] <User> message   |   [CHAT] User whispers to you: message
+# Never crosses a newline, so it can run over a whole block of lines at once.
+CHAT_PATTERN = re.compile(
+    rb"\[CHAT\] ?(?:<([^>\n]*)>([^\n]*)|([^\n]*?)whispers to you:([^\n]*))"
+)
+
+
+class ChatEvent(NamedTuple):
+    """A parsed player message. Unpacks as (user, msg, kind)."""
+    user: str
+    msg: str
+    kind: str  # "chat" or "whisper"
+
+
+def _event(groups) -> ChatEvent:
+    user, msg, wuser, wmsg = groups
+    if user or msg:
+        return ChatEvent._make((user.strip().decode('utf-8', 'replace'),
+                                msg.strip().decode('utf-8', 'replace'), "chat"))
+    return ChatEvent._make((wuser.strip().decode('utf-8', 'replace'),
+                            wmsg.strip().decode('utf-8', 'replace'), "whisper"))
+
+
+def parse_chat(raw: bytes) -> Optional[ChatEvent]:
+    """Parse one raw log line; None for anything that isn't a player message."""
+    if raw.find(CHAT_MARKER) < 0:
+        return None
+    m = CHAT_PATTERN.search(raw)
+    if m is None:
+        return None
+    return _event(m.groups(b""))
+
+
+def parse_chat_line(line: Union[str, bytes]) -> Optional[ChatEvent]:
+    """Same as parse_chat, but also accepts already-decoded lines."""
+    if isinstance(line, str):
+        line = line.encode('utf-8')
+    return parse_chat(line)
+
+
+def scan_chat(block: bytes) -> List[ChatEvent]:
+    """Parse every chat/whisper line in a block of raw log lines.
+
+    The regex engine skips ahead to each `[CHAT]` literal in C, so non-chat
+    lines are never split out, decoded or even visited by Python code.
+    """
+    return [_event(groups) for groups in CHAT_PATTERN.findall(block)]
+
+
+def iter_chat_events(raw_lines: Iterable[bytes]) -> Iterator[ChatEvent]:
+    """Yield ChatEvents for the chat lines in a stream of raw log lines."""
+    for raw in raw_lines:
+        event = parse_chat(raw)
+        if event is not None:
+            yield event
@@ -0,0 +1,290 @@
+"""
+Outbound chat queue for MCBot.send_chat_message.
+
+Messages go out in order from one sender thread, as fast as two token
+buckets allow: plain chat is held to the server's spam limit, while
+Baritone `#` commands (handled client-side, never sent to the server) only
+wait for the next game tick. On top of that the queue
+
+  * remembers `#settings` values it has sent and drops ones already in place
+  * replaces a `#goto` still waiting at the tail of the queue with a newer
+    `#goto` (the newest target wins), and merges a `#stop` with a waiting
+    `#stop`
+  * drops `#goto`s still waiting when a `#stop` arrives behind them, and a
+    `#stop` right after another `#stop`
+
+A replaced or dropped `#goto` is finished with a failed, "skipped" reply, so
+whoever queued it knows Baritone isn't heading to its target.
+
+The rules live in `_ChatRules`, so `async_bot.AsyncChatQueue` applies the
+same ones from a task on the event loop.
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Optional
+
+from .tracing import TRACER
+
+# Vanilla kicks at 200 spam points, +20 per message and -1 per tick:
+# a burst of about 10, then one message a second
+CHAT_RATE = 1.0
+CHAT_BURST = 8
+# Baritone reads commands once per client tick
+COMMAND_RATE = 20.0
+COMMAND_BURST = 20
+# A second #stop this soon after the last one is dropped
+STOP_REPEAT_WINDOW = 1.0
+
+
+class TokenBucket:
+    """Classic token bucket; `acquire` blocks until a token is free."""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.waited = 0.0
+
+    def _refill(self, now: float):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self) -> float:
+        """Seconds until a token is available (0 if one is free now)."""
+        self._refill(time.monotonic())
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+    def acquire(self, stop: Optional[threading.Event] = None) -> bool:
+        """Take a token. Returns False if `stop` was set while waiting."""
+        delay = self.wait_time()
+        while delay > 0:
+            self.waited += delay
+            if stop is not None and stop.wait(delay):
+                return False
+            if stop is None:
+                time.sleep(delay)
+            delay = self.wait_time()
+        self.tokens -= 1
+        return True
+
+
+class BaritoneSettings:
+    """Last known value of each Baritone setting this bot has set."""
+
+    def __init__(self):
+        self.values: Dict[str, str] = {}
+
+    @staticmethod
+    def parse(message: str):
+        """(name, value) for `#settings name value` / `#set name value`, else None."""
+        parts = message.split()
+        if len(parts) == 3 and parts[0].lower() in ("#settings", "#set"):
+            return parts[1].lower(), parts[2].lower()
+        return None
+
+    def is_redundant(self, name: str, value: str) -> bool:
+        return self.values.get(name) == value
+
+    def record(self, name: str, value: str):
+        self.values[name] = value
+
+    def forget(self, name: Optional[str] = None):
+        """Drop one known value, or all of them (e.g. after the game restarted)."""
+        if name is None:
+            self.values.clear()
+        else:
+            self.values.pop(name, None)
+
+
+def _kind(message: str) -> Optional[str]:
+    word = message.split(" ", 1)[0].lower()
+    if word in ("#goto", "#stop"):
+        return word[1:]
+    return None
+
+
+class _Outgoing:
+    __slots__ = ("message", "kind", "done", "response", "trace")
+
+    def __init__(self, message: str, kind: Optional[str]):
+        self.message = message
+        self.kind = kind
+        self.done = threading.Event()
+        self.response: Optional[Dict[str, Any]] = None
+        # The submitter's trace, so the send shows up in it
+        self.trace = TRACER.current()
+
+    def finish(self, response: Optional[Dict[str, Any]]):
+        self.response = response
+        self.done.set()
+
+
+def _skipped(reason: str) -> Dict[str, Any]:
+    return {"result": {"success": True, "message": reason, "skipped": True}}
+
+
+def _superseded(reason: str) -> Dict[str, Any]:
+    """A queued command that will never be sent because a newer one replaced it."""
+    return {"result": {"success": False, "message": reason, "error": reason, "skipped": True}}
+
+
+class _ChatRules:
+    """Queue state and merge rules shared by ChatQueue and the asyncio
+    AsyncChatQueue; callers hold whatever lock guards it."""
+
+    def __init__(self, chat_rate: float, chat_burst: int):
+        self.chat_bucket = TokenBucket(chat_rate, chat_burst)
+        self.command_bucket = TokenBucket(COMMAND_RATE, COMMAND_BURST)
+        self.settings = BaritoneSettings()
+        self.sent = 0
+        self.dropped = 0
+        self.merged = 0
+        self._queue: Deque[_Outgoing] = deque()
+        self._last_stop = 0.0
+
+    def _admit(self, message: str, make: Callable[[str, Optional[str]], _Outgoing]):
+        """(item, queued): the item to hand back, and whether it was newly
+        queued (False when it was finished or merged on the spot)."""
+        kind = _kind(message)
+        setting = BaritoneSettings.parse(message)
+        if setting is not None:
+            if self.settings.is_redundant(*setting):
+                self.dropped += 1
+                item = make(message, None)
+                item.finish(_skipped(f"{setting[0]} already {setting[1]}"))
+                return item, False
+            # Recorded now so a repeat queued behind this one is dropped too
+            self.settings.record(*setting)
+        if kind == "stop":
+            while self._queue and self._queue[-1].kind == "goto":
+                self._queue.pop().finish(_superseded("superseded by #stop"))
+                self.dropped += 1
+            if not self._queue and time.monotonic() - self._last_stop < STOP_REPEAT_WINDOW:
+                self.dropped += 1
+                item = make(message, kind)
+                item.finish(_skipped("already stopped"))
+                return item, False
+        tail = self._queue[-1] if self._queue else None
+        if kind == "stop" and tail is not None and tail.kind == "stop":
+            # A #stop is still waiting: both callers get the one send
+            self.merged += 1
+            return tail, False
+        if kind == "goto" and tail is not None and tail.kind == "goto":
+            # Only the newest target is worth walking to; the older
+            # caller is told its #goto won't be sent
+            self._queue.pop().finish(_superseded("superseded by a newer #goto"))
+            self.merged += 1
+        item = make(message, kind)
+        self._queue.append(item)
+        return item, True
+
+    def _bucket_for(self, item: _Outgoing) -> TokenBucket:
+        return self.command_bucket if item.message.startswith("#") else self.chat_bucket
+
+    def _take(self) -> _Outgoing:
+        """Pop the head for sending: merges can rewrite it until this point."""
+        item = self._queue.popleft()
+        if item.kind == "stop":
+            self._last_stop = time.monotonic()
+        elif item.message.startswith("#") and BaritoneSettings.parse(item.message) is None:
+            # Baritone has something to do again, so the next #stop counts
+            self._last_stop = 0.0
+        return item
+
+    def _sent(self, item: _Outgoing, response: Optional[Dict[str, Any]]):
+        setting = BaritoneSettings.parse(item.message)
+        failed = not response or not response.get("result", {}).get("success")
+        if setting is not None and failed:
+            self.settings.forget(setting[0])
+        self.sent += 1
+
+    def pending(self) -> int:
+        return len(self._queue)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "sent": self.sent,
+            "dropped": self.dropped,
+            "merged": self.merged,
+            "pending": self.pending(),
+            "rate_limited_seconds": self.chat_bucket.waited + self.command_bucket.waited,
+        }
+
+
+class ChatQueue(_ChatRules):
+    """Ordered, rate-limited sender in front of a raw `send(message)` call."""
+
+    def __init__(self, send: Callable[[str], Optional[Dict[str, Any]]], chat_rate: float = CHAT_RATE,
+                 chat_burst: int = CHAT_BURST):
+        super().__init__(chat_rate, chat_burst)
+        self._send = send
+        self._cond = threading.Condition()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def submit(self, message: str) -> _Outgoing:
+        """Queue a message; the returned item's `done` is set once it is sent
+        (or was dropped as redundant)."""
+        with self._cond:
+            item, queued = self._admit(message, _Outgoing)
+            if queued:
+                self._cond.notify()
+                self._ensure_thread()
+        return item
+
+    def send(self, message: str, timeout: Optional[float] = 30) -> Optional[Dict[str, Any]]:
+        """Queue a message and wait for its reply (None on timeout)."""
+        item = self.submit(message)
+        item.done.wait(timeout)
+        return item.response
+
+    def pending(self) -> int:
+        with self._cond:
+            return len(self._queue)
+
+    def _ensure_thread(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="chat-queue", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while not self._stop.is_set():
+            with self._cond:
+                while not self._queue and not self._stop.is_set():
+                    self._cond.wait()
+                if self._stop.is_set():
+                    break
+                head = self._queue[0]
+            if not self._bucket_for(head).acquire(self._stop):
+                break
+            with self._cond:
+                if not self._queue:
+                    # A #stop emptied the queue while we waited for the token
+                    continue
+                item = self._take()
+            message = item.message
+            try:
+                with TRACER.attached(item.trace), TRACER.span("chat send", message=message):
+                    response = self._send(message)
+            except Exception as e:
+                print(f"❌ Error sending '{message}': {e}")
+                response = None
+            with self._cond:
+                self._sent(item, response)
+            item.finish(response)
+        # Release anyone still waiting
+        with self._cond:
+            while self._queue:
+                self._queue.popleft().finish(None)
+
+    def close(self):
+        self._stop.set()
+        with self._cond:
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+            self._thread = None
@@ -0,0 +1,526 @@
+#!/usr/bin/env python3
+"""
+Simple test client for the GameQuery Minecraft mod.
+Make sure Minecraft is running with the mod loaded before running this script.
+"""
+
+import socket
+import time
+import sys
+import threading
+from typing import Dict, Any, List, Optional
+
+from .chat_queue import ChatQueue, CHAT_RATE, CHAT_BURST
+from .codec import LineReader, get_codec
+from .connection_pool import ConnectionPool, GameQueryConnection, retry_safe
+from .metrics import METRICS
+from .tracing import TRACER
+from .movement import MovementTracker, MOVING, ARRIVED
+from .telemetry import PlayerState, TelemetrySampler
+
+class MCBot:
+    def __init__(self, host: str = "localhost", port: int = 25566, pooled: bool = True, pool_size: int = 4,
+                 telemetry_ttl: float = 0.1, chat_rate: float = CHAT_RATE, chat_burst: int = CHAT_BURST,
+                 cheat_utils_url: Optional[str] = None, recorder=None):
+        self.host = host
+        self.port = port
+        # Pooled mode keeps long-lived connections around; one-shot mode opens
+        # a fresh socket per query like the mod's original examples.
+        self.codec = get_codec()
+        self.pool = ConnectionPool(host, port, size=pool_size, codec=self.codec,
+                                   on_stale=self._on_mod_restart) if pooled else None
+        self.last_trip = None
+        # Every position read goes through here so concurrent pollers share queries
+        self.telemetry = TelemetrySampler(self._fetch_state, ttl=telemetry_ttl)
+        # Rate-limited, ordered chat; drops #settings that are already in place
+        self.chat = ChatQueue(self._send_chat_now, chat_rate=chat_rate, chat_burst=chat_burst)
+        # Cheat Utils inputs and the inventory snapshot are built on first use
+        self.cheat_utils_url = cheat_utils_url
+        self._inputs = None
+        self._inventory = None
+        self._lazy_lock = threading.Lock()
+        # Optional ultron.capture.CaptureWriter that gets every query and reply
+        self.recorder = recorder
+
+    def close(self):
+        """Stop background threads and close any pooled connections."""
+        self.telemetry.stop()
+        self.chat.close()
+        if self._inputs is not None:
+            self._inputs.close()
+        if self.pool is not None:
+            self.pool.close()
+
+    @property
+    def inputs(self):
+        """Cheat Utils inputs over one keep-alive session; unchanged state isn't re-sent."""
+        with self._lazy_lock:
+            if self._inputs is None:
+                from .input_control import CHEAT_UTILS_URL, InputController
+                self._inputs = InputController(self.cheat_utils_url or CHEAT_UTILS_URL)
+            return self._inputs
+
+    @property
+    def inventory(self):
+        """Slot -> item snapshot kept current from our own drops; bulk drops in one batch."""
+        with self._lazy_lock:
+            if self._inventory is None:
+                from .inventory import Inventory
+                self._inventory = Inventory(self)
+            return self._inventory
+
+    def _send_one_shot(self, query: Dict[str, Any]) -> Dict[str, Any]:
+        # Create socket connection
+        with socket.create_connection((self.host, self.port), timeout=5) as sock:
+            # Send query as one JSON line and read back the reply line
+            sock.sendall(self.codec.encode_line(query))
+            return LineReader(sock, self.codec).receive()
+
+    def _on_mod_restart(self):
+        print(f"🔁 Reconnecting to {self.host}:{self.port} (the mod closed our connections)")
+        # The game restarted, so Baritone is back on its default settings
+        self.chat.settings.forget()
+
+    def _send_pooled(self, query: Dict[str, Any]) -> Dict[str, Any]:
+        # Sockets the mod already closed are replaced in acquire(), before
+        # anything is written, so this only fails if it drops mid-request
+        conn = self.pool.acquire()
+        reused = conn.requests_served > 0
+        try:
+            response = conn.request(query)
+        except (ConnectionError, BrokenPipeError):
+            self.pool.release(conn, broken=True)
+            if not reused or not retry_safe([query]):
+                # The mod may have acted on it already; don't send it twice
+                raise
+            # Retry a read once on a fresh connection
+            self.pool.discard_idle()
+            self._on_mod_restart()
+            with self.pool.connection() as fresh:
+                return fresh.request(query)
+        except BaseException:
+            self.pool.release(conn, broken=True)
+            raise
+        self.pool.release(conn)
+        return response
+
+    def send_query(self, query: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Send a query to the Minecraft client and return the response."""
+        kind = query.get("type", "unknown")
+        start = time.perf_counter()
+        response = None
+        try:
+            with TRACER.span(kind, cat="query"):
+                if self.pool is None:
+                    response = self._send_one_shot(query)
+                else:
+                    response = self._send_pooled(query)
+            METRICS.observe("gamequery_query_seconds", time.perf_counter() - start, type=kind)
+            METRICS.inc("gamequery_queries_total", type=kind)
+            if isinstance(response, dict) and "error" in response:
+                METRICS.inc("gamequery_errors_total", type=kind, reason="reply")
+            return response
+
+        except socket.timeout:
+            METRICS.inc("gamequery_errors_total", type=kind, reason="timeout")
+            print(f"❌ Timeout connecting to {self.host}:{self.port}")
+            return None
+        except ConnectionRefusedError:
+            METRICS.inc("gamequery_errors_total", type=kind, reason="refused")
+            print(f"❌ Connection refused to {self.host}:{self.port}")
+            print("   Make sure Minecraft is running with the GameQuery mod loaded")
+            return None
+        except Exception as e:
+            METRICS.inc("gamequery_errors_total", type=kind, reason="error")
+            print(f"❌ Error: {e}")
+            return None
+        finally:
+            if self.recorder is not None:
+                self.recorder.exchange(query, response, time.perf_counter() - start)
+
+    def _batch_once(self, queries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        if self.pool is None:
+            conn = GameQueryConnection(self.host, self.port, codec=self.codec)
+            try:
+                return conn.request_many(queries)
+            finally:
+                conn.close()
+        conn = self.pool.acquire()
+        reused = conn.requests_served > 0
+        try:
+            replies = conn.request_many(queries)
+        except (ConnectionError, BrokenPipeError):
+            self.pool.release(conn, broken=True)
+            if not reused:
+                raise
+            replies = []
+        except BaseException:
+            self.pool.release(conn, broken=True)
+            raise
+        else:
+            # A short read means the server hung up, so the socket can't be reused
+            self.pool.release(conn, broken=len(replies) < len(queries))
+        if not replies and reused and retry_safe(queries):
+            # Dropped before any reply; reads are safe to send again
+            self.pool.discard_idle()
+            return self._batch_once(queries)
+        return replies
+
+    def batch(self, queries: List[Dict[str, Any]]) -> List[Optional[Dict[str, Any]]]:
+        """Send many queries in one write and return the replies in order.
+
+        Independent queries (position + block scan, look_at + click, ...) cost
+        a single round trip instead of one each. Entries are None for queries
+        that failed, matching send_query.
+
+        If the connection drops part way, the unanswered queries are only
+        resent when they're all reads (see RETRY_SAFE); chat, drops and
+        clicks may already have run, so they come back as None instead.
+        """
+        if self.pool is None and not retry_safe(queries):
+            # One-shot mod builds may answer one query per connection, and
+            # the rest of a batch can't be resent blindly
+            return [self.send_query(q) for q in queries]
+        replies: List[Optional[Dict[str, Any]]] = []
+        start = time.perf_counter()
+        reason = "dropped"
+        try:
+            with TRACER.span("batch", cat="query", size=len(queries)):
+                while len(replies) < len(queries):
+                    rest = queries[len(replies):]
+                    if replies and not retry_safe(rest):
+                        print(f"⚠️ Connection dropped mid-batch; not resending {len(rest)} queries that may have run")
+                        break
+                    sent = time.perf_counter()
+                    got = self._batch_once(rest)
+                    if got and self.recorder is not None:
+                        self.recorder.exchanges(rest, got, time.perf_counter() - sent)
+                    if not got:
+                        if not retry_safe(rest):
+                            print(f"⚠️ No replies to a batch of {len(rest)}; not resending queries that may have run")
+                            break
+                        # Server answered nothing on a fresh connection; fall back
+                        # to one query at a time so the caller still gets replies.
+                        replies.extend(self.send_query(q) for q in rest)
+                        break
+                    replies.extend(got)
+            METRICS.observe("gamequery_batch_seconds", time.perf_counter() - start)
+            for query, reply in zip(queries, replies):
+                kind = query.get("type", "unknown")
+                METRICS.inc("gamequery_queries_total", type=kind)
+                if reply is None or "error" in reply:
+                    METRICS.inc("gamequery_errors_total", type=kind, reason="reply")
+            if len(replies) == len(queries):
+                return replies
+        except socket.timeout:
+            reason = "timeout"
+            print(f"❌ Timeout connecting to {self.host}:{self.port}")
+        except ConnectionRefusedError:
+            reason = "refused"
+            print(f"❌ Connection refused to {self.host}:{self.port}")
+            print("   Make sure Minecraft is running with the GameQuery mod loaded")
+        except Exception as e:
+            reason = "error"
+            print(f"❌ Error: {e}")
+        for query in queries[len(replies):]:
+            METRICS.inc("gamequery_errors_total", type=query.get("type", "unknown"), reason=reason)
+        if self.recorder is not None:
+            failed = queries[len(replies):]
+            self.recorder.exchanges(failed, [None] * len(failed), time.perf_counter() - start)
+        return replies + [None] * (len(queries) - len(replies))
+
+    def pipeline(self) -> "Pipeline":
+        """Collect queries in a `with` block and send them as one batch on exit."""
+        return Pipeline(self)
+
+    def send_chat_message(self, message: str):
+        """Send a chat message as the player, through the outbound queue."""
+        with TRACER.span("chat", message=message):
+            response = self.chat.send(message)
+        if response and response.get("result", {}).get("skipped"):
+            print(f"⏭️ Skipping '{message}': {response['result']['message']}")
+        return response
+
+    def _send_chat_now(self, message: str):
+        print(f"\n💬 Sending chat message: '{message}'")
+        response = self.send_query({"type": "send_chat", "message": message})
+        
+        if response:
+            result = response.get("result", {})
+            if result.get("success"):
+                print(f"✅ {result.get('message', 'Message sent')}")
+            else:
+                print(f"❌ Failed: {result.get('error', 'Unknown error')}")
+        return response
+    
+    def drop_item_from_slot(self, slot: int):
+        """Drop an item from a specific inventory slot."""
+        print(f"\n🗑️ Dropping item from slot {slot}...")
+        response = self.send_query({"type": "drop_item", "slot": slot})
+        
+        if response:
+            result = response.get("result", {})
+            if result.get("success"):
+                self.inventory.note_dropped_slot(slot)
+                print(f"✅ {result.get('message', 'Item dropped')}")
+            else:
+                print(f"❌ Failed: {result.get('error', 'Unknown error')}")
+        return response
+    
+    def drop_items_by_name(self, item_name: str):
+        """Drop all items matching a name."""
+        print(f"\n🗑️ Dropping items matching '{item_name}'...")
+        response = self.send_query({"type": "drop_item", "name": item_name})
+        
+        if response:
+            result = response.get("result", {})
+            if result.get("success"):
+                self.inventory.note_dropped_name(item_name)
+                print(f"✅ {result.get('message', 'Items dropped')}")
+            else:
+                print(f"❌ Failed: {result.get('error', 'Unknown error')}")
+        return response
+    
+    def rotate_player(self, yaw: float = None, pitch: float = None):
+        """Rotate the player to a specific direction."""
+        rotation_desc = []
+        if yaw is not None:
+            rotation_desc.append(f"yaw: {yaw}°")
+        if pitch is not None:
+            rotation_desc.append(f"pitch: {pitch}°")
+        
+        print(f"\n🔄 Rotating player ({', '.join(rotation_desc)})...")
+        
+        query = {"type": "rotate"}
+        if yaw is not None:
+            query["yaw"] = yaw
+        if pitch is not None:
+            query["pitch"] = pitch
+            
+        response = self.send_query(query)
+        self.telemetry.invalidate()
+        
+        if response:
+            result = response.get("result", {})
+            if result.get("success"):
+                print(f"✅ {result.get('message', 'Player rotated')}")
+            else:
+                print(f"❌ Failed: {result.get('error', 'Unknown error')}")
+        return response
+    
+    def look_at(self, x: float, y: float, z: float):
+        response = self.send_query({ "type": "point_to_xyz", "x": x, "y": y, "z": z })
+        self.telemetry.invalidate()
+    
+    def get_position(self, max_age: Optional[float] = None) -> Optional[PlayerState]:
+        """Current player state, shared with other readers (see telemetry.py)."""
+        return self.telemetry.get(max_age)
+
+    def _fetch_state(self) -> Optional[PlayerState]:
+        return self.parse_position(self.send_query({"type": "position"}))
+
+    @staticmethod
+    def parse_position(response: Optional[Dict[str, Any]]) -> Optional[PlayerState]:
+        """Turn a `position` reply into a PlayerState."""
+        if response:
+            if "error" in response:
+                print(f"❌ Error: {response['error']}")
+            else:
+                pos = response.get("position", {})
+                #print(f"✅ Player position:")
+                #print(f"   Location: ({pos.get('x', 0):.1f}, {pos.get('y', 0):.1f}, {pos.get('z', 0):.1f})")
+                #print(f"   Rotation: Yaw {pos.get('yaw', 0):.1f}°, Pitch {pos.get('pitch', 0):.1f}°")
+                #print(f"   Health: {pos.get('health', 0):.1f}/{pos.get('maxHealth', 0):.1f}")
+                #print(f"   Food: {pos.get('food', 0)}/20")
+                #print(f"   Level: {pos.get('level', 0)} (Total XP: {pos.get('experience', 0)})")
+                return PlayerState.from_reply(pos)
+
+    def goto(self, x: float, y: float, z: float, tolerance: float = 2, max_wait: Optional[float] = None,
+             cancel: Optional[threading.Event] = None):
+        """Walk to (x, y, z) with Baritone. Returns True on arrival, False if
+        stuck, timed out or `cancel` was set."""
+        print(f"Going to {x} {y} {z}")
+        with TRACER.span("goto", target=[x, y, z]) as span:
+            self.look_at(x, y, z)
+            reply = self.send_chat_message(f"#goto {x} {y} {z}")
+            if reply and reply.get("result", {}).get("skipped") and not reply["result"].get("success"):
+                # Replaced by a newer #goto or a #stop before it was sent
+                span.set(outcome="superseded")
+                self.last_trip = None
+                return False
+            tracker = MovementTracker(target=(x, y, z), tolerance=tolerance, max_wait=max_wait)
+            fetches = self.telemetry.fetches
+            while tracker.update(self.get_position()) == MOVING:
+                delay = tracker.next_delay()
+                with TRACER.span("poll wait", delay=round(delay, 3)):
+                    if cancel is None:
+                        time.sleep(delay)
+                    elif cancel.wait(delay):
+                        tracker.cancel()
+                        break
+            tracker.stats.wire_queries = self.telemetry.fetches - fetches
+            span.set(outcome=tracker.state, reads=tracker.stats.reads, queries=tracker.stats.wire_queries)
+        self.last_trip = tracker.stats
+        print(f"📍 goto {x} {y} {z}: {tracker.summary()}")
+        return tracker.state == ARRIVED
+    
+    def right_click(self):
+        response = self.send_query({"type": "right_click"})
+        
+        if response:
+            if "error" in response:
+                print(f"❌ Error: {response['error']}")
+    
+    def left_click(self):
+        response = self.send_query({"type": "left_click"})
+        
+        if response:
+            if "error" in response:
+                print(f"❌ Error: {response['error']}")
+                
+    def attack(self):
+        response = self.send_query({"type": "attack"})
+        
+        if response:
+            if "error" in response:
+                print(f"❌ Error: {response['error']}")
+                
+    def open_container(self):
+        response = self.send_query({"type": "open_container"})
+        
+        if response:
+            if "error" in response:
+                print(f"❌ Error: {response['error']}")
+
+    def cheat_utils_post(self, endpoint: str, payload: dict):
+        return self.inputs.post(endpoint, payload)
+
+    def press_right_click(self):
+        return self.inputs.set(holdUse=True)
+
+    def release_right_click(self):
+        return self.inputs.set(holdUse=False)
+
+    def right_click_hold(self, seconds: float = 0.5) -> threading.Event:
+        """Hold use for `seconds` without blocking; wait() on the result to block."""
+        return self.inputs.hold("holdUse", seconds)
+
+    def get_block(self, x, y, z):
+        """Get information about the block at the specified coordinates."""
+        response = self.send_query({"type": "get_block", "x": x, "y": y, "z": z})
+        if response:
+            return response
+        else:
+            print(f"❌ Failed to get block at ({x}, {y}, {z})")
+            return None
+
+    def get_blocks_in_range(self, range_size: int = 5):
+        """Get all blocks in a cubic range around the player."""
+        return self.parse_blocks(self.send_query({"type": "blocks", "range": range_size}))
+
+    @staticmethod
+    def parse_blocks(response: Optional[Dict[str, Any]]):
+        """Extract the block list from a `blocks` reply."""
+        if response and "blocks" in response.get("blocks", {}):
+            return response["blocks"]["blocks"]
+        return []
+
+
+class PendingReply:
+    """Placeholder for a pipelined reply; `result` is filled in when the batch is sent."""
+    __slots__ = ("query", "result")
+
+    def __init__(self, query: Dict[str, Any]):
+        self.query = query
+        self.result: Optional[Dict[str, Any]] = None
+
+
+class Pipeline:
+    """Context manager that batches queries on one connection.
+
+    with client.pipeline() as p:
+        pos = p.add({"type": "position"})
+        blocks = p.add({"type": "blocks", "range": 5})
+    x, y, z, *_ = MCBot.parse_position(pos.result)
+    """
+
+    def __init__(self, client: MCBot):
+        self.client = client
+        self.pending: List[PendingReply] = []
+
+    def add(self, query: Dict[str, Any]) -> PendingReply:
+        reply = PendingReply(query)
+        self.pending.append(reply)
+        return reply
+
+    def flush(self):
+        if not self.pending:
+            return
+        pending, self.pending = self.pending, []
+        for reply, result in zip(pending, self.client.batch([r.query for r in pending])):
+            reply.result = result
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.flush()
+        return False
+
+@TRACER.traced("get_iron")
+def get_iron(client: MCBot):
+    """Walk to the iron farm chest and open it (the `get_iron` plan)."""
+    from .plans import PlanBook, PlanExecutor
+    executor = PlanExecutor(client)
+    try:
+        return executor.run(PlanBook().get("get_iron"))
+    finally:
+        executor.close()
+
+def main():
+    """Interactive test menu (the old `python mc-bot.py`)."""
+    print("🎮 GameQuery Minecraft Mod Test Client")
+    print("=====================================")
+    
+    client = MCBot()
+    
+    # Test connection
+    print("\n🔗 Testing connection...")
+    test_response = client.send_query({"type": "position"})
+    if test_response is None:
+        print("❌ Cannot connect to GameQuery server")
+        print("   Make sure:")
+        print("   1. Minecraft is running")
+        print("   2. GameQuery mod is loaded")
+        print("   3. You're in a world (not main menu)")
+        sys.exit(1)
+    
+    print("✅ Connected to GameQuery server!")
+    running = True
+    while running:
+        try:
+            print("\nWhat would you like to do next?")
+            print("1. Get Iron")
+            print("2. Action demo (demonstrate new features)")
+            print("3. Exit")
+                
+            choice = input("Enter choice (1-3): ").strip()
+                
+            if choice == "1":
+                get_iron(client)
+            #elif choice == "2":
+            #    action_demo()
+            elif choice == "3":
+                print("👋 Goodbye!")
+                sys.exit(0)
+                break
+            else:
+                print("Invalid choice. Goodbye!")
+                    
+        except (KeyboardInterrupt, EOFError):
+            print("\n👋 Goodbye!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""
+Byte-level codec for the GameQuery protocol (newline-delimited JSON).
+
+Queries are encoded straight to bytes with the trailing newline, and replies
+are framed out of one reusable receive buffer filled with recv_into(): each
+line is handed to the JSON decoder as a memoryview slice, without a text
+decode, readline() copy or strip(). Large `blocks` replies are where this
+pays off.
+
+The JSON backend is orjson or msgspec when installed, else the stdlib.
+Set JSON_BACKEND=json|orjson|msgspec to pick one (default: auto).
+"""
+
+import os
+import socket
+from typing import Any, Callable, Optional
+
+# Start size of a LineReader's buffer; it doubles for longer lines
+RECV_BUFFER = 1 << 16
+# A reply longer than this is treated as a broken connection rather than buffered forever
+MAX_LINE = 64 << 20
+BACKENDS = ("orjson", "msgspec", "json")
+
+
+class JSONCodec:
+    """encode_line(obj) -> bytes ending in b"\\n"; decode(bytes-like) -> obj."""
+
+    __slots__ = ("name", "encode_line", "decode")
+
+    def __init__(self, name: str, encode_line: Callable[[Any], bytes], decode: Callable[[Any], Any]):
+        self.name = name
+        self.encode_line = encode_line
+        self.decode = decode
+
+    def __repr__(self):
+        return f"JSONCodec({self.name!r})"
+
+
+def _orjson() -> JSONCodec:
+    import orjson
+    dumps, loads, newline = orjson.dumps, orjson.loads, orjson.OPT_APPEND_NEWLINE
+    return JSONCodec("orjson", lambda obj: dumps(obj, option=newline), loads)
+
+
+def _msgspec() -> JSONCodec:
+    import msgspec
+    encode, decode = msgspec.json.Encoder().encode, msgspec.json.Decoder().decode
+    return JSONCodec("msgspec", lambda obj: encode(obj) + b"\n", decode)
+
+
+def _stdlib() -> JSONCodec:
+    import json
+    dumps, loads = json.JSONEncoder(separators=(",", ":")).encode, json.loads
+
+    def decode(data):
+        # json.loads takes bytes but not memoryview
+        return loads(data if isinstance(data, (bytes, bytearray)) else bytes(data))
+
+    return JSONCodec("json", lambda obj: dumps(obj).encode('utf-8') + b"\n", decode)
+
+
+_FACTORIES = {"orjson": _orjson, "msgspec": _msgspec, "json": _stdlib}
+_codecs = {}
+
+
+def get_codec(name: Optional[str] = None) -> JSONCodec:
+    """The named backend, or the fastest installed one (JSON_BACKEND overrides)."""
+    name = name or os.environ.get("JSON_BACKEND", "auto")
+    codec = _codecs.get(name)
+    if codec is not None:
+        return codec
+    if name == "auto":
+        for candidate in BACKENDS:
+            try:
+                codec = get_codec(candidate)
+                break
+            except ImportError:
+                continue
+    elif name in _FACTORIES:
+        codec = _FACTORIES[name]()
+    else:
+        raise ValueError(f"Unknown JSON backend {name!r}; expected auto or one of {', '.join(BACKENDS)}")
+    _codecs[name] = codec
+    return codec
+
+
+class LineReader:
+    """Newline framing over a socket with one reusable receive buffer.
+
+    Bytes land in a bytearray via recv_into(); complete lines are decoded
+    in place through memoryview slices. Leftover bytes of a partial line are
+    moved to the front only when the buffer runs out of room.
+    """
+
+    def __init__(self, sock: socket.socket, codec: Optional[JSONCodec] = None, size: int = RECV_BUFFER):
+        self.sock = sock
+        self.codec = codec or get_codec()
+        self._buf = bytearray(size)
+        self._start = 0   # first unread byte
+        self._end = 0     # end of received data
+        self._scan = 0    # no newline before this offset
+
+    def _fill(self) -> int:
+        """Receive more bytes, making room first. Returns 0 at EOF."""
+        buf = self._buf
+        if self._end == len(buf):
+            pending = self._end - self._start
+            if self._start:
+                # Slide the partial line to the front
+                buf[:pending] = buf[self._start:self._end]
+                self._scan -= self._start
+                self._start, self._end = 0, pending
+            else:
+                if len(buf) >= MAX_LINE:
+                    raise ConnectionError(f"Reply line longer than {MAX_LINE} bytes")
+                buf.extend(bytes(len(buf)))
+        with memoryview(buf) as view:
+            n = self.sock.recv_into(view[self._end:])
+        self._end += n
+        return n
+
+    def _next_line(self):
+        """(start, end) of the next line, or None if the server hung up."""
+        while True:
+            nl = self._buf.find(b"\n", self._scan, self._end)
+            if nl >= 0:
+                start = self._start
+                self._start = self._scan = nl + 1
+                if self._start == self._end:
+                    # Buffer drained: next recv starts at the front again
+                    self._start = self._end = self._scan = 0
+                return start, nl
+            self._scan = self._end
+            if not self._fill():
+                return None
+
+    def read_line(self) -> Optional[bytes]:
+        """Next raw line (without the newline) as bytes, or None at EOF."""
+        span = self._next_line()
+        if span is None:
+            return None
+        return bytes(self._buf[span[0]:span[1]])
+
+    def receive(self) -> Any:
+        """Decode the next non-blank line. Raises ConnectionError at EOF."""
+        while True:
+            span = self._next_line()
+            if span is None:
+                raise ConnectionError("Connection closed by server")
+            start, end = span
+            if end > start and self._buf[end - 1] == 13:  # \r
+                end -= 1
+            if end > start:
+                with memoryview(self._buf) as view:
+                    return self.codec.decode(view[start:end])
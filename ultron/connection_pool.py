@@ -0,0 +1,178 @@
+"""
+Connection pooling for the GameQuery socket protocol.
+
+The mod speaks newline-delimited JSON, so one TCP connection can carry any
+number of request/response pairs as long as replies are read back in order.
+Framing and JSON are handled on bytes by the codec module.
+"""
+
+import select
+import socket
+import threading
+from contextlib import contextmanager
+from typing import Callable, Dict, Any, List, Optional
+
+from .codec import JSONCodec, LineReader, get_codec
+
+# Queries that only read state (or set the view absolutely), so sending one
+# twice is harmless. Anything else (chat, drops, clicks) may already have run
+# when a connection drops, and is never resent automatically.
+RETRY_SAFE = frozenset({"position", "blocks", "get_block", "inventory", "rotate", "point_to_xyz"})
+
+
+def retry_safe(queries: List[Dict[str, Any]]) -> bool:
+    return all(q.get("type") in RETRY_SAFE for q in queries)
+
+
+class GameQueryConnection:
+    """A single long-lived, newline-framed connection to the GameQuery mod."""
+
+    def __init__(self, host: str, port: int, timeout: float = 5, codec: Optional[JSONCodec] = None):
+        self.host = host
+        self.port = port
+        self.codec = codec or get_codec()
+        self.sock = socket.create_connection((host, port), timeout=timeout)
+        self.reader = LineReader(self.sock, self.codec)
+        self.requests_served = 0
+
+    def send(self, query: Dict[str, Any]):
+        """Write one query line without waiting for the reply."""
+        self.sock.sendall(self.codec.encode_line(query))
+
+    def receive(self) -> Dict[str, Any]:
+        """Read one reply line. Raises ConnectionError if the mod hung up."""
+        try:
+            reply = self.reader.receive()
+        except ConnectionError:
+            raise ConnectionError(f"Connection to {self.host}:{self.port} closed by server") from None
+        self.requests_served += 1
+        return reply
+
+    def is_stale(self) -> bool:
+        """True if the server already hung up on this idle connection.
+        Checked without blocking or consuming anything."""
+        try:
+            readable, _, _ = select.select([self.sock], [], [], 0)
+            return bool(readable) and self.sock.recv(1, socket.MSG_PEEK) == b""
+        except OSError:
+            return True
+
+    def send_many(self, queries: List[Dict[str, Any]]):
+        """Write several query lines in a single sendall."""
+        encode = self.codec.encode_line
+        self.sock.sendall(b"".join([encode(q) for q in queries]))
+
+    def request(self, query: Dict[str, Any]) -> Dict[str, Any]:
+        self.send(query)
+        return self.receive()
+
+    def request_many(self, queries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Pipeline queries and return the replies that arrived, in order.
+
+        If the server hangs up part way (e.g. a mod build that closes after
+        each reply) the replies read so far are returned and the caller can
+        resend the rest.
+        """
+        self.send_many(queries)
+        replies = []
+        for _ in queries:
+            try:
+                replies.append(self.receive())
+            except ConnectionError:
+                break
+        return replies
+
+    def close(self):
+        self.sock.close()
+
+
+class ConnectionPool:
+    """Thread-safe pool of GameQueryConnection objects.
+
+    Connections are created lazily up to `size`; callers beyond that block
+    until one is released. Broken connections are discarded on release, and
+    an idle connection the server has closed (e.g. the mod restarted) is
+    replaced at checkout, before anything is written to it; `on_stale` is
+    called when that happens.
+    """
+
+    def __init__(self, host: str, port: int, size: int = 4, timeout: float = 5,
+                 codec: Optional[JSONCodec] = None, on_stale: Optional[Callable[[], None]] = None):
+        self.host = host
+        self.port = port
+        self.size = size
+        self.timeout = timeout
+        self.codec = codec
+        self.on_stale = on_stale
+        self.stale_reconnects = 0
+        self._idle: List[GameQueryConnection] = []
+        self._open = 0
+        self._cond = threading.Condition()
+        self._closed = False
+
+    def acquire(self) -> GameQueryConnection:
+        while True:
+            with self._cond:
+                while True:
+                    if self._closed:
+                        raise ConnectionError("Connection pool is closed")
+                    if self._idle:
+                        conn = self._idle.pop()
+                        break
+                    if self._open < self.size:
+                        self._open += 1
+                        conn = None
+                        break
+                    self._cond.wait()
+            if conn is None:
+                try:
+                    return GameQueryConnection(self.host, self.port, self.timeout, self.codec)
+                except BaseException:
+                    with self._cond:
+                        self._open -= 1
+                        self._cond.notify()
+                    raise
+            if not conn.is_stale():
+                return conn
+            # The server closed an idle socket, so the others are stale too
+            self.release(conn, broken=True)
+            self.discard_idle()
+            self.stale_reconnects += 1
+            if self.on_stale is not None:
+                self.on_stale()
+
+    def release(self, conn: GameQueryConnection, broken: bool = False):
+        with self._cond:
+            if broken or self._closed:
+                self._open -= 1
+                conn.close()
+            else:
+                self._idle.append(conn)
+            self._cond.notify()
+
+    def discard_idle(self):
+        """Close every idle connection, e.g. after detecting a mod restart."""
+        with self._cond:
+            idle, self._idle = self._idle, []
+            self._open -= len(idle)
+            self._cond.notify_all()
+        for conn in idle:
+            conn.close()
+
+    @contextmanager
+    def connection(self):
+        conn = self.acquire()
+        broken = False
+        try:
+            yield conn
+        except BaseException:
+            # A half-read reply would desync the framing, so never reuse it
+            broken = True
+            raise
+        finally:
+            self.release(conn, broken=broken)
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+        self.discard_idle()
@@ -0,0 +1,280 @@
+"""
+Table-driven chat command dispatch with a worker-backed job queue.
+
+Commands are registered by word prefix in a trie ("farm home", "find a",
+...), so a message is matched in one walk over its words instead of a chain
+of startswith checks. Handlers that move the bot run as jobs on a single
+worker thread (the bot can only be in one place at a time); everything else
+runs inline on the listener, so `stop` and other players' commands are seen
+immediately even during a five minute farm run.
+"""
+
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+
+class Command:
+    __slots__ = ("name", "handler", "background", "exact")
+
+    def __init__(self, name: str, handler: Callable, background: bool, exact: bool):
+        self.name = name
+        self.handler = handler
+        self.background = background
+        self.exact = exact
+
+
+class CommandRegistry:
+    """Word-level prefix trie of chat commands."""
+
+    def __init__(self):
+        self._root: Dict[str, Any] = {}
+
+    def register(self, phrase: str, handler: Callable, background: bool = False, exact: bool = False):
+        """Map `phrase` (e.g. "farm home") to `handler(ctx)`. With `exact`, the
+        command only matches when nothing follows the phrase."""
+        node = self._root
+        for word in phrase.lower().split():
+            node = node.setdefault(word, {})
+        node[None] = Command(phrase, handler, background, exact)
+
+    def command(self, phrase: str, background: bool = False, exact: bool = False):
+        """Decorator form of register()."""
+        def wrap(handler):
+            self.register(phrase, handler, background, exact)
+            return handler
+        return wrap
+
+    def match(self, msg: str) -> Optional[Tuple[Command, str]]:
+        """Longest registered phrase that prefixes `msg`, plus the remaining text."""
+        words = msg.split()
+        node = self._root
+        best = None
+        for i, word in enumerate(words + [None]):
+            command = node.get(None)
+            if command is not None and (not command.exact or i == len(words)):
+                best = (command, " ".join(words[i:]))
+            if word is None:
+                break
+            node = node.get(word.lower())
+            if node is None:
+                break
+        return best
+
+
+class CommandContext:
+    """What a handler gets: who asked, what they said, which dispatcher (and
+    so which bot/log) it came through, and how to bail out."""
+    __slots__ = ("client", "user", "msg", "args", "dispatcher", "cancel")
+
+    def __init__(self, client, user: str, msg: str, args: str, dispatcher: "Dispatcher" = None,
+                 cancel: Optional[threading.Event] = None):
+        self.client = client
+        self.user = user
+        self.msg = msg
+        self.args = args
+        self.dispatcher = dispatcher
+        self.cancel = cancel if cancel is not None else threading.Event()
+
+
+class Job:
+    __slots__ = ("id", "name", "ctx", "handler", "enqueued", "started", "finished", "result")
+
+    def __init__(self, job_id: int, name: str, ctx: CommandContext, handler: Callable):
+        self.id = job_id
+        self.name = name
+        self.ctx = ctx
+        self.handler = handler
+        self.enqueued = time.monotonic()
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+        self.result = None
+
+    @property
+    def cancelled(self) -> bool:
+        return self.ctx.cancel.is_set()
+
+    def __repr__(self):
+        return f"Job(#{self.id} {self.name} for {self.ctx.user})"
+
+
+class JobQueue:
+    """Per-player FIFO queues served round-robin by one worker thread."""
+
+    def __init__(self, max_per_player: int = 3, history: int = 100):
+        self.max_per_player = max_per_player
+        self._queues: "OrderedDict[str, Deque[Job]]" = OrderedDict()
+        self._cond = threading.Condition()
+        self._next_id = 1
+        self.current: Optional[Job] = None
+        self.completed: Deque[Job] = deque(maxlen=history)
+        self.created = time.monotonic()
+        self.total_completed = 0
+        self.busy_time = 0.0
+        self._worker: Optional[threading.Thread] = None
+
+    def submit(self, name: str, ctx: CommandContext, handler: Callable) -> Optional[Job]:
+        with self._cond:
+            queue = self._queues.setdefault(ctx.user, deque())
+            if len(queue) >= self.max_per_player:
+                print(f"⚠️ {ctx.user} already has {len(queue)} queued jobs, dropping '{name}'")
+                return None
+            job = Job(self._next_id, name, ctx, handler)
+            self._next_id += 1
+            queue.append(job)
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run, name="job-worker", daemon=True)
+                self._worker.start()
+            self._cond.notify()
+        print(f"📥 Queued {job} (queue depth {self.depth})")
+        return job
+
+    def _next_job(self) -> Job:
+        with self._cond:
+            while not self._queues:
+                self._cond.wait()
+            # Round-robin: take the head of the first player's queue, then move
+            # that player to the back so one busy player can't starve the rest
+            user, queue = next(iter(self._queues.items()))
+            job = queue.popleft()
+            if queue:
+                self._queues.move_to_end(user)
+            else:
+                del self._queues[user]
+            self.current = job
+            return job
+
+    def _run(self):
+        while True:
+            job = self._next_job()
+            job.started = time.monotonic()
+            if job.cancelled:
+                print(f"⏭️ Skipping cancelled {job}")
+            else:
+                print(f"▶️ Starting {job} after {job.started - job.enqueued:.1f}s in queue")
+                try:
+                    job.result = job.handler(job.ctx)
+                except Exception as e:
+                    print(f"❌ {job} failed: {e}")
+                    job.result = False
+            job.finished = time.monotonic()
+            print(f"⏹️ Finished {job} in {job.finished - job.started:.1f}s")
+            with self._cond:
+                self.current = None
+                self.completed.append(job)
+                self.total_completed += 1
+                self.busy_time += job.finished - job.started
+
+    def take(self, name: str) -> List[Job]:
+        """Pull every queued, uncancelled job called `name` out of the queues
+        (so a running job can fold them into its own work). Hand each one
+        back through record() when it's done."""
+        taken = []
+        with self._cond:
+            for user in list(self._queues):
+                queue = self._queues[user]
+                keep = deque(job for job in queue if job.name != name or job.cancelled)
+                taken += [job for job in queue if job.name == name and not job.cancelled]
+                if keep:
+                    self._queues[user] = keep
+                else:
+                    del self._queues[user]
+        for job in taken:
+            job.started = time.monotonic()
+        return taken
+
+    def record(self, job: Job, result=None):
+        """Count a job taken with take() as finished."""
+        job.finished = time.monotonic()
+        job.result = result
+        with self._cond:
+            self.completed.append(job)
+            # Busy time is already counted by the job that did the work
+            self.total_completed += 1
+
+    def cancel(self, clear_queue: bool = True) -> int:
+        """Preempt the running job (and, by default, drop everything queued).
+        Returns the number of jobs cancelled."""
+        cancelled = 0
+        with self._cond:
+            if self.current is not None and not self.current.cancelled:
+                self.current.ctx.cancel.set()
+                cancelled += 1
+            if clear_queue:
+                for queue in self._queues.values():
+                    for job in queue:
+                        job.ctx.cancel.set()
+                        cancelled += 1
+        return cancelled
+
+    @property
+    def idle(self) -> bool:
+        with self._cond:
+            return self.current is None and not self._queues
+
+    @property
+    def load(self) -> int:
+        """Running plus queued jobs."""
+        with self._cond:
+            return (self.current is not None) + sum(len(q) for q in self._queues.values())
+
+    @property
+    def depth(self) -> int:
+        with self._cond:
+            return sum(len(q) for q in self._queues.values())
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth, what's running, and wait/run latency of recent jobs."""
+        with self._cond:
+            per_player = {user: len(q) for user, q in self._queues.items()}
+            current = self.current
+            done = list(self.completed)
+        now = time.monotonic()
+        waits = [j.started - j.enqueued for j in done]
+        runs = [j.finished - j.started for j in done]
+        return {
+            "depth": sum(per_player.values()),
+            "per_player": per_player,
+            "running": None if current is None else {
+                "job": repr(current),
+                "elapsed": now - current.started if current.started else 0.0,
+            },
+            "completed": len(done),
+            "total_completed": self.total_completed,
+            "busy_fraction": self.busy_time / max(now - self.created, 1e-9),
+            "jobs_per_hour": self.total_completed * 3600 / max(now - self.created, 1e-9),
+            "avg_wait": sum(waits) / len(waits) if waits else 0.0,
+            "max_wait": max(waits, default=0.0),
+            "avg_run": sum(runs) / len(runs) if runs else 0.0,
+        }
+
+
+class Dispatcher:
+    """Route chat messages through a CommandRegistry onto a JobQueue."""
+
+    def __init__(self, registry: CommandRegistry, jobs: Optional[JobQueue] = None, log_path: Optional[str] = None):
+        self.registry = registry
+        self.jobs = jobs if jobs is not None else JobQueue()
+        # Log the routines should watch for this bot (None = the default LOG_PATH)
+        self.log_path = log_path
+
+    def dispatch(self, client, user: str, msg: str) -> bool:
+        """Handle one chat message. Returns False if no command matched."""
+        found = self.registry.match(msg.strip())
+        if found is None:
+            return False
+        command, args = found
+        ctx = CommandContext(client, user, msg.strip(), args, self)
+        if command.background:
+            self.jobs.submit(command.name, ctx, command.handler)
+        else:
+            command.handler(ctx)
+        return True
+
+    def status_line(self) -> str:
+        stats = self.jobs.stats()
+        running = stats["running"]
+        now = f"running {running['job']} ({running['elapsed']:.0f}s)" if running else "idle"
+        return (f"{now}, {stats['depth']} queued, avg wait {stats['avg_wait']:.1f}s, "
+                f"avg run {stats['avg_run']:.1f}s, {stats['jobs_per_hour']:.1f} jobs/h")
@@ -0,0 +1,239 @@
+"""
+Farm registry: SQLite on disk, dicts and a spatial grid in memory.
+
+Every player can have several named farms. Reads (farm_command, "farms
+near me") never touch the disk: lookups are dict hits and spatial queries
+walk a coarse x/z grid. Writes are single-row SQLite transactions, so a crash
+mid-update leaves the previous state intact instead of a half-written file.
+An existing farms.txt is imported once on first start. Nothing is read
+from disk until the first lookup or update, so importing the bot stays cheap.
+"""
+
+import math
+import os
+import threading
+import time
+from typing import TYPE_CHECKING, Dict, Iterator, List, NamedTuple, Optional, Set, Tuple
+
+if TYPE_CHECKING:
+    import sqlite3
+
+DEFAULT_FARM = "main"
+# x/z cell size of the spatial index, in blocks
+CELL = 64
+# VACUUM after this many deletes to hand the space back
+COMPACT_AFTER = 100
+
+
+class Farm(NamedTuple):
+    player: str
+    name: str
+    x: float
+    y: float
+    z: float
+    updated: float
+
+    @property
+    def coords(self) -> Tuple[float, float, float]:
+        return self.x, self.y, self.z
+
+
+def _cell(x: float, z: float) -> Tuple[int, int]:
+    return math.floor(x) // CELL, math.floor(z) // CELL
+
+
+def _ring(cx: int, cz: int, k: int) -> Iterator[Tuple[int, int]]:
+    """Grid cells at Chebyshev distance exactly `k` from (cx, cz)."""
+    if k == 0:
+        yield cx, cz
+        return
+    for dx in range(-k, k + 1):
+        for dz in (range(-k, k + 1) if abs(dx) == k else (-k, k)):
+            yield cx + dx, cz + dz
+
+
+class FarmRegistry:
+    """Players' farms with O(1) lookups and nearest-farm queries."""
+
+    def __init__(self, path: str = "farms.db", legacy_path: Optional[str] = "farms.txt"):
+        self.path = path
+        self.legacy_path = legacy_path
+        self._lock = threading.RLock()
+        self._db = None  # sqlite3.Connection once loaded
+        self._farms: Dict[str, Dict[str, Farm]] = {}
+        self._grid: Dict[Tuple[int, int], Set[Tuple[str, str]]] = {}
+        self._deletes = 0
+
+    def _load(self) -> "sqlite3.Connection":
+        """Open the database and build the in-memory index on first use."""
+        db = self._db
+        if db is not None:
+            return db
+        import sqlite3
+        with self._lock:
+            if self._db is not None:
+                return self._db
+            db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS farms ("
+                " player TEXT NOT NULL, name TEXT NOT NULL,"
+                " x REAL NOT NULL, y REAL NOT NULL, z REAL NOT NULL, updated REAL NOT NULL,"
+                " PRIMARY KEY (player, name))"
+            )
+            for row in db.execute("SELECT player, name, x, y, z, updated FROM farms"):
+                self._index(Farm(*row))
+            self._db = db
+            if self.legacy_path and not self._farms and os.path.exists(self.legacy_path):
+                self.migrate(self.legacy_path)
+        return db
+
+    # --- In-memory index ---
+
+    def _index(self, farm: Farm):
+        self._farms.setdefault(farm.player, {})[farm.name] = farm
+        self._grid.setdefault(_cell(farm.x, farm.z), set()).add((farm.player, farm.name))
+
+    def _unindex(self, farm: Farm):
+        player_farms = self._farms.get(farm.player, {})
+        player_farms.pop(farm.name, None)
+        if not player_farms:
+            self._farms.pop(farm.player, None)
+        cell = _cell(farm.x, farm.z)
+        members = self._grid.get(cell)
+        if members is not None:
+            members.discard((farm.player, farm.name))
+            if not members:
+                del self._grid[cell]
+
+    # --- Lookups ---
+
+    def get(self, player: str, name: Optional[str] = None) -> Optional[Farm]:
+        """A player's farm by name; without a name, their main farm (or the
+        one they set most recently)."""
+        self._load()
+        player_farms = self._farms.get(player)
+        if not player_farms:
+            return None
+        if name is not None:
+            return player_farms.get(name.lower())
+        farm = player_farms.get(DEFAULT_FARM)
+        if farm is None:
+            farm = max(player_farms.values(), key=lambda f: f.updated)
+        return farm
+
+    def farms_for(self, player: str) -> List[Farm]:
+        self._load()
+        return sorted(self._farms.get(player, {}).values(), key=lambda f: f.name)
+
+    def __contains__(self, player: str) -> bool:
+        self._load()
+        return player in self._farms
+
+    def __len__(self) -> int:
+        self._load()
+        return sum(len(f) for f in self._farms.values())
+
+    def all(self) -> List[Farm]:
+        self._load()
+        return [farm for player_farms in self._farms.values() for farm in player_farms.values()]
+
+    def near(self, pos: Tuple[float, float, float], radius: Optional[float] = None,
+             limit: int = 5) -> List[Tuple[Farm, float]]:
+        """Up to `limit` farms nearest to `pos` (within `radius` if given),
+        nearest first, as [(farm, distance), ...]."""
+        self._load()
+        if not self._grid:
+            return []
+        cx, cz = _cell(pos[0], pos[2])
+        cells = list(self._grid)
+        last_ring = max(max(abs(x - cx), abs(z - cz)) for x, z in cells)
+        if radius is not None:
+            last_ring = min(last_ring, int(radius // CELL) + 1)
+        found: List[Tuple[float, Farm]] = []
+        for k in range(last_ring + 1):
+            # Farms in ring k are at least (k - 1) whole cells away
+            bound = max(k - 1, 0) * CELL
+            if len(found) >= limit and found[limit - 1][0] <= bound:
+                break
+            for cell in _ring(cx, cz, k):
+                for player, name in self._grid.get(cell, ()):
+                    farm = self._farms[player][name]
+                    dist = math.dist(pos, farm.coords)
+                    if radius is None or dist <= radius:
+                        found.append((dist, farm))
+            found.sort(key=lambda hit: hit[0])
+        return [(farm, dist) for dist, farm in found[:limit]]
+
+    # --- Updates ---
+
+    def set(self, player: str, coords: Tuple[float, float, float], name: str = DEFAULT_FARM) -> Farm:
+        """Add or move a farm; durable once this returns."""
+        farm = Farm(player, name.lower(), float(coords[0]), float(coords[1]), float(coords[2]), time.time())
+        db = self._load()
+        with self._lock:
+            db.execute("INSERT OR REPLACE INTO farms VALUES (?, ?, ?, ?, ?, ?)", farm)
+            old = self._farms.get(player, {}).get(farm.name)
+            if old is not None:
+                self._unindex(old)
+            self._index(farm)
+        return farm
+
+    def remove(self, player: str, name: str = DEFAULT_FARM) -> bool:
+        db = self._load()
+        with self._lock:
+            farm = self._farms.get(player, {}).get(name.lower())
+            if farm is None:
+                return False
+            db.execute("DELETE FROM farms WHERE player = ? AND name = ?", (player, farm.name))
+            self._unindex(farm)
+            self._deletes += 1
+            if self._deletes >= COMPACT_AFTER:
+                self.compact()
+        return True
+
+    def compact(self):
+        """Fold the WAL into the database and reclaim deleted rows."""
+        db = self._load()
+        with self._lock:
+            db.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            db.execute("VACUUM")
+            self._deletes = 0
+
+    def migrate(self, legacy_path: str) -> int:
+        """Import a farms.txt (player=[x, y, z] per line) in one transaction,
+        then move it aside. Returns the number of farms imported."""
+        import ast  # only needed for this one-off import
+
+        db = self._load()
+        farms = []
+        with open(legacy_path, 'r') as f:
+            for line in f:
+                if '=' in line:
+                    name, coords = line.strip().split('=', 1)
+                    try:
+                        x, y, z = ast.literal_eval(coords)
+                    except (ValueError, SyntaxError, TypeError):
+                        print(f"⚠️ Skipping bad farms.txt line: {line.strip()}")
+                        continue
+                    farms.append(Farm(name, DEFAULT_FARM, float(x), float(y), float(z), time.time()))
+        with self._lock:
+            db.execute("BEGIN")
+            try:
+                db.executemany("INSERT OR REPLACE INTO farms VALUES (?, ?, ?, ?, ?, ?)", farms)
+                db.execute("COMMIT")
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+            for farm in farms:
+                self._index(farm)
+        os.replace(legacy_path, legacy_path + ".migrated")
+        print(f"📦 Imported {len(farms)} farms from {legacy_path} into {self.path}")
+        return len(farms)
+
+    def close(self):
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
@@ -0,0 +1,172 @@
+"""
+Input control through the Cheat Utils HTTP API (localhost:5005).
+
+The old helpers posted the full `lock-inputs` payload over a fresh
+connection on every call. InputController keeps one keep-alive session,
+remembers what Cheat Utils last accepted, and skips posts that would not
+change anything. Timed inputs ("hold use for 0.5 s") are scheduled on a
+background timer instead of sleeping in the caller:
+
+    client.inputs.hold("holdUse", 0.5)          # returns immediately
+    client.inputs.hold("holdUse", 0.5).wait()   # or wait for the release
+
+AsyncInputController in async_bot.py is the asyncio twin.
+"""
+
+import heapq
+import itertools
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+CHEAT_UTILS_URL = "http://localhost:5005/api"
+INPUT_FIELDS = ("mouseInputDisabled", "holdForward", "holdAttack", "holdUse")
+# Timers wake this early and spin the rest, for ms-accurate releases
+SPIN_SECONDS = 0.002
+
+Step = Tuple[float, Dict[str, bool]]  # (seconds from start, input changes)
+
+
+def check_inputs(changes: Dict[str, bool]):
+    unknown = set(changes) - set(INPUT_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown input(s) {', '.join(sorted(unknown))}; expected {', '.join(INPUT_FIELDS)}")
+
+
+def _requests():
+    # Imported on first post: the bot may never touch Cheat Utils
+    import requests
+    return requests
+
+
+class InputController:
+    """Diff-based `lock-inputs` client with a timer for input sequences."""
+
+    def __init__(self, base_url: str = CHEAT_UTILS_URL, timeout: float = 2.0):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.session = None
+        # What we want held, and what Cheat Utils last accepted (None = unknown)
+        self.desired: Dict[str, bool] = dict.fromkeys(INPUT_FIELDS, False)
+        self.applied: Optional[Dict[str, bool]] = None
+        self.posts = 0
+        self.skipped = 0
+        self._lock = threading.Lock()
+        self._timers: List[Tuple[float, int, Dict[str, bool], Optional[threading.Event]]] = []
+        self._seq = itertools.count()
+        self._wake = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+
+    def post(self, endpoint: str, payload: Dict[str, Any]) -> bool:
+        """POST `payload` to /api/<endpoint> on the shared session."""
+        url = f"{self.base_url}/{endpoint}"
+        requests = _requests()
+        if self.session is None:
+            self.session = requests.Session()
+        try:
+            resp = self.session.post(url, json=payload, timeout=self.timeout)
+        except requests.RequestException as e:
+            print(f"Error posting {endpoint} with {payload}:", e)
+            return False
+        self.posts += 1
+        if resp.status_code != 200:
+            print(f"❌ {url} returned {resp.status_code}")
+        return resp.status_code == 200
+
+    def set(self, **changes: bool) -> bool:
+        """Change some inputs; posts only if the result differs from what is applied."""
+        check_inputs(changes)
+        with self._lock:
+            self.desired.update(changes)
+            if self.desired == self.applied:
+                self.skipped += 1
+                return True
+            # lock-inputs takes the whole state, so send every field
+            payload = dict(self.desired)
+            ok = self.post("lock-inputs", payload)
+            self.applied = payload if ok else None
+            return ok
+
+    def release_all(self) -> bool:
+        """Let go of every input and cancel pending timers."""
+        with self._wake:
+            for _, _, _, done in self._timers:
+                if done is not None:
+                    done.set()
+            self._timers.clear()
+        return self.set(**dict.fromkeys(INPUT_FIELDS, False))
+
+    # --- Timed inputs ---
+
+    def sequence(self, steps: Iterable[Step]) -> threading.Event:
+        """Apply each (offset, changes) step at start + offset seconds. Steps
+        due now are applied before returning; the event is set after the last."""
+        start = time.monotonic()
+        steps = sorted(steps, key=lambda step: step[0])
+        done = threading.Event()
+        if not steps:
+            done.set()
+            return done
+        for _, changes in steps:
+            check_inputs(changes)
+        with self._wake:
+            for i, (offset, changes) in enumerate(steps):
+                last = i == len(steps) - 1
+                heapq.heappush(self._timers, (start + offset, next(self._seq), changes, done if last else None))
+            self._wake.notify()
+        self._ensure_thread()
+        self._run_due()
+        return done
+
+    def hold(self, field: str, seconds: float) -> threading.Event:
+        """Hold one input for `seconds`, e.g. hold("holdUse", 0.5) for a right click."""
+        return self.sequence([(0.0, {field: True}), (seconds, {field: False})])
+
+    def _ensure_thread(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._timer_loop, name="input-timer", daemon=True)
+            self._thread.start()
+
+    def _pop_due(self, now: float):
+        with self._wake:
+            if self._timers and self._timers[0][0] <= now:
+                return heapq.heappop(self._timers)
+        return None
+
+    def _run_due(self):
+        while True:
+            due = self._pop_due(time.monotonic())
+            if due is None:
+                return
+            _, _, changes, done = due
+            self.set(**changes)
+            if done is not None:
+                done.set()
+
+    def _timer_loop(self):
+        while not self._closed:
+            with self._wake:
+                while not self._timers and not self._closed:
+                    self._wake.wait()
+                if self._closed:
+                    return
+                deadline = self._timers[0][0]
+                delay = deadline - time.monotonic()
+                if delay > SPIN_SECONDS:
+                    self._wake.wait(delay - SPIN_SECONDS)
+                    continue
+            # Within SPIN_SECONDS of the deadline: spin instead of oversleeping
+            while time.monotonic() < deadline:
+                pass
+            self._run_due()
+
+    def close(self):
+        self._closed = True
+        with self._wake:
+            self._wake.notify_all()
+        if self.session is not None:
+            self.session.close()
+
+    def stats(self) -> Dict[str, int]:
+        return {"posts": self.posts, "skipped": self.skipped, "pending": len(self._timers)}
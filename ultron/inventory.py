@@ -0,0 +1,273 @@
+"""
+Cached inventory snapshot and bulk drop operations.
+
+One `inventory` query fills a slot -> ItemStack snapshot, which is then kept
+up to date from the bot's own drops instead of being re-read after every
+action. Bulk operations ("drop all of these", "keep only tools and food")
+work out the fewest drop_item queries that do the job and send them as one
+pipelined batch over a single connection.
+
+GameQuery's drop_item with a `name` drops every stack whose item id contains
+that text, so a name drop is only used when every stack it can hit in a
+just-read snapshot is being dropped; otherwise stacks are dropped slot by
+slot. Without a snapshot nothing is dropped by name.
+
+Stock GameQuery builds don't answer `inventory`, so probe() asks once at
+startup; until it succeeds, no `inventory` queries are sent and the bulk
+operations report that they can't run.
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+# Snapshots older than this are re-read before a bulk operation
+MAX_AGE = 2.0
+
+TOOL_SUFFIXES = ("_pickaxe", "_axe", "_shovel", "_hoe", "_sword")
+TOOLS = {"shears", "fishing_rod", "bow", "crossbow", "trident", "shield", "flint_and_steel", "carrot_on_a_stick"}
+ARMOR_SUFFIXES = ("_helmet", "_chestplate", "_leggings", "_boots")
+FOOD = {
+    "apple", "golden_apple", "enchanted_golden_apple", "bread", "cookie", "cake", "pumpkin_pie",
+    "carrot", "golden_carrot", "potato", "baked_potato", "beetroot", "beetroot_soup", "melon_slice",
+    "sweet_berries", "glow_berries", "mushroom_stew", "rabbit_stew", "suspicious_stew", "honey_bottle",
+    "dried_kelp", "cooked_beef", "cooked_porkchop", "cooked_chicken", "cooked_mutton", "cooked_rabbit",
+    "cooked_cod", "cooked_salmon",
+}
+CATEGORIES: Dict[str, Callable[[str], bool]] = {
+    "tools": lambda name: name.endswith(TOOL_SUFFIXES) or name in TOOLS,
+    "armor": lambda name: name.endswith(ARMOR_SUFFIXES) or name == "elytra",
+    "food": lambda name: name in FOOD,
+}
+
+
+class ItemStack(NamedTuple):
+    slot: int
+    item: str
+    count: int
+
+
+def item_id(raw: str) -> str:
+    """'minecraft:wheat_seeds' / 'Item{minecraft:wheat_seeds}' -> 'wheat_seeds'."""
+    name = raw.strip().lower()
+    if name.endswith("}") and "{" in name:
+        name = name[name.index("{") + 1:-1]
+    return name.split(":", 1)[-1]
+
+
+def parse_inventory(response: Optional[Dict[str, Any]]) -> Optional[Dict[int, ItemStack]]:
+    """Slot -> ItemStack from an `inventory` reply; None if there isn't one."""
+    if not response or "error" in response:
+        return None
+    items = response.get("inventory", response)
+    if isinstance(items, dict):
+        items = items.get("items", items.get("slots"))
+    if not isinstance(items, list):
+        return None
+    slots = {}
+    for entry in items:
+        name = entry.get("item") or entry.get("name") or entry.get("id") or entry.get("type") or ""
+        count = int(entry.get("count", 1))
+        if name and item_id(name) != "air" and count > 0:
+            slot = int(entry["slot"])
+            slots[slot] = ItemStack(slot, item_id(name), count)
+    return slots
+
+
+def matches_category(item: str, categories: Iterable[str]) -> bool:
+    return any(CATEGORIES[c](item) for c in categories)
+
+
+class Inventory:
+    """The bot's inventory, read once and then updated from its own drops."""
+
+    def __init__(self, client, max_age: float = MAX_AGE):
+        self.client = client
+        self.max_age = max_age
+        self.supported: Optional[bool] = None  # set by probe()
+        self._slots: Dict[int, ItemStack] = {}
+        self._fetched: Optional[float] = None
+        self._lock = threading.Lock()
+        self.refreshes = 0
+        self.queries_saved = 0
+
+    # --- Snapshot ---
+
+    def probe(self) -> Optional[bool]:
+        """Check once whether the mod answers `inventory`. Returns None if
+        GameQuery couldn't be reached, so the check can be repeated."""
+        response = self.client.send_query({"type": "inventory"})
+        if not response:
+            return None
+        slots = parse_inventory(response)
+        self.supported = slots is not None
+        if self.supported:
+            self._store(slots)
+            print(f"📦 Inventory query available ({len(slots)} stacks)")
+        else:
+            print(f"⚠️ Inventory query not supported by this mod build "
+                  f"({response.get('error', 'unexpected reply')}); drop and keep only are disabled")
+        return self.supported
+
+    def refresh(self) -> bool:
+        """Re-read the whole inventory. Returns False if it couldn't."""
+        if not self.supported:
+            return False
+        slots = parse_inventory(self.client.send_query({"type": "inventory"}))
+        if slots is None:
+            return False
+        self._store(slots)
+        return True
+
+    def _store(self, slots: Dict[int, ItemStack]):
+        with self._lock:
+            self._slots = slots
+            self._fetched = time.monotonic()
+        self.refreshes += 1
+
+    def invalidate(self):
+        """Forget the snapshot (the inventory changed in ways we didn't see)."""
+        with self._lock:
+            self._fetched = None
+
+    def snapshot(self, max_age: Optional[float] = None) -> Optional[Dict[int, ItemStack]]:
+        """Slot -> ItemStack, re-read if older than `max_age` seconds. None if unavailable."""
+        max_age = self.max_age if max_age is None else max_age
+        with self._lock:
+            fresh = self._fetched is not None and time.monotonic() - self._fetched <= max_age
+        if not fresh and not self.refresh():
+            return None
+        with self._lock:
+            return dict(self._slots)
+
+    def counts(self, max_age: Optional[float] = None) -> Dict[str, int]:
+        """Item -> total count across stacks."""
+        totals: Dict[str, int] = {}
+        for stack in (self.snapshot(max_age) or {}).values():
+            totals[stack.item] = totals.get(stack.item, 0) + stack.count
+        return totals
+
+    # --- Incremental updates ---
+
+    def note_dropped_slot(self, slot: int):
+        with self._lock:
+            self._slots.pop(slot, None)
+
+    def note_dropped_name(self, name: str):
+        name = item_id(name)
+        with self._lock:
+            for slot in [s for s, stack in self._slots.items() if name in stack.item]:
+                del self._slots[slot]
+
+    # --- Bulk operations ---
+
+    @staticmethod
+    def plan_drops(slots: Dict[int, ItemStack], drop: Set[int]) -> List[Dict[str, Any]]:
+        """Fewest drop_item queries that empty exactly the `drop` slots.
+
+        A name drop covers every stack whose id contains the name, so one is
+        only used where all of those stacks are being dropped anyway; it's
+        worth it when it replaces two or more slot drops.
+        """
+        queries: List[Dict[str, Any]] = []
+        remaining = set(drop)
+        # Candidate names: the ids of the stacks to drop, widest cover first
+        covers: List[Tuple[str, Set[int]]] = []
+        for item in {slots[s].item for s in drop}:
+            hit = {s for s, stack in slots.items() if item in stack.item}
+            if hit <= drop:
+                covers.append((item, hit))
+        covers.sort(key=lambda c: (-len(c[1]), c[0]))
+        for item, hit in covers:
+            if len(hit & remaining) >= 2:
+                queries.append({"type": "drop_item", "name": item})
+                remaining -= hit
+        queries.extend({"type": "drop_item", "slot": s} for s in sorted(remaining))
+        return queries
+
+    def _execute(self, queries: List[Dict[str, Any]]) -> int:
+        """Send drop queries in one batch and apply them to the snapshot.
+        Returns how many succeeded."""
+        if not queries:
+            return 0
+        ok = 0
+        for query, reply in zip(queries, self.client.batch(queries)):
+            result = (reply or {}).get("result", {})
+            if result.get("success"):
+                ok += 1
+                if "slot" in query:
+                    self.note_dropped_slot(query["slot"])
+                else:
+                    self.note_dropped_name(query["name"])
+            else:
+                # Not sure what's left there now
+                self.invalidate()
+                print(f"❌ {query}: {result.get('error') or (reply or {}).get('error', 'no reply')}")
+        return ok
+
+    def _plan(self, select: Callable[[Dict[int, ItemStack]], Set[int]]) -> Optional[Tuple[Set[int], List[Dict[str, Any]]]]:
+        """Slots `select` picks from the snapshot and the queries that drop
+        them. A plan with name drops is re-made from a freshly read snapshot,
+        so a name can't hit stacks picked up since the last read."""
+        snapshot = self.snapshot()
+        if snapshot is None:
+            return None
+        drop = select(snapshot)
+        queries = self.plan_drops(snapshot, drop)
+        if any("name" in q for q in queries):
+            snapshot = self.snapshot(max_age=0)
+            if snapshot is None:
+                return None
+            drop = select(snapshot)
+            queries = self.plan_drops(snapshot, drop)
+        self.queries_saved += len(drop) - len(queries)
+        return drop, queries
+
+    def drop_slots(self, slots: Iterable[int]) -> int:
+        slots = set(slots)
+        planned = self._plan(lambda snapshot: {s for s in slots if s in snapshot})
+        if planned is None:
+            return self._execute([{"type": "drop_item", "slot": s} for s in sorted(slots)])
+        return self._execute(planned[1])
+
+    def drop_all(self, names: Iterable[str]) -> int:
+        """Drop every stack of the given items. Returns the queries that succeeded."""
+        names = {item_id(n) for n in names}
+        planned = self._plan(lambda snapshot: {s for s, stack in snapshot.items() if stack.item in names})
+        if planned is None:
+            # A blind name drop would also hit every item whose id contains the name
+            print("❌ drop needs the inventory query, which this mod build doesn't answer")
+            return 0
+        drop, queries = planned
+        if not drop:
+            print(f"📦 Nothing to drop: no {', '.join(sorted(names))} in inventory")
+            return 0
+        print(f"🗑️ Dropping {len(drop)} stacks with {len(queries)} queries")
+        return self._execute(queries)
+
+    def keep_only(self, categories: Iterable[str] = ("tools", "food"), keep: Iterable[str] = ()) -> int:
+        """Drop everything that isn't in `categories` or named in `keep`."""
+        categories = list(categories)
+        unknown = [c for c in categories if c not in CATEGORIES]
+        if unknown:
+            print(f"❌ Unknown item categories {unknown}; known: {', '.join(CATEGORIES)}")
+            return 0
+        keep = {item_id(n) for n in keep}
+        planned = self._plan(lambda snapshot: {s for s, stack in snapshot.items()
+                                                if stack.item not in keep and not matches_category(stack.item, categories)})
+        if planned is None:
+            print("❌ keep_only needs the inventory query, which this mod build doesn't answer")
+            return 0
+        drop, queries = planned
+        if not drop:
+            print("📦 Nothing to drop")
+            return 0
+        print(f"🗑️ Keeping {', '.join(categories + sorted(keep))}: dropping {len(drop)} stacks with {len(queries)} queries")
+        return self._execute(queries)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            age = None if self._fetched is None else time.monotonic() - self._fetched
+            stacks = len(self._slots)
+        return {"stacks": stacks, "age": age, "refreshes": self.refreshes, "queries_saved": self.queries_saved,
+                "supported": self.supported}
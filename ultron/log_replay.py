@@ -0,0 +1,469 @@
+"""
+Replay archived Minecraft logs: backfill, farm registry rebuild and stats.
+
+The live listener only follows latest.log from its end, so commands typed
+while the bot was down were lost. This module streams whole log histories
+(the `YYYY-MM-DD-N.log.gz` archives Minecraft rotates into logs/, then
+latest.log) through the same chat parser in bounded memory: plain files
+are mmapped and cut into blocks of whole lines, gz files are inflated a
+block at a time.
+
+  * backfill: a Checkpoint remembers how far the listener got in
+    latest.log (and which file that was, by fingerprint, so a rotation into
+    a .gz is followed). Startup replays the missed commands from there.
+  * rebuild_farms: re-run every "my farm ... is at x y z" into a registry.
+  * stats: farm runs, success/failure and durations across every log.
+
+    ultron-replay ~/.minecraft/logs --stats --rebuild-farms farms.db
+"""
+
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import re
+import time
+import zlib
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from .farm_registry import DEFAULT_FARM, FarmRegistry
+from .metrics import Histogram
+
+BLOCK_SIZE = 1 << 20
+# Compressed bytes read per step from a .log.gz
+GZ_READ = 1 << 18
+# Bytes of (decompressed) content that identify a log file across renames
+FINGERPRINT_BYTES = 4096
+# Minecraft names rotated logs 2024-05-01-1.log.gz, 2024-05-01-2.log.gz, ...
+ARCHIVE_NAME = re.compile(r"^(\d{4}-\d{2}-\d{2})-(\d+)\.log(\.gz)?$")
+
+# chat_parser.CHAT_PATTERN plus Baritone's own [CHAT] messages. Anchored on the
+# [CHAT] literal so the regex engine skips non-chat lines in C
+EVENT_PATTERN = re.compile(
+    rb"\[CHAT\] ?(?:<([^>\n]*)>([^\n]*)|\[Baritone\] ([^\n]*)|([^\n]*?)whispers to you:([^\n]*))"
+)
+# Log evidence of a farm run: a player asking for it, Baritone's verdict
+FARM_REQUESTS = ("farm", "farm home")
+FARM_SUCCESS = ("farm goal reached",)
+FARM_FAILURE = ("farm failed",)
+FARM_DURATION_BUCKETS = (10, 30, 60, 120, 180, 300, 600, 900, 1800, 3600)
+
+
+class ReplayEvent(NamedTuple):
+    file: str
+    offset: int            # byte offset just past this event's block
+    time: Optional[int]    # seconds since midnight, if the line had a stamp
+    kind: str              # "chat", "whisper" or "baritone"
+    user: str              # empty for Baritone messages
+    msg: str
+
+
+# --- Files and blocks ---
+
+def log_files(directory: str) -> List[str]:
+    """Archived logs oldest first, then latest.log."""
+    archives = []
+    for name in os.listdir(directory):
+        m = ARCHIVE_NAME.match(name)
+        if m:
+            archives.append(((m.group(1), int(m.group(2))), os.path.join(directory, name)))
+    files = [path for _, path in sorted(archives)]
+    latest = os.path.join(directory, "latest.log")
+    if os.path.exists(latest):
+        files.append(latest)
+    return files
+
+
+def _plain_blocks(path: str, start: int, end: Optional[int], block_size: int) -> Iterator[Tuple[int, bytes]]:
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size if end is None else end
+        if size <= start:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            size = min(size, len(mm))
+            pos = start
+            while pos < size:
+                stop = min(pos + block_size, size)
+                cut = mm.rfind(b"\n", pos, stop) + 1
+                if cut <= pos:
+                    # One line longer than a block: take it whole
+                    cut = mm.find(b"\n", stop, size) + 1
+                    if cut <= 0:
+                        return  # unfinished last line; picked up next time
+                yield cut, mm[pos:cut]
+                pos = cut
+
+
+def _gz_blocks(path: str, start: int, block_size: int) -> Iterator[Tuple[int, bytes]]:
+    inflater = zlib.decompressobj(wbits=31)
+    pos = 0          # uncompressed offset of the start of `pending`
+    pending = b""
+    with open(path, 'rb') as f:
+        while True:
+            data = inflater.unconsumed_tail or f.read(GZ_READ)
+            if not data:
+                break
+            out = inflater.decompress(data, block_size)
+            while inflater.eof and inflater.unused_data:
+                # Concatenated gzip members (several may sit in one read):
+                # carry on with a fresh inflater
+                rest = inflater.unused_data
+                inflater = zlib.decompressobj(wbits=31)
+                out += inflater.decompress(rest, block_size)
+            if pos + len(pending) + len(out) <= start:
+                pos += len(pending) + len(out)
+                pending = b""
+                continue
+            buf = pending + out
+            if pos < start:
+                buf = buf[start - pos:]
+                pos = start
+            cut = buf.rfind(b"\n") + 1
+            if cut and (len(buf) >= block_size or not out):
+                yield pos + cut, buf[:cut]
+                pos += cut
+                buf = buf[cut:]
+            pending = buf
+    if pending:
+        yield pos + len(pending), pending
+
+
+def read_blocks(path: str, start: int = 0, end: Optional[int] = None,
+                block_size: int = BLOCK_SIZE) -> Iterator[Tuple[int, bytes]]:
+    """Yield (offset after block, block of whole lines) from `start`.
+    Offsets of .gz files count decompressed bytes."""
+    if path.endswith(".gz"):
+        for offset, block in _gz_blocks(path, start, block_size):
+            if end is not None and offset > end:
+                return
+            yield offset, block
+    else:
+        yield from _plain_blocks(path, start, end, block_size)
+
+
+def fingerprint(path: str, length: int = FINGERPRINT_BYTES) -> str:
+    """Hash of the first `length` bytes of content, stable across gzip."""
+    try:
+        if path.endswith(".gz"):
+            head = b""
+            for _, block in _gz_blocks(path, 0, length):
+                head += block
+                if len(head) >= length:
+                    break
+            head = head[:length]
+        else:
+            with open(path, 'rb') as f:
+                head = f.read(length)
+    except (OSError, zlib.error):
+        return ""
+    if len(head) < length:
+        return ""  # too short to be the file we fingerprinted
+    return hashlib.sha1(head).hexdigest()
+
+
+def _text(raw: bytes) -> str:
+    return raw.strip().decode('utf-8', 'replace')
+
+
+def _stamp(block: bytes, start: int) -> Optional[int]:
+    """Seconds since midnight from a line's leading [HH:MM:SS], if it has one."""
+    if block[start:start + 1] != b"[" or block[start + 9:start + 10] != b"]":
+        return None
+    try:
+        return int(block[start + 1:start + 3]) * 3600 + int(block[start + 4:start + 6]) * 60 + int(block[start + 7:start + 9])
+    except ValueError:
+        return None
+
+
+def scan_events(file: str, offset: int, block: bytes) -> Iterator[ReplayEvent]:
+    """Chat, whisper and Baritone events in one block, in order."""
+    name = os.path.basename(file)
+    for m in EVENT_PATTERN.finditer(block):
+        seconds = _stamp(block, block.rfind(b"\n", 0, m.start()) + 1)
+        user, msg, baritone, wuser, wmsg = m.groups()
+        if baritone is not None:
+            yield ReplayEvent(name, offset, seconds, "baritone", "", _text(baritone))
+        elif user is not None:
+            yield ReplayEvent(name, offset, seconds, "chat", _text(user), _text(msg))
+        else:
+            yield ReplayEvent(name, offset, seconds, "whisper", _text(wuser), _text(wmsg))
+
+
+# --- Checkpoint ---
+
+class Checkpoint:
+    """How far the live listener got: file fingerprint + byte offset.
+
+    The fingerprint covers the first `head` bytes (up to FINGERPRINT_BYTES,
+    never past the offset), so it still matches once the file has grown or
+    been gzipped into an archive."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.fingerprint = ""
+        self.head = 0
+        self.offset = 0
+        self.exists = False
+        self._saved_at = 0.0
+        if os.path.exists(path):
+            try:
+                with open(path, 'r') as f:
+                    saved = json.load(f)
+                self.fingerprint = saved.get("fingerprint", "")
+                self.head = int(saved.get("head", FINGERPRINT_BYTES))
+                self.offset = int(saved.get("offset", 0))
+                self.exists = True
+            except (OSError, ValueError) as e:
+                print(f"⚠️ Ignoring unreadable log checkpoint {path}: {e}")
+
+    def matches(self, path: str) -> bool:
+        if not self.head:
+            return True  # checkpointed while the file was still empty
+        return fingerprint(path, self.head) == self.fingerprint
+
+    def update(self, log_path: str, offset: int, rotated: bool = False, every: float = 5.0):
+        """Record progress; written to disk at most every `every` seconds."""
+        if rotated or offset < self.offset or self.head < min(offset, FINGERPRINT_BYTES):
+            # New, truncated or still-short file
+            self.head = min(offset, FINGERPRINT_BYTES)
+            self.fingerprint = fingerprint(log_path, self.head) if self.head else ""
+        self.offset = offset
+        self.exists = True
+        if time.monotonic() - self._saved_at >= every:
+            self.save()
+
+    def save(self):
+        tmp = self.path + ".tmp"
+        try:
+            with open(tmp, 'w') as f:
+                json.dump({"fingerprint": self.fingerprint, "head": self.head, "offset": self.offset,
+                           "saved": time.time()}, f)
+            os.replace(tmp, self.path)
+            self._saved_at = time.monotonic()
+        except OSError as e:
+            print(f"⚠️ Could not save log checkpoint: {e}")
+
+
+# --- Stats ---
+
+class ReplayStats:
+    """Farm outcomes and durations, plus command counts, over replayed logs."""
+
+    def __init__(self):
+        self.files = 0
+        self.bytes = 0
+        self.events = 0
+        self.farm_success = 0
+        self.farm_failure = 0
+        self.farm_durations = Histogram(FARM_DURATION_BUCKETS)
+        self.farm_longest = 0.0
+        self.commands: Dict[str, int] = {}
+        self.players: Dict[str, int] = {}
+        self.elapsed = 0.0
+        self._farm_started: Optional[int] = None
+
+    def add(self, event: ReplayEvent, command_words: int = 2):
+        self.events += 1
+        if event.kind == "baritone":
+            text = event.msg.lower()
+            if text == "farm":
+                self._start(event.time)
+            elif text.startswith(FARM_SUCCESS) or text.startswith(FARM_FAILURE):
+                self._finish(event.time, text.startswith(FARM_SUCCESS))
+            return
+        self.players[event.user] = self.players.get(event.user, 0) + 1
+        command = " ".join(event.msg.lower().split()[:command_words])
+        if command:
+            self.commands[command] = self.commands.get(command, 0) + 1
+        if event.msg.lower().strip() in FARM_REQUESTS or event.msg.lower().startswith("farm home "):
+            self._start(event.time)
+
+    def _start(self, stamp: Optional[int]):
+        # A tour asked for by several players is one run, from the first request
+        if self._farm_started is None:
+            self._farm_started = stamp
+
+    def _finish(self, stamp: Optional[int], success: bool):
+        if success:
+            self.farm_success += 1
+        else:
+            self.farm_failure += 1
+        started, self._farm_started = self._farm_started, None
+        if started is None or stamp is None:
+            return
+        duration = (stamp - started) % 86400  # runs past midnight
+        self.farm_durations.observe(duration)
+        self.farm_longest = max(self.farm_longest, duration)
+
+    def end_file(self):
+        # Stamps are time-of-day only, so don't pair a start with an end in another file
+        self._farm_started = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        runs = self.farm_success + self.farm_failure
+        h = self.farm_durations
+        return {
+            "files": self.files,
+            "bytes": self.bytes,
+            "events": self.events,
+            "seconds": self.elapsed,
+            "farm_runs": runs,
+            "farm_success": self.farm_success,
+            "farm_failure": self.farm_failure,
+            "farm_success_rate": self.farm_success / runs if runs else 0.0,
+            "farm_duration_mean": h.sum / h.count if h.count else 0.0,
+            "farm_duration_p50": h.quantile(0.5),
+            "farm_duration_p90": h.quantile(0.9),
+            "farm_duration_max": self.farm_longest,
+            "top_commands": sorted(self.commands.items(), key=lambda kv: -kv[1])[:10],
+            "players": len(self.players),
+        }
+
+    def summary(self) -> str:
+        d = self.to_dict()
+        rate = d["bytes"] / d["seconds"] / 1e6 if d["seconds"] else 0.0
+        lines = [
+            f"📚 {d['files']} file(s), {d['bytes'] / 1e6:.1f} MB, {d['events']} chat events "
+            f"in {d['seconds']:.1f}s ({rate:.0f} MB/s)",
+            f"🌾 {d['farm_runs']} farm runs: {d['farm_success']} ok, {d['farm_failure']} failed "
+            f"({d['farm_success_rate']:.0%} success)",
+        ]
+        if self.farm_durations.count:
+            lines.append(f"⏱️ duration mean {d['farm_duration_mean']:.0f}s, p50 ≤{d['farm_duration_p50']:.0f}s, "
+                         f"p90 ≤{d['farm_duration_p90']:.0f}s, max {d['farm_duration_max']:.0f}s")
+        if d["top_commands"]:
+            lines.append("💬 " + ", ".join(f"{c} ×{n}" for c, n in d["top_commands"]))
+        return "\n".join(lines)
+
+
+# --- Replay ---
+
+def parse_farm_message(msg: str) -> Optional[Tuple[str, Tuple[float, float, float]]]:
+    """(name, coords) for "my farm is at x y z" / "my farm <name> is at x y z"."""
+    words = msg.lower().split()
+    if words[:2] != ["my", "farm"]:
+        return None
+    if words[2:4] == ["is", "at"] and len(words) == 7:
+        name, coords = DEFAULT_FARM, words[4:]
+    elif words[3:5] == ["is", "at"] and len(words) == 8:
+        name, coords = words[2], words[5:]
+    else:
+        return None
+    try:
+        x, y, z = map(float, coords)
+    except ValueError:
+        return None
+    return name, (x, y, z)
+
+
+class LogReplayer:
+    """Streams events out of a log directory (or an explicit list of files)."""
+
+    def __init__(self, directory: Optional[str] = None, files: Optional[Iterable[str]] = None,
+                 block_size: int = BLOCK_SIZE):
+        self.directory = directory
+        self.files = list(files) if files is not None else log_files(directory)
+        self.block_size = block_size
+        self.stats = ReplayStats()
+
+    def events(self, files: Optional[Iterable[str]] = None, start: int = 0,
+               end: Optional[int] = None) -> Iterator[ReplayEvent]:
+        """Every event in `files` (default: all), `start`/`end` applying to the first/last file."""
+        files = self.files if files is None else list(files)
+        began = time.perf_counter()
+        for i, path in enumerate(files):
+            first, last = i == 0, i == len(files) - 1
+            offset = start if first else 0
+            self.stats.files += 1
+            for offset_after, block in read_blocks(path, offset, end if last else None, self.block_size):
+                self.stats.bytes += len(block)
+                for event in scan_events(path, offset_after, block):
+                    self.stats.add(event)
+                    yield event
+            self.stats.end_file()
+        self.stats.elapsed += time.perf_counter() - began
+
+    def run_stats(self) -> ReplayStats:
+        for _ in self.events():
+            pass
+        return self.stats
+
+    def rebuild_farms(self, registry: FarmRegistry) -> int:
+        """Apply every farm registration in the logs, oldest first. Returns how many."""
+        count = 0
+        for event in self.events():
+            if event.kind == "baritone":
+                continue
+            parsed = parse_farm_message(event.msg)
+            if parsed is not None:
+                name, coords = parsed
+                registry.set(event.user, coords, name)
+                count += 1
+        return count
+
+    def missed(self, checkpoint: Checkpoint, latest: str, end: Optional[int] = None) -> Iterator[ReplayEvent]:
+        """Events written after the checkpoint, up to `end` of latest.log."""
+        if not checkpoint.exists:
+            return
+        if checkpoint.matches(latest):
+            yield from self.events([latest], start=checkpoint.offset, end=end)
+            return
+        # latest.log was rotated since: find the archive it became
+        archives = [path for path in self.files if os.path.realpath(path) != os.path.realpath(latest)]
+        for i in range(len(archives) - 1, -1, -1):
+            if checkpoint.matches(archives[i]):
+                yield from self.events(archives[i:] + [latest], start=checkpoint.offset, end=end)
+                return
+        print("⚠️ Checkpointed log not found (rotated out?); backfilling latest.log from the start")
+        yield from self.events([latest], end=end)
+
+    def backfill(self, checkpoint: Checkpoint, latest: str, dispatch: Callable[[str, str], Any],
+                 allow: Optional[Iterable[str]] = None, end: Optional[int] = None,
+                 ignore_user: Optional[str] = None) -> int:
+        """Send missed chat commands to `dispatch(user, msg)`. Only messages
+        whose first words are one of `allow` are replayed (None = everything)."""
+        allow = None if allow is None else [prefix.lower().split() for prefix in allow]
+        count = 0
+        for event in self.missed(checkpoint, latest, end):
+            if event.kind == "baritone" or event.user == ignore_user:
+                continue
+            words = event.msg.lower().split()
+            if allow is not None and not any(words[:len(prefix)] == prefix for prefix in allow):
+                continue
+            print(f"⏪ Backfilling {event.kind} from {event.user}: {event.msg}")
+            dispatch(event.user, event.msg)
+            count += 1
+        return count
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Replay Minecraft logs: stats and farm registry rebuild")
+    parser.add_argument("logs", nargs="+", help="a logs/ directory, or individual .log/.log.gz files")
+    parser.add_argument("--stats", action="store_true", help="print farm and command statistics")
+    parser.add_argument("--json", action="store_true", help="print statistics as JSON")
+    parser.add_argument("--rebuild-farms", metavar="DB", help="replay farm registrations into this farms.db")
+    args = parser.parse_args(argv)
+
+    if len(args.logs) == 1 and os.path.isdir(args.logs[0]):
+        replayer = LogReplayer(args.logs[0])
+    else:
+        replayer = LogReplayer(files=args.logs)
+    if not replayer.files:
+        print("❌ No log files found")
+        return
+    if args.rebuild_farms:
+        registry = FarmRegistry(args.rebuild_farms, legacy_path=None)
+        count = replayer.rebuild_farms(registry)
+        registry.close()
+        print(f"📦 Replayed {count} farm registrations into {args.rebuild_farms}")
+    else:
+        replayer.run_stats()
+    if args.json:
+        print(json.dumps(replayer.stats.to_dict(), indent=2))
+    elif args.stats or not args.rebuild_farms:
+        print(replayer.stats.summary())
+
+
+if __name__ == "__main__":
+    main()
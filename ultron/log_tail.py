@@ -0,0 +1,447 @@
+"""
+Persistent, rotation-aware tailer for Minecraft's latest.log.
+
+One LogTailer keeps a single open handle per log file and fans new lines out
+to any number of LogCursor subscribers (the chat listener, log waiters, ...),
+so nobody reopens the file or re-reads bytes another consumer already read.
+Changes are picked up through inotify on Linux, with a cheap stat() polling
+fallback everywhere else. Rotation (latest.log renamed and recreated) and
+truncation are detected on every pump; a file truncated and rewritten past
+our offset is caught by its first bytes changing.
+"""
+
+import os
+import select
+import sys
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+READ_CHUNK = 1 << 16
+# Leading bytes remembered to spot a log that was truncated and rewritten
+# past our offset between two pumps (Minecraft starts it with a timestamp)
+HEAD_BYTES = 64
+# Bound per-cursor backlog so a consumer that stops reading can't eat memory
+MAX_BACKLOG = 10000
+
+
+class _PollNotifier:
+    """Fallback change notification: watch size/mtime/inode with os.stat."""
+
+    def __init__(self, path: str, interval: float = 0.1):
+        self.path = path
+        self.interval = interval
+        self._last = self._signature()
+
+    def _signature(self):
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return st.st_ino, st.st_size, st.st_mtime_ns
+
+    def wait(self, timeout: float) -> bool:
+        deadline = time.monotonic() + timeout
+        while True:
+            sig = self._signature()
+            if sig != self._last:
+                self._last = sig
+                return True
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            time.sleep(min(self.interval, remaining))
+
+    def close(self):
+        pass
+
+
+class _InotifyNotifier:
+    """Linux change notification on the log's directory (catches rotation too)."""
+
+    IN_MODIFY = 0x002
+    IN_CLOSE_WRITE = 0x008
+    IN_MOVED_FROM = 0x040
+    IN_MOVED_TO = 0x080
+    IN_CREATE = 0x100
+    IN_DELETE = 0x200
+    IN_NONBLOCK = 0o4000
+    IN_CLOEXEC = 0o2000000
+
+    def __init__(self, path: str):
+        import ctypes  # Linux only, so loaded when a notifier is actually made
+        # The process's own symbols include libc; find_library would spawn ldconfig
+        libc = ctypes.CDLL(None, use_errno=True)
+        self.fd = libc.inotify_init1(self.IN_NONBLOCK | self.IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        mask = (self.IN_MODIFY | self.IN_CLOSE_WRITE | self.IN_MOVED_FROM | self.IN_MOVED_TO
+                | self.IN_CREATE | self.IN_DELETE)
+        directory = os.path.dirname(os.path.abspath(path)).encode()
+        if libc.inotify_add_watch(self.fd, directory, mask) < 0:
+            err = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(err, "inotify_add_watch failed")
+
+    def wait(self, timeout: float) -> bool:
+        ready, _, _ = select.select([self.fd], [], [], max(timeout, 0))
+        if not ready:
+            return False
+        self.drain()
+        return True
+
+    def drain(self):
+        try:
+            while os.read(self.fd, 4096):
+                pass
+        except BlockingIOError:
+            pass
+
+    def close(self):
+        os.close(self.fd)
+
+
+def _make_notifier(path: str):
+    if sys.platform.startswith("linux"):
+        try:
+            return _InotifyNotifier(path)
+        except (OSError, AttributeError):
+            pass
+    return _PollNotifier(path)
+
+
+class LogCursor:
+    """One consumer's view of a LogTailer: its own queue of unread lines."""
+
+    def __init__(self, tailer: "LogTailer", chunks: bool = False):
+        self.tailer = tailer
+        self.chunks = chunks
+        self.pending = deque(maxlen=MAX_BACKLOG)
+
+    def read_chunks(self) -> List[bytes]:
+        """Chunk cursors only: return new data as blocks of whole lines, so
+        callers can scan for what they need without splitting every line."""
+        if not self.chunks:
+            raise ValueError("read_chunks() needs a cursor from subscribe(chunks=True)")
+        self.tailer.pump()
+        with self.tailer.lock:
+            blocks = list(self.pending)
+            self.pending.clear()
+        return blocks
+
+    def read_raw(self) -> List[bytes]:
+        """Return new lines as bytes (without the trailing newline)."""
+        if self.chunks:
+            raise ValueError("read_raw() needs a line cursor; use read_chunks()")
+        self.tailer.pump()
+        with self.tailer.lock:
+            lines = list(self.pending)
+            self.pending.clear()
+        return lines
+
+    def read_lines(self) -> List[str]:
+        """Return new lines decoded as UTF-8."""
+        return [line.decode('utf-8', errors='replace') for line in self.read_raw()]
+
+    def wait(self, timeout: float) -> bool:
+        """Block until this cursor has unread lines or `timeout` elapses."""
+        deadline = time.monotonic() + timeout
+        while True:
+            self.tailer.pump()
+            with self.tailer.lock:
+                if self.pending:
+                    return True
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            self.tailer.wait_for_change(remaining)
+
+    async def wait_async(self, timeout: float, interval: float = 0.05) -> bool:
+        """asyncio counterpart of wait(). Polls on the event loop instead of
+        blocking it; each check is a stat() unless the file actually grew."""
+        import asyncio  # only the asyncio listener pays for this import
+        deadline = time.monotonic() + timeout
+        while True:
+            self.tailer.pump()
+            with self.tailer.lock:
+                if self.pending:
+                    return True
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            await asyncio.sleep(min(interval, remaining))
+
+    def follow_raw(self, timeout: Optional[float] = None) -> Iterator[bytes]:
+        """Yield new lines as bytes as they're written, until `timeout` (None = forever)."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            for line in self.read_raw():
+                yield line
+            if deadline is None:
+                self.wait(3600)
+                continue
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not self.wait(remaining):
+                return
+
+    def follow_chunks(self, timeout: Optional[float] = None) -> Iterator[bytes]:
+        """Chunk-cursor counterpart of follow_raw()."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            for block in self.read_chunks():
+                yield block
+            if deadline is None:
+                self.wait(3600)
+                continue
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not self.wait(remaining):
+                return
+
+    def follow(self, timeout: Optional[float] = None) -> Iterator[str]:
+        """Yield new lines decoded as UTF-8, until `timeout` (None = forever)."""
+        for line in self.follow_raw(timeout):
+            yield line.decode('utf-8', errors='replace')
+
+    def close(self):
+        self.tailer.unsubscribe(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+class LogTailer:
+    """Follow a single log file with one open handle, shared by many cursors."""
+
+    def __init__(self, path: str, from_end: bool = True):
+        self.path = path
+        self.lock = threading.Lock()
+        self._cond = threading.Condition(self.lock)
+        self._watching = False
+        self._cursors: List[LogCursor] = []
+        self._fh = None
+        self._ino = None
+        self._pos = 0
+        self._partial = b""
+        self._size = 0
+        self._mtime_ns = 0
+        self._head = b""
+        # Wall-clock time of the last write, for measuring listener lag
+        self.mtime = 0.0
+        self._notifier = _make_notifier(path)
+        self.rotations = 0
+        # Optional ultron.capture.CaptureWriter that keeps the chat lines read
+        self.recorder = None
+        self._open(seek_end=from_end)
+
+    def _open(self, seek_end: bool):
+        try:
+            self._fh = open(self.path, 'rb')
+        except FileNotFoundError:
+            self._fh = None
+            return
+        st = os.fstat(self._fh.fileno())
+        self._ino = st.st_ino
+        self._mtime_ns = st.st_mtime_ns
+        self._head = self._fh.read(HEAD_BYTES)
+        self._pos = st.st_size if seek_end else 0
+        self._fh.seek(self._pos)
+        self._partial = b""
+
+    @property
+    def position(self) -> int:
+        """File offset just past the last whole line handed to cursors."""
+        return self._pos - len(self._partial)
+
+    def _read_available(self) -> bytes:
+        """Read everything new; returns the complete lines as one block."""
+        data = []
+        while True:
+            chunk = self._fh.read(READ_CHUNK)
+            if not chunk:
+                break
+            data.append(chunk)
+            self._pos += len(chunk)
+        if not data:
+            return b""
+        buf = self._partial + b"".join(data)
+        cut = buf.rfind(b"\n") + 1
+        self._partial = buf[cut:]
+        return buf[:cut]
+
+    def _check_rotation(self) -> bytes:
+        """Handle rotation/truncation; returns lines drained from an old handle."""
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return b""  # rotated away and not recreated yet
+        self._size = st.st_size
+        self.mtime = st.st_mtime
+        if self._fh is None:
+            self._open(seek_end=False)
+            return b""
+        if st.st_ino != self._ino:
+            # latest.log was renamed and recreated: finish the old file first.
+            # Nothing more will be appended to it, so an unterminated last
+            # line is complete and goes out with the rest
+            drained = self._read_available() + self._partial
+            if self._partial:
+                drained += b"\n"
+            self._fh.close()
+            self.rotations += 1
+            print(f"🔄 {os.path.basename(self.path)} rotated, following new file")
+            self._open(seek_end=False)
+            return drained
+        changed = st.st_mtime_ns != self._mtime_ns
+        self._mtime_ns = st.st_mtime_ns
+        if st.st_size < self._pos or (changed and self._head_changed()):
+            print(f"✂️ {os.path.basename(self.path)} truncated, rewinding")
+            self.rotations += 1
+            self._fh.seek(0)
+            self._pos = 0
+            self._partial = b""
+            self._head = b""
+        return b""
+
+    def _head_changed(self) -> bool:
+        """True if the start of the file no longer matches what we read
+        (truncated and written again past our offset). Also grows the
+        remembered head while the file is still shorter than HEAD_BYTES."""
+        self._fh.seek(0)
+        head = self._fh.read(HEAD_BYTES)
+        self._fh.seek(self._pos)
+        if head[:len(self._head)] != self._head:
+            return True
+        self._head = head
+        return False
+
+    def pump(self) -> int:
+        """Read whatever is new and hand it to every cursor. Returns bytes read."""
+        with self.lock:
+            block = self._check_rotation()
+            # Only touch the handle when stat says there's something to read
+            if self._fh is not None and self._size > self._pos:
+                block += self._read_available()
+            if block:
+                if b"\r" in block:
+                    block = block.replace(b"\r\n", b"\n")
+                if self.recorder is not None:
+                    self.recorder.log_block(block)
+                lines = None
+                for cursor in self._cursors:
+                    if cursor.chunks:
+                        cursor.pending.append(block)
+                    else:
+                        if lines is None:
+                            lines = block.split(b"\n")
+                            lines.pop()
+                        cursor.pending.extend(lines)
+                self._cond.notify_all()
+            return len(block)
+
+    def wait_for_change(self, timeout: float):
+        """Block until the file may have changed. One thread watches the
+        notifier; the rest wait on the condition for its pump."""
+        with self.lock:
+            if self._watching:
+                self._cond.wait(timeout)
+                return
+            self._watching = True
+        try:
+            self._notifier.wait(timeout)
+        finally:
+            with self.lock:
+                self._watching = False
+                self._cond.notify_all()
+
+    @property
+    def subscribers(self) -> int:
+        with self.lock:
+            return len(self._cursors)
+
+    def subscribe(self, chunks: bool = False) -> LogCursor:
+        """New cursor that sees lines written from now on. With `chunks`, the
+        cursor receives raw blocks of whole lines instead of split lines."""
+        self.pump()
+        cursor = LogCursor(self, chunks)
+        with self.lock:
+            self._cursors.append(cursor)
+        return cursor
+
+    def unsubscribe(self, cursor: LogCursor):
+        with self.lock:
+            if cursor in self._cursors:
+                self._cursors.remove(cursor)
+
+    def close(self):
+        with self.lock:
+            if self._fh is not None:
+                self._fh.close()
+                self._fh = None
+        self._notifier.close()
+
+
+class LogSelector:
+    """Watch several logs from one loop (e.g. one per bot in a fleet).
+
+    Each watched log gets its own chunk cursor and change notifier; poll()
+    blocks on all of them at once and returns the new data per key.
+    """
+
+    def __init__(self, poll_interval: float = 0.1):
+        self.poll_interval = poll_interval
+        self._watched: List[Tuple[Any, LogCursor, Any]] = []
+
+    def add(self, key: Any, path: str) -> LogCursor:
+        cursor = get_tailer(path).subscribe(chunks=True)
+        self._watched.append((key, cursor, _make_notifier(path)))
+        return cursor
+
+    def _collect(self) -> List[Tuple[Any, bytes]]:
+        ready = []
+        for key, cursor, _ in self._watched:
+            blocks = cursor.read_chunks()
+            if blocks:
+                ready.append((key, b"".join(blocks)))
+        return ready
+
+    def poll(self, timeout: float) -> List[Tuple[Any, bytes]]:
+        """Return [(key, block), ...] for logs with new lines, waiting up to `timeout`."""
+        deadline = time.monotonic() + timeout
+        while True:
+            ready = self._collect()
+            remaining = deadline - time.monotonic()
+            if ready or remaining <= 0:
+                return ready
+            notifiers = [n for _, _, n in self._watched]
+            if notifiers and all(isinstance(n, _InotifyNotifier) for n in notifiers):
+                fds, _, _ = select.select([n.fd for n in notifiers], [], [], remaining)
+                for n in notifiers:
+                    if n.fd in fds:
+                        n.drain()
+            else:
+                time.sleep(min(self.poll_interval, remaining))
+
+    def close(self):
+        for _, cursor, notifier in self._watched:
+            cursor.close()
+            notifier.close()
+        self._watched = []
+
+
+_tailers: Dict[str, LogTailer] = {}
+_tailers_lock = threading.Lock()
+
+
+def get_tailer(path: str) -> LogTailer:
+    """Shared LogTailer for `path`, so each log file is open exactly once."""
+    key = os.path.abspath(path)
+    with _tailers_lock:
+        tailer = _tailers.get(key)
+        if tailer is None:
+            tailer = _tailers[key] = LogTailer(path)
+        return tailer
@@ -0,0 +1,179 @@
+"""
+Shared registry of log waiters on top of a LogTailer.
+
+Any number of waiters (farm completion, Baritone path failures, death
+messages, ...) sign up with their patterns and a timeout. A single background
+thread reads the tail stream and runs one compiled regex alternation over
+each line, so the cost per line doesn't grow with patterns x waiters. Each waiter
+resolves through a concurrent.futures.Future with a LogMatch, or None on
+timeout.
+"""
+
+import os
+import re
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from .log_tail import LogTailer, get_tailer
+
+
+class LogMatch(NamedTuple):
+    pattern: str
+    line: str
+
+
+class PatternMatcher:
+    """Case-insensitive search for a fixed set of patterns with one compiled regex
+    (run over the lowercased line)."""
+
+    def __init__(self, patterns: Iterable[str]):
+        keys = sorted({p.lower() for p in patterns}, key=len, reverse=True)
+        # Longest first inside a lookahead, so every start position reports its
+        # longest pattern; shorter ones starting there are its prefixes
+        self._regex = re.compile("(?=(" + "|".join(map(re.escape, keys)) + "))")
+        self._prefixes: Dict[str, Set[str]] = {p: {q for q in keys if p.startswith(q)} for p in keys}
+
+    def search(self, text: str) -> Set[str]:
+        """Return every (lowercased) pattern that occurs in `text`."""
+        found: Set[str] = set()
+        for m in self._regex.finditer(text.lower()):
+            found |= self._prefixes[m.group(1)]
+        return found
+
+
+class LogWaiter:
+    __slots__ = ("patterns", "future", "deadline")
+
+    def __init__(self, patterns: List[str], deadline: Optional[float]):
+        self.patterns = patterns
+        self.future: Future = Future()
+        self.deadline = deadline
+
+
+class WaiterRegistry:
+    """Resolve many concurrent log waiters from one tail stream."""
+
+    def __init__(self, tailer: LogTailer):
+        self.tailer = tailer
+        self.cursor = tailer.subscribe()
+        self._lock = threading.RLock()
+        self._waiters: List[LogWaiter] = []
+        self._by_pattern: Dict[str, List[LogWaiter]] = {}
+        self._matcher: Optional[PatternMatcher] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def register(self, patterns: Iterable[str], timeout: Optional[float] = None,
+                 callback: Optional[Callable[[Optional[LogMatch]], None]] = None) -> Future:
+        """Wait for the first line containing any of `patterns` (case-insensitive).
+        The future's result is a LogMatch, or None if `timeout` runs out first."""
+        waiter = LogWaiter(list(patterns), None if timeout is None else time.monotonic() + timeout)
+        if callback is not None:
+            waiter.future.add_done_callback(lambda f: f.cancelled() or callback(f.result()))
+        with self._lock:
+            # Settle lines written before this waiter existed so it only sees new ones
+            results = self._drain()
+            self._waiters.append(waiter)
+            self._rebuild()
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="log-waiters", daemon=True)
+                self._thread.start()
+        self._resolve(results)
+        return waiter.future
+
+    def cancel(self, future: Future):
+        with self._lock:
+            for waiter in self._waiters:
+                if waiter.future is future:
+                    self._waiters.remove(waiter)
+                    self._rebuild()
+                    break
+        future.cancel()
+
+    @property
+    def active(self) -> int:
+        with self._lock:
+            return len(self._waiters)
+
+    def _rebuild(self):
+        self._by_pattern = {}
+        for waiter in self._waiters:
+            for pattern in waiter.patterns:
+                self._by_pattern.setdefault(pattern.lower(), []).append(waiter)
+        self._matcher = PatternMatcher(self._by_pattern) if self._by_pattern else None
+
+    def _match(self, line: str) -> List[Tuple[LogWaiter, Optional[LogMatch]]]:
+        """Run the matcher over one line and detach the waiters it satisfies.
+        Caller holds the lock; futures are resolved after it's released."""
+        if self._matcher is None:
+            return []
+        hits = self._matcher.search(line)
+        if not hits:
+            return []
+        satisfied: Dict[LogWaiter, None] = {}
+        for key in hits:
+            for waiter in self._by_pattern[key]:
+                satisfied[waiter] = None
+        results = []
+        for waiter in satisfied:
+            # Report the waiter's own spelling of the pattern
+            pattern = next(p for p in waiter.patterns if p.lower() in hits)
+            results.append((waiter, LogMatch(pattern, line)))
+        for waiter, _ in results:
+            self._waiters.remove(waiter)
+        self._rebuild()
+        return results
+
+    def _drain(self) -> List[Tuple[LogWaiter, Optional[LogMatch]]]:
+        results = []
+        for line in self.cursor.read_lines():
+            results += self._match(line)
+        return results
+
+    def _expire(self) -> List[Tuple[LogWaiter, Optional[LogMatch]]]:
+        now = time.monotonic()
+        expired = [w for w in self._waiters if w.deadline is not None and w.deadline <= now]
+        if expired:
+            for waiter in expired:
+                self._waiters.remove(waiter)
+            self._rebuild()
+        return [(waiter, None) for waiter in expired]
+
+    @staticmethod
+    def _resolve(results: List[Tuple[LogWaiter, Optional[LogMatch]]]):
+        for waiter, match in results:
+            if not waiter.future.done():
+                waiter.future.set_result(match)
+
+    def feed(self, line: str):
+        """Match one line against every registered pattern at once."""
+        with self._lock:
+            results = self._match(line)
+        self._resolve(results)
+
+    def _run(self):
+        while True:
+            with self._lock:
+                results = self._drain() + self._expire()
+                deadlines = [w.deadline for w in self._waiters if w.deadline is not None]
+            self._resolve(results)
+            # Wake for new lines, or in time to expire the next waiter
+            timeout = 1.0
+            if deadlines:
+                timeout = min(max(min(deadlines) - time.monotonic(), 0.01), timeout)
+            self.cursor.wait(timeout)
+
+
+_registries: Dict[str, WaiterRegistry] = {}
+_registries_lock = threading.Lock()
+
+
+def get_waiters(path: str) -> WaiterRegistry:
+    """Shared WaiterRegistry for the log at `path`."""
+    key = os.path.abspath(path)
+    with _registries_lock:
+        registry = _registries.get(key)
+        if registry is None:
+            registry = _registries[key] = WaiterRegistry(get_tailer(path))
+        return registry
@@ -0,0 +1,614 @@
+#!/usr/bin/env python3
+"""
+Minecraft Ultron - Automated farming script using GameQuery mod API
+Uses the MCBot class for reliable communication with Minecraft
+"""
+
+import time
+import math
+import sys
+import os
+import threading
+from concurrent.futures import TimeoutError as FuturesTimeout
+from typing import Any, Dict
+
+from .chat_parser import scan_chat
+from .client import MCBot
+from .dispatcher import CommandRegistry, Dispatcher
+from .farm_registry import DEFAULT_FARM, FarmRegistry
+from .log_tail import get_tailer
+from .log_waiters import get_waiters
+from .metrics import METRICS
+from .movement import MovementTracker, MOVING, ARRIVED, CANCELLED
+from .plans import PlanBook, PlanExecutor
+from .route_planner import RoutePlanner, TravelModel
+from .tracing import TRACER
+from .world_cache import WorldCache
+
+# --- Configuration ---
+
+def load_env_file():
+    """Load .env from the working directory (or the project root) if there is
+    one. python-dotenv is only imported when a file is found."""
+    package_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    for folder in (os.getcwd(), package_root):
+        path = os.path.join(folder, ".env")
+        if os.path.exists(path):
+            from dotenv import load_dotenv
+            load_dotenv(path)
+            return path
+    return None
+
+load_env_file()
+LOG_PATH = os.environ.get("LOG_PATH", "") # path to your latest.log
+BOT_NAME = os.environ.get("BOT_NAME", "IronManForever")
+GAMEQUERY_HOST = os.environ.get("GAMEQUERY_HOST", "localhost")
+GAMEQUERY_PORT = int(os.environ.get("GAMEQUERY_PORT", "25566"))
+# Reuse GameQuery connections across queries; set to 0 for one-shot sockets
+GAMEQUERY_POOLED = os.environ.get("GAMEQUERY_POOLED", "1") != "0"
+# Echo every log line the listener reads (noisy on busy servers)
+VERBOSE_LOG = os.environ.get("VERBOSE_LOG", "0") != "0"
+# Metrics snapshot: *.json for JSON, anything else for Prometheus text.
+# Written by the `metrics` chat command, and every METRICS_INTERVAL seconds if set
+METRICS_FILE = os.environ.get("METRICS_FILE", "metrics.prom")
+METRICS_INTERVAL = float(os.environ.get("METRICS_INTERVAL", "0"))
+# Position reads within this many seconds share one query; TELEMETRY_BACKGROUND=1
+# also polls in the background (at the readers' pace while anyone polls)
+TELEMETRY_TTL = float(os.environ.get("TELEMETRY_TTL", "0.1"))
+TELEMETRY_BACKGROUND = os.environ.get("TELEMETRY_BACKGROUND", "0") != "0"
+# Plain chat messages per second the server tolerates (Baritone # commands aren't limited by it)
+CHAT_RATE = float(os.environ.get("CHAT_RATE", "1.0"))
+# Where the listener records how far it read latest.log (empty turns it off).
+# On start, chat commands written since then that start with one of
+# BACKFILL_COMMANDS (comma separated, * for all) are replayed
+REPLAY_CHECKPOINT = os.environ.get("REPLAY_CHECKPOINT", "log_checkpoint.json")
+BACKFILL_COMMANDS = [c.strip() for c in os.environ.get("BACKFILL_COMMANDS", "my farm").split(",") if c.strip()]
+# Record every query, reply and chat line of the session here (see ultron.capture); empty = off
+CAPTURE_FILE = os.environ.get("CAPTURE_FILE", "")
+
+FARMS_DB = os.environ.get("FARMS_DB", "farms.db")
+TRAVEL_TIMES_FILE = os.environ.get("TRAVEL_TIMES_FILE", "travel_times.json")
+# Seconds a scanned area of the world cache is trusted before it is rescanned
+WORLD_CACHE_MAX_AGE = float(os.getenv("WORLD_CACHE_MAX_AGE", "60"))
+
+HOME_COORDS = (-4188, 59, 4259)
+
+# Seconds a farm job waits for other farm requests to join its tour
+FARM_TOUR_WINDOW = float(os.environ.get("FARM_TOUR_WINDOW", "3"))
+
+# `count <block> [radius]` scans this far around the bot (at most 64), and
+# SCAN_HEIGHT blocks below and above it
+SCAN_RADIUS = int(os.environ.get("SCAN_RADIUS", "32"))
+SCAN_HEIGHT = int(os.environ.get("SCAN_HEIGHT", "4"))
+
+# --- Shared State ---
+# Built on first use, so importing the bot opens no state files
+
+_shared: Dict[str, Any] = {}
+_shared_lock = threading.Lock()
+
+def _shared_instance(name: str, build):
+    with _shared_lock:
+        if name not in _shared:
+            _shared[name] = build()
+        return _shared[name]
+
+def get_farms() -> FarmRegistry:
+    """Players' farms; imports an old farms.txt on first start."""
+    return _shared_instance("farms", lambda: FarmRegistry(FARMS_DB, legacy_path="farms.txt"))
+
+def get_plans() -> PlanBook:
+    """Routine plans (farm, sleep, home); PLANS_FILE overrides the built-ins
+    and is re-read when it changes."""
+    return _shared_instance("plans", PlanBook)
+
+def get_route_planner() -> RoutePlanner:
+    """Orders multi-farm tours; learns walking times from finished trips."""
+    return _shared_instance("route_planner", lambda: RoutePlanner(TravelModel(TRAVEL_TIMES_FILE)))
+
+def get_world() -> WorldCache:
+    """Blocks seen by `blocks` scans, shared by every routine."""
+    return _shared_instance("world", lambda: WorldCache(max_age=WORLD_CACHE_MAX_AGE))
+
+# --- Utilities ---
+
+_keyboard = None
+
+def esc_pressed() -> bool:
+    """True while ESC is held. `keyboard` is imported on the first check, and
+    ESC handling turns itself off if it can't be used (e.g. no root on Linux)."""
+    global _keyboard
+    if _keyboard is None:
+        try:
+            import keyboard
+            keyboard.is_pressed('esc')
+            _keyboard = keyboard
+        except Exception as e:
+            print(f"⚠️ ESC handling disabled: {e}")
+            _keyboard = False
+    return bool(_keyboard) and _keyboard.is_pressed('esc')
+
+def watch_escape(client: MCBot, interval: float = 0.2):
+    """Treat ESC like the `stop` command. Routines run on job worker threads,
+    so this watches from its own thread and stops them through their cancel
+    events instead of exiting wherever the key happens to be noticed."""
+    def run():
+        while True:
+            if esc_pressed():
+                stop_everything(client, dispatcher.jobs, "ESC pressed")
+                while esc_pressed():
+                    time.sleep(interval)  # once per press
+            elif _keyboard is False:
+                return  # ESC handling unavailable here
+            time.sleep(interval)
+    threading.Thread(target=run, name="esc-watch", daemon=True).start()
+
+def stop_everything(client: MCBot, jobs, reason: str) -> int:
+    """Cancel the running routine and every queued job, and stop Baritone."""
+    cancelled = jobs.cancel()
+    print(f"🛑 {reason}, cancelled {cancelled} job(s)")
+    client.send_chat_message("#stop")
+    return cancelled
+
+def tail_log_and_wait_for(targets, timeout=60, cancel=None, log_path=None):
+    """Monitor log file for specific messages."""
+    print(f"🕵️ Waiting for any of {targets} in logs...")
+    waiters = get_waiters(log_path or LOG_PATH)
+    waiter = waiters.register(targets, timeout=timeout)
+    while True:
+        if cancel is not None and cancel.is_set():
+            waiters.cancel(waiter)
+            print(f"🛑 Stopped waiting for {targets}.")
+            return None
+        try:
+            # Short timeout only so cancel stays responsive; the registry resolves
+            # the future the moment a matching line is written
+            match = waiter.result(timeout=0.2)
+            break
+        except FuturesTimeout:
+            continue
+    if match is None:
+        print(f"❌ Timeout: none of {targets} found.")
+        return None
+    print(f"✅ Found in log: {match.line.strip()}")
+    return match.pattern
+
+def wait_for_farm_completion(client: MCBot, timeout: int = 300, cancel=None, log_path=None):
+    """Wait for farming to complete by monitoring log file."""
+    print("🌾 Monitoring farming progress via log file...")
+    
+    # Wait for either "Farm failed" or "goal reached" in the logs
+    result = tail_log_and_wait_for(["Farm failed", "goal reached"], timeout=timeout, cancel=cancel, log_path=log_path)
+    
+    if result is None:
+        print(f"❌ Timeout: Farming did not complete within {timeout} seconds")
+        return False
+    elif "Farm failed" in result:
+        print("❌ Farming failed!")
+        return False
+    else:
+        print("✅ Farming completed successfully!")
+        return True
+
+def wait_for_arrival(client, tolerance=0.2, stable_required=1, check_interval=1.0, max_wait=60, cancel=None):
+    """
+    Wait until the player stops moving (moves less than `tolerance` blocks over
+    `stable_required` * `check_interval` seconds).
+    Returns True if arrived, False if timeout or cancelled.
+    """
+    tracker = MovementTracker(tolerance=tolerance, settle_time=stable_required * check_interval,
+                              max_interval=check_interval, max_wait=max_wait)
+    while tracker.update(client.get_position()) == MOVING:
+        if interrupted(cancel, tracker.next_delay()):
+            tracker.cancel()
+            break
+    print(f"📍 Arrival check: {tracker.summary()}")
+    if tracker.state == CANCELLED:
+        return False
+    if tracker.state != ARRIVED:
+        print("❌ Timeout waiting for arrival.")
+        return False
+    return True
+
+def interrupted(cancel, delay: float = 0) -> bool:
+    """Sleep for `delay` seconds, waking early if `cancel` is set.
+    Returns True if the current job has been cancelled."""
+    if cancel is None:
+        time.sleep(delay)
+        return False
+    return cancel.wait(delay)
+
+def get_new_chat_lines(cursor):
+    """Read new chat lines from a log cursor since it was last read."""
+    # Only process player chat messages (customize this filter as needed);
+    # filter on bytes so non-chat lines are never decoded
+    return [line.decode('utf-8', errors='replace').strip() for line in cursor.read_raw() if b"]: <" in line]
+
+def listen_for_chat(cursor, checkpoint=None):
+    """Yield ChatEvents from a chunk cursor as they're written to the log.
+    With a checkpoint, record how far the events have been handled."""
+    tailer = cursor.tailer
+    rotations = tailer.rotations
+    for block in cursor.follow_chunks():
+        if VERBOSE_LOG:
+            for line in block.decode('utf-8', errors='replace').splitlines():
+                print(f"LOG: {line}")
+        yield from scan_chat(block)
+        if checkpoint is not None:
+            with tailer.lock:
+                caught_up = not cursor.pending
+                position, rotated = tailer.position, tailer.rotations != rotations
+            if caught_up:
+                checkpoint.update(tailer.path, position, rotated)
+                rotations = tailer.rotations
+
+def backfill_missed_commands(client: MCBot, checkpoint, end: int) -> int:
+    """Replay chat commands written to the log while the bot wasn't running,
+    from the checkpoint up to `end` (where the live listener took over)."""
+    from .log_replay import LogReplayer
+    if not checkpoint.exists:
+        print("📍 No log checkpoint yet; starting from the end of the log")
+        checkpoint.update(LOG_PATH, end, rotated=True)
+        return 0
+    allow = None if "*" in BACKFILL_COMMANDS else BACKFILL_COMMANDS
+    replayer = LogReplayer(os.path.dirname(os.path.abspath(LOG_PATH)))
+    count = replayer.backfill(checkpoint, LOG_PATH, lambda user, msg: dispatcher.dispatch(client, user, msg),
+                              allow=allow, end=end, ignore_user=BOT_NAME)
+    print(f"⏪ Backfilled {count} command(s) from {replayer.stats.bytes / 1024:.0f} KB of missed log")
+    checkpoint.update(LOG_PATH, end, rotated=True)
+    return count
+
+# --- Main Logic ---
+
+def farm_command(client: MCBot, player: str = None, cancel=None, log_path=None, farm_name: str = None):
+    farm = get_farms().get(player, farm_name)
+    if farm is None:
+        print(f"⚠️ No farm '{farm_name or 'main'}' registered for player '{player}'.")
+        return False
+    return farm_tour(client, [(player, farm)], cancel=cancel, log_path=log_path)
+
+def farm_stop(client: MCBot, player: str, farm, cancel=None, log_path=None, came_from=None):
+    """Farm one farm and drop the harvest in its chest. Returns True/False
+    for the farming result, or None if cancelled."""
+    print(f"🚜 Starting farm routine for {player}...")
+    return run_plan("farm", client, cancel=cancel, log_path=log_path,
+                    player=player, farm=farm.coords, came_from=came_from)
+
+def _learn_leg(client: MCBot, start, end):
+    trip = getattr(client, "last_trip", None)
+    if start is not None and trip is not None and trip.outcome == ARRIVED:
+        get_route_planner().model.record(start, end, trip.elapsed)
+
+# Python steps plans can `call`, given (executor, vars)
+PLAN_HOOKS = {
+    "learn_leg": lambda executor, vars: _learn_leg(executor.client, vars.get("came_from"), vars["farm"]),
+}
+
+def run_plan(name: str, client: MCBot, cancel=None, log_path=None, **vars):
+    """Run the named routine plan (see plans.py). Returns its result, or None if cancelled."""
+    executor = PlanExecutor(client, world=get_world(), log_path=log_path or LOG_PATH, hooks=PLAN_HOOKS, cancel=cancel)
+    try:
+        return executor.run(get_plans().get(name), {"home": HOME_COORDS, **vars})
+    finally:
+        executor.close()
+
+@METRICS.timed_command("farm")
+@TRACER.traced("farm")
+def farm_tour(client: MCBot, stops, cancel=None, log_path=None):
+    """Farm every (player, farm) in `stops` in one trip, going home only at
+    the end. Returns True if every farm succeeded."""
+    pos = client.get_position()
+    start = tuple(pos[:3]) if pos else HOME_COORDS
+    with TRACER.span("plan route", stops=len(stops)):
+        plan = get_route_planner().plan(start, [farm.coords for _, farm in stops], HOME_COORDS)
+    get_route_planner().record_plan(plan)
+    print(f"🧭 Farm tour: {plan.summary()}")
+
+    results = {}
+    here = start
+    for index in plan.order:
+        player, farm = stops[index]
+        result = farm_stop(client, player, farm, cancel=cancel, log_path=log_path, came_from=here)
+        if result is None:
+            print(f"🛑 Farm routine for {player} cancelled.")
+            return False
+        results[index] = result
+        here = farm.coords
+        if result:
+            print(f"✅ Farming complete for {player}!")
+        else:
+            print(f"❌ Farming failed for {player}.")
+
+    # Step 6: Return home (always return home regardless of farming success)
+    hx, hy, hz = HOME_COORDS
+    print(f"🏠 Returning home to ({hx}, {hy}, {hz})...")
+    with TRACER.span("return home"):
+        client.goto(hx, hy, hz, tolerance=2, cancel=cancel)
+    _learn_leg(client, here, HOME_COORDS)
+    return all(results.values())
+
+@METRICS.timed_command("sleep")
+@TRACER.traced("sleep")
+def sleep_command(client: MCBot, bed_type: str = "white_bed", cancel=None):
+    # Returns False only if the bed couldn't be reached; a missing bed is reported and skipped
+    return bool(run_plan("sleep", client, cancel=cancel, bed=bed_type, bed_name=bed_type.replace('_', ' ')))
+
+@METRICS.timed_command("home")
+@TRACER.traced("home")
+def home_command(client: MCBot, cancel=None):
+    result = run_plan("home", client, cancel=cancel)
+    if result is None:
+        print("🛑 Going home cancelled.")
+        return False
+    if result:
+        print("✅ Arrived at home!")
+    return result
+
+# Routines reachable through send_cmd, keyed by the command's first word
+ROUTINES = {
+    "farm": lambda client, player, args: farm_command(client, player, farm_name=args or None),
+    "sleep": lambda client, player, args: sleep_command(client, args.split()[0] if args else "white_bed"),
+    "home": lambda client, player, args: home_command(client),
+}
+
+def send_cmd(client: MCBot, cmd: str, player: str = None):
+    """Send a command using the MCBot API."""
+    name, _, args = cmd.strip().partition(" ")
+    routine = ROUTINES.get(name.lower())
+    if routine is None:
+        print(f"💬 Sending command: {cmd}")
+        client.send_chat_message(cmd)
+        return True
+    return routine(client, player, args.strip())
+
+# --- Chat Commands ---
+
+commands = CommandRegistry()
+dispatcher = Dispatcher(commands)
+
+def _set_farm(ctx, name, coords):
+    try:
+        coords = tuple(map(float, coords))
+        if len(coords) == 3:
+            farm = get_farms().set(ctx.user, coords, name)
+            print(f"✅ Set farm '{farm.name}' for {ctx.user} to {coords}")
+            ctx.client.send_chat_message(f"Your farm {farm.name} is at {coords}")
+    except Exception as e:
+        print(f"❌ Failed to set farm for {ctx.user}: {e}")
+
+@commands.command("my farm is at")
+def set_farm_handler(ctx):
+    _set_farm(ctx, "main", ctx.args.split())
+
+@commands.command("my farm")
+def set_named_farm_handler(ctx):
+    # my farm <name> is at x y z
+    words = ctx.args.split()
+    if len(words) == 6 and words[1:3] == ["is", "at"]:
+        _set_farm(ctx, words[0], words[3:])
+
+@commands.command("my farms", exact=True)
+def list_farms_handler(ctx):
+    owned = get_farms().farms_for(ctx.user)
+    if not owned:
+        ctx.client.send_chat_message(f"{ctx.user}, you have no farms yet")
+        return
+    listing = ", ".join(f"{f.name} ({f.x:.0f} {f.y:.0f} {f.z:.0f})" for f in owned)
+    ctx.client.send_chat_message(f"{ctx.user}'s farms: {listing}")
+
+@commands.command("forget farm")
+def forget_farm_handler(ctx):
+    name = ctx.args.split()[0] if ctx.args else DEFAULT_FARM
+    if get_farms().remove(ctx.user, name):
+        print(f"🗑️ Removed farm '{name}' for {ctx.user}")
+        ctx.client.send_chat_message(f"Forgot your farm {name}")
+    else:
+        ctx.client.send_chat_message(f"{ctx.user}, you have no farm called {name}")
+
+@commands.command("farms near me")
+def farms_near_handler(ctx):
+    # GameQuery only knows the bot's position, so this is "near the bot"
+    pos = ctx.client.get_position()
+    if pos is None:
+        return
+    hits = get_farms().near(pos[:3], radius=float(ctx.args) if ctx.args.isdigit() else None, limit=3)
+    if not hits:
+        ctx.client.send_chat_message("No farms nearby")
+        return
+    ctx.client.send_chat_message("Nearest farms: " + ", ".join(
+        f"{farm.player}/{farm.name} {dist:.0f}m" for farm, dist in hits))
+
+@commands.command("farm", background=True, exact=True)
+def farm_here_handler(ctx):
+    ctx.client.send_chat_message("#farm")
+
+@commands.command("farm home", background=True)
+def farm_home_handler(ctx):
+    farm = get_farms().get(ctx.user, ctx.args.split()[0] if ctx.args else None)
+    if farm is None:
+        print(f"⚠️ No farm '{ctx.args or 'main'}' registered for player '{ctx.user}'.")
+        return False
+    # Give nearby requests a moment to arrive, then fold every queued
+    # farm job into one tour instead of a home round trip each
+    if FARM_TOUR_WINDOW > 0 and interrupted(ctx.cancel, FARM_TOUR_WINDOW):
+        return False
+    stops, joined = [(ctx.user, farm)], []
+    for job in ctx.dispatcher.jobs.take("farm home"):
+        other = get_farms().get(job.ctx.user, job.ctx.args.split()[0] if job.ctx.args else None)
+        if other is None:
+            ctx.dispatcher.jobs.record(job, False)
+            continue
+        stops.append((job.ctx.user, other))
+        joined.append(job)
+    result = False
+    try:
+        result = farm_tour(ctx.client, stops, cancel=ctx.cancel, log_path=ctx.dispatcher.log_path)
+    finally:
+        for job in joined:
+            ctx.dispatcher.jobs.record(job, result)
+    return result
+
+@commands.command("sleep", background=True)
+def sleep_handler(ctx):
+    bed_type = ctx.args.split()[0] if ctx.args else "white_bed"
+    return sleep_command(ctx.client, bed_type, cancel=ctx.cancel)
+
+@commands.command("go home", background=True)
+def go_home_handler(ctx):
+    return home_command(ctx.client, cancel=ctx.cancel)
+
+@commands.command("stop")
+def stop_handler(ctx):
+    stop_everything(ctx.client, ctx.dispatcher.jobs, f"Stop requested by {ctx.user}")
+
+@commands.command("follow me", background=True)
+def follow_handler(ctx):
+    ctx.client.send_chat_message(f"#follow player {ctx.user}")
+
+@commands.command("find a", background=True)
+def find_handler(ctx):
+    if ctx.args:
+        ctx.client.send_chat_message(f"#goto {ctx.args}")
+
+@commands.command("drop", background=True)
+def drop_handler(ctx):
+    # drop <item> [item ...]: every stack of those items, in one burst
+    if ctx.args:
+        ctx.client.inventory.drop_all(ctx.args.split())
+
+@commands.command("keep only", background=True)
+def keep_only_handler(ctx):
+    # keep only tools and food [and <item> ...]
+    words = [w for w in ctx.args.lower().replace(",", " ").split() if w != "and"]
+    if not words:
+        return  # "keep only" on its own would drop everything
+    from .inventory import CATEGORIES
+    categories = [w for w in words if w in CATEGORIES]
+    keep = [w for w in words if w not in CATEGORIES]
+    ctx.client.inventory.keep_only(categories, keep=keep)
+
+@commands.command("count", background=True)
+def count_handler(ctx):
+    # count <block> [radius], e.g. "count white_bed 64" or "count wheat[age=7]"
+    words = ctx.args.split()
+    if not words:
+        return
+    from .region_scan import MAX_SCAN_RADIUS, RegionScanner
+    radius = int(words[1]) if len(words) > 1 and words[1].isdigit() else SCAN_RADIUS
+    radius = min(radius, MAX_SCAN_RADIUS)
+    pos = ctx.client.get_position()
+    if pos is None:
+        return
+    grid = RegionScanner(ctx.client).scan_around(pos[:3], radius, height=(SCAN_HEIGHT, SCAN_HEIGHT))
+    if grid is None:
+        return
+    hits = grid.within(words[0], pos[:3], radius)
+    reply = f"{len(hits)} {words[0]} within {radius} blocks"
+    if hits:
+        (x, y, z), dist = hits[0]
+        reply += f", nearest at {x} {y} {z} ({dist:.0f}m)"
+    ctx.client.send_chat_message(reply)
+
+@commands.command("status", exact=True)
+def status_handler(ctx):
+    ctx.client.send_chat_message(f"Status: {ctx.dispatcher.status_line()}")
+
+@commands.command("metrics", exact=True)
+def metrics_handler(ctx):
+    try:
+        METRICS.write(METRICS_FILE)
+        print(f"📊 Wrote metrics to {METRICS_FILE}")
+    except OSError as e:
+        print(f"❌ Could not write metrics to {METRICS_FILE}: {e}")
+        return
+    lag = METRICS.snapshot()["histograms"].get("listener_lag_seconds", [])
+    p99 = f", listener lag p99 {lag[0]['p99']:.2f}s" if lag else ""
+    shared = ctx.client.telemetry.stats()["saved"]
+    ctx.client.send_chat_message(f"Metrics written to {os.path.basename(METRICS_FILE)}{p99}, "
+                                 f"{shared:.0%} of position reads shared")
+
+def get_player_status(client: MCBot):
+    """Get and display current player status."""
+    try:
+        state = client.get_position()
+        print(f"\n📊 Player Status:")
+        print(f"   Location: ({state.x:.1f}, {state.y:.1f}, {state.z:.1f})")
+        print(f"   Rotation: Yaw {state.yaw:.1f}°, Pitch {state.pitch:.1f}°")
+        print(f"   Health: {state.health:.1f}/{state.max_health:.1f}")
+        print(f"   Food: {state.food}/20")
+        print(f"   Level: {state.level} (Total XP: {state.experience})")
+        return True
+    except Exception as e:
+        print(f"❌ Error getting player status: {e}")
+        return False
+
+# --- Entry Point ---
+
+def main():
+    print("🎮 Minecraft Ultron - GameQuery Edition")
+    print("=====================================")
+
+    if not LOG_PATH:
+        print("❌ LOG_PATH is not set; point it at your latest.log in .env")
+        return
+
+    client = MCBot(GAMEQUERY_HOST, GAMEQUERY_PORT, pooled=GAMEQUERY_POOLED, telemetry_ttl=TELEMETRY_TTL,
+                   chat_rate=CHAT_RATE)
+    recorder = None
+    if CAPTURE_FILE:
+        from .capture import CaptureWriter
+        recorder = CaptureWriter(CAPTURE_FILE, meta={"host": GAMEQUERY_HOST, "port": GAMEQUERY_PORT,
+                                                     "log": LOG_PATH, "bot": BOT_NAME})
+        client.recorder = recorder
+        get_tailer(LOG_PATH).recorder = recorder
+        print(f"🎥 Recording this session to {CAPTURE_FILE}")
+
+    # Test connection
+    print("\n🔗 Testing connection to GameQuery server...")
+    test_response = client.send_query({"type": "position"})
+    if test_response is None:
+        print("❌ Cannot connect to GameQuery server")
+        return
+
+    print("✅ Connected to GameQuery server!")
+    get_player_status(client)
+    # `drop` and `keep only` need the inventory query, which not every mod build answers
+    client.inventory.probe()
+
+    if METRICS_INTERVAL > 0:
+        METRICS.start_exporter(METRICS_FILE, METRICS_INTERVAL)
+    if TELEMETRY_BACKGROUND:
+        client.telemetry.start()
+    watch_escape(client)
+
+    # Start following the log from its current end; anything before that
+    # point which was missed since the last run is backfilled from the checkpoint
+    tailer = get_tailer(LOG_PATH)
+    log_cursor = tailer.subscribe(chunks=True)
+    checkpoint = None
+    if REPLAY_CHECKPOINT:
+        from .log_replay import Checkpoint
+        checkpoint = Checkpoint(REPLAY_CHECKPOINT)
+        with tailer.lock:
+            live_from = tailer.position
+        backfill_missed_commands(client, checkpoint, live_from)
+
+    print("\n🕵️ Listening for chat commands in Minecraft...")
+    try:
+        for event in listen_for_chat(log_cursor, checkpoint):
+            user, msg, kind = event
+            if user == BOT_NAME:
+                continue  # Ignore messages sent by the bot itself
+            print(f"📝 Detected {kind} from {user}: {msg}")
+            # Quick commands run here; routines go to the job worker so the
+            # listener keeps reading (and can honour `stop`) while they run
+            if dispatcher.dispatch(client, user, msg):
+                METRICS.observe("listener_lag_seconds", max(time.time() - log_cursor.tailer.mtime, 0.0))
+    finally:
+        if checkpoint is not None:
+            checkpoint.save()
+        if recorder is not None:
+            recorder.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+"""
+Lightweight in-process metrics: counters and latency histograms.
+
+Cheap enough to leave on in polling loops (one lock, one bisect and two
+list updates per observation). Snapshots export as Prometheus text or JSON:
+
+    METRICS.observe("gamequery_query_seconds", 0.002, type="position")
+    METRICS.write("metrics.prom")   # or metrics.json
+"""
+
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from functools import wraps
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Seconds, roughly x2.5 apart: sub-millisecond queries up to multi-minute routines
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+                   1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def _key(labels: Dict[str, str]) -> Labels:
+    items = tuple(labels.items())
+    return items if len(items) < 2 else tuple(sorted(items))
+
+
+class Histogram:
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q: float) -> float:
+        """Estimated quantile (upper bound of the bucket it falls in)."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank:
+                return self.buckets[i] if i < len(self.buckets) else float('inf')
+        return float('inf')
+
+
+class MetricsRegistry:
+    """Named counters and histograms, each split by label values."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[Labels, float]] = {}
+        self._histograms: Dict[str, Dict[Labels, Histogram]] = {}
+        self._help: Dict[str, str] = {}
+        self._buckets: Dict[str, Tuple[float, ...]] = {}
+        self.started = time.time()
+        self.enabled = os.environ.get("METRICS", "1") != "0"
+
+    def describe(self, name: str, help_text: str, buckets: Optional[Tuple[float, ...]] = None):
+        self._help[name] = help_text
+        if buckets is not None:
+            self._buckets[name] = tuple(sorted(buckets))
+
+    def inc(self, name: str, amount: float = 1, **labels: str):
+        if not self.enabled:
+            return
+        key = _key(labels)
+        with self._lock:
+            series = self._counters.get(name)
+            if series is None:
+                series = self._counters[name] = {}
+            series[key] = series.get(key, 0) + amount
+
+    def observe(self, name: str, value: float, **labels: str):
+        if not self.enabled:
+            return
+        key = _key(labels)
+        with self._lock:
+            series = self._histograms.get(name)
+            if series is None:
+                series = self._histograms[name] = {}
+            hist = series.get(key)
+            if hist is None:
+                hist = series[key] = Histogram(self._buckets.get(name, DEFAULT_BUCKETS))
+            hist.observe(value)
+
+    @contextmanager
+    def timer(self, name: str, **labels: str):
+        """Observe how long the `with` block takes."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def timed_command(self, command: str) -> Callable:
+        """Decorator for routines: records duration in command_duration_seconds
+        with an outcome label from the return value (True -> ok)."""
+        def wrap(fn):
+            @wraps(fn)
+            def run(*args, **kwargs):
+                start = time.perf_counter()
+                outcome = "error"
+                try:
+                    result = fn(*args, **kwargs)
+                    outcome = "ok" if result is not False else "failed"
+                    return result
+                finally:
+                    self.observe("command_duration_seconds", time.perf_counter() - start,
+                                 command=command, outcome=outcome)
+                    self.inc("commands_total", command=command, outcome=outcome)
+            return run
+        return wrap
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    # --- Export ---
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Plain-dict copy of every series (JSON-ready)."""
+        with self._lock:
+            counters = {name: [{"labels": dict(k), "value": v} for k, v in series.items()]
+                        for name, series in self._counters.items()}
+            histograms = {}
+            for name, series in self._histograms.items():
+                rows = []
+                for k, h in series.items():
+                    rows.append({
+                        "labels": dict(k),
+                        "count": h.count,
+                        "sum": h.sum,
+                        "mean": h.sum / h.count if h.count else 0.0,
+                        "p50": h.quantile(0.5),
+                        "p90": h.quantile(0.9),
+                        "p99": h.quantile(0.99),
+                        "buckets": dict(zip([str(b) for b in h.buckets] + ["+Inf"], h.counts)),
+                    })
+                histograms[name] = rows
+        return {"timestamp": time.time(), "uptime": time.time() - self.started,
+                "counters": counters, "histograms": histograms}
+
+    @staticmethod
+    def _label_text(labels: Labels, extra: Tuple[Tuple[str, str], ...] = ()) -> str:
+        items = labels + extra
+        if not items:
+            return ""
+        escaped = (str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, v in items)
+        return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(items, escaped)) + "}"
+
+    def to_prometheus(self) -> str:
+        """Prometheus text exposition format."""
+        lines: List[str] = []
+        with self._lock:
+            for name, series in sorted(self._counters.items()):
+                if name in self._help:
+                    lines.append(f"# HELP {name} {self._help[name]}")
+                lines.append(f"# TYPE {name} counter")
+                for labels, value in series.items():
+                    lines.append(f"{name}{self._label_text(labels)} {value}")
+            for name, series in sorted(self._histograms.items()):
+                if name in self._help:
+                    lines.append(f"# HELP {name} {self._help[name]}")
+                lines.append(f"# TYPE {name} histogram")
+                for labels, h in series.items():
+                    cumulative = 0
+                    for bound, n in zip(list(h.buckets) + ["+Inf"], h.counts):
+                        cumulative += n
+                        lines.append(f"{name}_bucket{self._label_text(labels, (('le', str(bound)),))} {cumulative}")
+                    lines.append(f"{name}_sum{self._label_text(labels)} {h.sum}")
+                    lines.append(f"{name}_count{self._label_text(labels)} {h.count}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: str):
+        """Write a snapshot atomically: JSON for *.json, Prometheus text otherwise."""
+        if path.endswith(".json"):
+            data = json.dumps(self.snapshot(), indent=2)
+        else:
+            data = self.to_prometheus()
+        tmp = path + ".tmp"
+        with open(tmp, 'w') as f:
+            f.write(data)
+        os.replace(tmp, path)
+
+    def start_exporter(self, path: str, interval: float) -> threading.Thread:
+        """Rewrite `path` every `interval` seconds from a daemon thread."""
+        def run():
+            while True:
+                time.sleep(interval)
+                try:
+                    self.write(path)
+                except OSError as e:
+                    print(f"⚠️ Could not write metrics to {path}: {e}")
+        thread = threading.Thread(target=run, name="metrics-exporter", daemon=True)
+        thread.start()
+        return thread
+
+
+METRICS = MetricsRegistry()
+METRICS.describe("gamequery_query_seconds", "Round trip time of GameQuery queries by type")
+METRICS.describe("gamequery_queries_total", "GameQuery queries sent, by type")
+METRICS.describe("gamequery_errors_total", "Failed GameQuery queries, by type and reason")
+METRICS.describe("gamequery_batch_seconds", "Round trip time of pipelined query batches")
+METRICS.describe("command_duration_seconds", "Wall time of bot routines by command and outcome")
+METRICS.describe("commands_total", "Bot routines run, by command and outcome")
+METRICS.describe("listener_lag_seconds", "Time from a chat line being written to its dispatch")
@@ -0,0 +1,158 @@
+"""
+Motion-aware arrival detection shared by MCBot.goto and wait_for_arrival.
+
+The tracker doesn't do any I/O itself: callers feed it position samples and
+it tells them whether the trip is done and how long to wait before the next
+sample. Far from the goal it polls rarely (based on the ETA from the current
+velocity); close to the goal or when the player slows down it polls quickly.
+"""
+
+import math
+import time
+from collections import deque
+from typing import Optional, Sequence, Tuple
+
+MOVING = "moving"
+ARRIVED = "arrived"
+STUCK = "stuck"
+TIMEOUT = "timeout"
+CANCELLED = "cancelled"
+
+
+class TripStats:
+    """`reads` counts position samples the tracker was fed; `wire_queries` is
+    how many `position` queries actually went out meanwhile (filled in by the
+    caller, since shared reads may be served from the telemetry cache)."""
+    __slots__ = ("reads", "wire_queries", "started", "finished", "outcome")
+
+    def __init__(self, started: float):
+        self.reads = 0
+        self.wire_queries: Optional[int] = None
+        self.started = started
+        self.finished: Optional[float] = None
+        self.outcome = MOVING
+
+    @property
+    def elapsed(self) -> float:
+        end = self.finished if self.finished is not None else time.monotonic()
+        return end - self.started
+
+    def __repr__(self):
+        return (f"TripStats(outcome={self.outcome!r}, reads={self.reads}, wire_queries={self.wire_queries}, "
+                f"elapsed={self.elapsed:.2f}s)")
+
+
+class MovementTracker:
+    """Estimate velocity/ETA from recent position samples.
+
+    With a `target`, the trip is done once every axis is within `tolerance`
+    of it, and it's stuck if the player makes no progress for `stuck_after`
+    seconds. Without a target (e.g. `#goto chest`), the trip is done once the
+    player has moved less than `tolerance` blocks over `settle_time` seconds.
+    """
+
+    def __init__(self, target: Optional[Tuple[float, float, float]] = None, tolerance: float = 2,
+                 settle_time: float = 1.0, min_interval: float = 0.1, max_interval: float = 4.0,
+                 stuck_after: float = 15.0, max_wait: Optional[float] = None, history: int = 6):
+        self.target = target
+        self.tolerance = tolerance
+        self.settle_time = settle_time
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.stuck_after = stuck_after
+        self.max_wait = max_wait
+        self.samples = deque(maxlen=history)
+        self.stats = TripStats(time.monotonic())
+        self.state = MOVING
+        self._anchor: Optional[Tuple[float, Tuple[float, float, float]]] = None
+        self._best_remaining = math.inf
+        self._last_progress = self.stats.started
+
+    # --- Estimates ---
+
+    @property
+    def velocity(self) -> float:
+        """Average speed in blocks/second over the sample window."""
+        if len(self.samples) < 2:
+            return 0.0
+        (t0, p0), (t1, p1) = self.samples[0], self.samples[-1]
+        if t1 <= t0:
+            return 0.0
+        return math.dist(p0, p1) / (t1 - t0)
+
+    @property
+    def remaining(self) -> Optional[float]:
+        if self.target is None or not self.samples:
+            return None
+        return math.dist(self.samples[-1][1], self.target)
+
+    @property
+    def eta(self) -> Optional[float]:
+        remaining = self.remaining
+        speed = self.velocity
+        if remaining is None or speed <= 1e-3:
+            return None
+        return max(0.0, remaining - self.tolerance) / speed
+
+    # --- Sampling ---
+
+    def update(self, position: Optional[Sequence[float]], now: Optional[float] = None) -> str:
+        """Record one `get_position` result and return the new state."""
+        now = time.monotonic() if now is None else now
+        self.stats.reads += 1
+        if position is not None:
+            pos = (float(position[0]), float(position[1]), float(position[2]))
+            self.samples.append((now, pos))
+            if self.target is not None:
+                self._update_target(now, pos)
+            else:
+                self._update_settle(now, pos)
+        if self.state == MOVING and self.max_wait is not None and now - self.stats.started > self.max_wait:
+            self.state = TIMEOUT
+        if self.state != MOVING:
+            self.stats.finished = now
+            self.stats.outcome = self.state
+        return self.state
+
+    def _update_target(self, now: float, pos: Tuple[float, float, float]):
+        if all(abs(c - t) <= self.tolerance for c, t in zip(pos, self.target)):
+            self.state = ARRIVED
+            return
+        remaining = math.dist(pos, self.target)
+        if remaining < self._best_remaining - 0.5:
+            self._best_remaining = remaining
+            self._last_progress = now
+        elif now - self._last_progress > self.stuck_after:
+            self.state = STUCK
+
+    def _update_settle(self, now: float, pos: Tuple[float, float, float]):
+        if self._anchor is None or math.dist(self._anchor[1], pos) >= self.tolerance:
+            self._anchor = (now, pos)
+        elif now - self._anchor[0] >= self.settle_time:
+            self.state = ARRIVED
+
+    def cancel(self, now: Optional[float] = None):
+        """End the trip early (e.g. the job was stopped)."""
+        self.state = self.stats.outcome = CANCELLED
+        self.stats.finished = time.monotonic() if now is None else now
+
+    def next_delay(self) -> float:
+        """Seconds to wait before taking the next sample."""
+        if self.target is None:
+            if self._anchor is not None and self.velocity < self.tolerance / max(self.settle_time, 1e-3):
+                # Looks stopped: sample again right when the settle window closes
+                due = self._anchor[0] + self.settle_time - self.samples[-1][0]
+                return min(max(due, self.min_interval), self.max_interval)
+            return min(self.settle_time, self.max_interval)
+        eta = self.eta
+        if eta is None:
+            # Not moving yet (Baritone still pathing) or no samples
+            return min(1.0, self.max_interval)
+        # Sample just before the predicted arrival; re-estimating from there
+        # absorbs speed changes without polling the whole way
+        return min(max(eta * 0.8, self.min_interval), self.max_interval)
+
+    def summary(self) -> str:
+        stats = self.stats
+        sent = f", {stats.wire_queries} sent" if stats.wire_queries is not None else ""
+        return f"{stats.outcome} after {stats.elapsed:.1f}s and {stats.reads} position reads{sent}"
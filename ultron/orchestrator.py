@@ -0,0 +1,224 @@
+"""
+Run a fleet of bots that share the farming workload.
+
+Each bot is its own Minecraft account with its own GameQuery port, latest.log
+and name; the fleet is described in a JSON file (BOTS_FILE, default
+bots.json):
+
+    [
+        {"name": "UltronBot", "port": 25566, "log_path": "C:/mc1/logs/latest.log"},
+        {"name": "UltronBot2", "port": 25567, "log_path": "C:/mc2/logs/latest.log"}
+    ]
+
+All logs are watched from one loop. Public chat shows up in every bot's log,
+so each message is handled once: `farm home` / `find a` go to the nearest
+idle bot (or the least busy one when nobody is idle), `stop` stops the whole
+fleet, and whispers go to the bot that was whispered.
+"""
+
+import json
+import math
+import os
+import time
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from . import main as ultron
+from .chat_parser import scan_chat
+from .dispatcher import Dispatcher
+from .log_tail import LogSelector
+
+MCBot = ultron.MCBot
+
+BOTS_FILE = os.environ.get("BOTS_FILE", "bots.json")
+# Identical public messages within this window are the same message seen
+# through several bots' logs
+DEDUP_WINDOW = 2.0
+REPORT_INTERVAL = 300
+
+# Commands the fleet spreads across bots; everything else goes to one bot
+ROUTED_COMMANDS = ("farm home", "find a")
+
+
+class BotConfig(NamedTuple):
+    name: str
+    port: int
+    log_path: str
+    host: str = "localhost"
+
+
+def load_fleet(path: str = BOTS_FILE) -> List[BotConfig]:
+    """Read the fleet description; returns [] if it's missing or invalid."""
+    try:
+        with open(path, "r") as f:
+            entries = json.load(f)
+        return [BotConfig(e["name"], int(e["port"]), e["log_path"], e.get("host", "localhost"))
+                for e in entries]
+    except FileNotFoundError:
+        print(f"❌ Fleet file {path} not found")
+    except (ValueError, KeyError, TypeError) as e:
+        print(f"❌ Invalid fleet file {path}: {e}")
+    return []
+
+
+class FleetBot:
+    """One account: its client, its own job queue, and the log it writes."""
+
+    def __init__(self, config: BotConfig):
+        self.config = config
+        self.name = config.name
+        self.client = MCBot(config.host, config.port, pooled=ultron.GAMEQUERY_POOLED)
+        self.dispatcher = Dispatcher(ultron.commands, log_path=config.log_path)
+
+    @property
+    def jobs(self):
+        return self.dispatcher.jobs
+
+    def position(self) -> Optional[Tuple[float, float, float]]:
+        pos = self.client.get_position()
+        return None if pos is None else pos[:3]
+
+    def distance_to(self, target: Tuple[float, float, float]) -> float:
+        pos = self.position()
+        return math.inf if pos is None else math.dist(pos, target)
+
+    def dispatch(self, user: str, msg: str) -> bool:
+        return self.dispatcher.dispatch(self.client, user, msg)
+
+    def __repr__(self):
+        return f"FleetBot({self.name}@{self.config.port})"
+
+
+class Orchestrator:
+    """Route chat commands from every bot's log to the right bot."""
+
+    def __init__(self, configs: List[BotConfig]):
+        self.bots = [FleetBot(config) for config in configs]
+        self.names = {bot.name for bot in self.bots}
+        self._recent: Dict[Tuple[str, str], float] = {}
+        self.started = time.monotonic()
+
+    def pick_bot(self, target: Optional[Tuple[float, float, float]] = None) -> FleetBot:
+        """Nearest idle bot to `target` (or the idle bot that has done the
+        least work), falling back to the bot with the shortest queue."""
+        idle = [bot for bot in self.bots if bot.jobs.idle]
+        if idle:
+            if target is not None and len(idle) > 1:
+                return min(idle, key=lambda bot: bot.distance_to(target))
+            return min(idle, key=lambda bot: bot.jobs.total_completed)
+        return min(self.bots, key=lambda bot: bot.jobs.load)
+
+    def _seen(self, user: str, msg: str) -> bool:
+        now = time.monotonic()
+        self._recent = {k: t for k, t in self._recent.items() if now - t < DEDUP_WINDOW}
+        key = (user, msg)
+        if key in self._recent:
+            return True
+        self._recent[key] = now
+        return False
+
+    def _target_for(self, user: str, msg: str) -> Optional[Tuple[float, float, float]]:
+        words = msg.lower().split()
+        if words[:2] == ["farm", "home"]:
+            farm = ultron.get_farms().get(user, words[2] if len(words) > 2 else None)
+            return farm.coords if farm else None
+        return None
+
+    def handle(self, bot: FleetBot, user: str, msg: str, kind: str):
+        if user in self.names:
+            return  # Ignore messages sent by any of our bots
+        if kind == "whisper":
+            print(f"📝 Detected whisper from {user} to {bot.name}: {msg}")
+            bot.dispatch(user, msg)
+            return
+        if self._seen(user, msg):
+            return
+        print(f"📝 Detected chat from {user}: {msg}")
+        lowered = msg.strip().lower()
+        if lowered == "stop":
+            for each in self.bots:
+                each.dispatch(user, msg)
+            return
+        if lowered == "fleet status":
+            self.report(announce=True)
+            return
+        routed = lowered.startswith(ROUTED_COMMANDS)
+        chosen = self.pick_bot(self._target_for(user, msg) if routed else None)
+        if chosen.dispatch(user, msg) and routed:
+            print(f"🧭 Routed '{msg}' from {user} to {chosen.name} (load {chosen.jobs.load})")
+
+    def stats(self) -> List[Dict[str, Any]]:
+        rows = []
+        for bot in self.bots:
+            stats = bot.jobs.stats()
+            rows.append({
+                "bot": bot.name,
+                "port": bot.config.port,
+                "load": bot.jobs.load,
+                "completed": stats["total_completed"],
+                "jobs_per_hour": stats["jobs_per_hour"],
+                "busy_fraction": stats["busy_fraction"],
+                "avg_run": stats["avg_run"],
+                "avg_wait": stats["avg_wait"],
+            })
+        return rows
+
+    def report(self, announce: bool = False):
+        """Print per-bot throughput (and optionally post the totals in chat)."""
+        rows = self.stats()
+        print(f"\n📈 Fleet throughput after {(time.monotonic() - self.started) / 60:.1f} min:")
+        for row in rows:
+            print(f"   {row['bot']:<16} {row['completed']:>4} jobs  {row['jobs_per_hour']:6.1f}/h  "
+                  f"busy {row['busy_fraction']:5.1%}  avg run {row['avg_run']:.1f}s  "
+                  f"avg wait {row['avg_wait']:.1f}s  load {row['load']}")
+        total = sum(row["jobs_per_hour"] for row in rows)
+        print(f"   {'fleet':<16} {sum(row['completed'] for row in rows):>4} jobs  {total:6.1f}/h")
+        if announce and self.bots:
+            self.bots[0].client.send_chat_message(
+                f"Fleet: {len(rows)} bots, {total:.1f} jobs/h, "
+                f"{sum(1 for bot in self.bots if bot.jobs.idle)} idle")
+
+    def run(self):
+        selector = LogSelector()
+        for bot in self.bots:
+            selector.add(bot, bot.config.log_path)
+        print(f"\n🕵️ Listening for chat commands on {len(self.bots)} bots...")
+        last_report = time.monotonic()
+        try:
+            while True:
+                for bot, block in selector.poll(timeout=1.0):
+                    for user, msg, kind in scan_chat(block):
+                        self.handle(bot, user, msg, kind)
+                if time.monotonic() - last_report >= REPORT_INTERVAL:
+                    self.report()
+                    last_report = time.monotonic()
+        finally:
+            selector.close()
+            self.report()
+            for bot in self.bots:
+                bot.client.close()
+
+
+def main():
+    print("🎮 Minecraft Ultron - Fleet Edition")
+    print("===================================")
+
+    configs = load_fleet()
+    if not configs:
+        return
+
+    orchestrator = Orchestrator(configs)
+    print("\n🔗 Testing connections to GameQuery servers...")
+    for bot in orchestrator.bots:
+        if bot.client.send_query({"type": "position"}) is None:
+            print(f"❌ Cannot connect to {bot.name} on port {bot.config.port}")
+            return
+        print(f"✅ {bot.name} connected on port {bot.config.port}")
+
+    try:
+        orchestrator.run()
+    except KeyboardInterrupt:
+        print("\n👋 Fleet stopped")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,516 @@
+"""
+Routines as data: plans of steps run by a PlanExecutor.
+
+A plan is a list of steps, each a dict with one action and its options:
+
+    {"name": "walk to farm", "goto": "$farm", "tolerance": 2}
+    {"settings": {"allowBreak": true, "allowPlace": true}}
+    {"baritone": "#farm"}
+    {"wait": "log", "success": ["goal reached"], "failure": ["Farm failed"], "timeout": 300, "result": true}
+    {"look_at": {"find": "{bed}", "radius": 5}, "on_fail": "end"}
+    {"wait": "facing"}
+    {"hold": "use", "seconds": 0.5}
+
+"$name" arguments and "{name}" in strings come from the run's variables.
+While a step runs, the executor prefetches what the next steps need (log
+waiters are armed before the command that triggers them; nearest-block
+lookups start once no step before them moves the player, as soon as the
+player stands still). A step marked "overlap" starts while the previous one
+is still running and only waits for running steps that use the same
+resource (movement, view, input, baritone, settings); later steps wait for
+it only if they share a resource with it, or at the end of the plan. Waits
+are on conditions (arrival, view settled, a log line) rather than fixed
+sleeps.
+
+The built-in plans below can be overridden from PLANS_FILE (plans.json),
+which is re-read whenever it changes. `python -m ultron.plans` prints the
+built-ins as a starting point.
+"""
+
+import json
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FuturesTimeout
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from .movement import MovementTracker, MOVING, ARRIVED
+from .tracing import TRACER
+
+Plan = List[Dict[str, Any]]
+
+PLANS_FILE = os.environ.get("PLANS_FILE", "plans.json")
+# How many steps ahead the executor prefetches
+PREFETCH_AHEAD = 2
+# Poll interval for view/position conditions: one game tick
+TICK = 0.05
+# Seconds the player must hold still before a prefetched lookup around it runs
+STILL_TIME = 0.3
+
+DEFAULT_PLANS: Dict[str, Plan] = {
+    "farm": [
+        {"name": "walk to farm", "say": "🚶 Walking to farm at {farm}...", "goto": "$farm", "tolerance": 2},
+        {"name": "learn leg", "call": "learn_leg"},
+        {"name": "settings on", "say": "⚙️ Enabling farming settings...",
+         "settings": {"allowBreak": True, "allowPlace": True}},
+        {"name": "farming", "say": "🌾 Starting farming...", "baritone": "#farm"},
+        {"name": "farming", "wait": "log", "success": ["goal reached"], "failure": ["Farm failed"],
+         "timeout": 300, "result": True},
+        # Runs even when cancelled, so Baritone isn't left breaking blocks
+        {"name": "settings off", "say": "⚙️ Disabling farming settings...",
+         "settings": {"allowBreak": False, "allowPlace": False}, "always": True},
+        {"name": "return to farm", "say": "🔄 Returning to farm at {farm} to deposit items...",
+         "goto": "$farm", "tolerance": 2},
+        {"name": "walk to chest", "say": "📦 Going to chest...", "baritone": "#goto chest"},
+        {"name": "walk to chest", "wait": "arrival", "tolerance": 0.2, "stable": 2},
+    ],
+    "sleep": [
+        {"name": "walk to bed", "say": "🛏️ Going to nearest {bed_name} with Baritone...", "baritone": "#goto {bed}"},
+        {"name": "walk to bed", "wait": "arrival", "tolerance": 0.2, "stable": 1,
+         "on_fail": "stop", "fail_say": "Failed to arrive at bed in time."},
+        {"name": "find bed", "say": "🔎 Searching for bed to look at and right-click...",
+         "look_at": {"find": "{bed}", "radius": 5}, "on_fail": "end", "fail_say": "❌ No {bed_name} found nearby!"},
+        {"name": "use bed", "wait": "facing", "timeout": 0.5},
+        {"name": "use bed", "say": "Right clicking", "hold": "use", "seconds": 0.5},
+    ],
+    "home": [
+        {"name": "walk home", "say": "🏠 Going home to {home}...", "goto": "$home", "tolerance": 2},
+        {"name": "settle", "say": "⏳ Waiting for arrival at home...", "wait": "arrival", "tolerance": 0.2,
+         "stable": 3, "on_fail": "stop", "fail_say": "❌ Failed to arrive at home in time."},
+    ],
+    "get_iron": [
+        {"goto": [-231, 96, 32.5]},
+        {"goto": [-229.5, 65, 32.5]},
+        {"goto": [-223.5, 66, 32.5]},
+        {"look_at": [-221.5, 66, 32.5]},
+        {"wait": "facing", "timeout": 1},
+        {"click": "open_container"},
+    ],
+}
+
+ACTIONS = ("goto", "baritone", "settings", "look_at", "wait", "click", "hold", "call", "sleep")
+WAITS = ("arrival", "facing", "log")
+CLICKS = ("right_click", "left_click", "attack", "open_container")
+HOLDS = {"use": "holdUse", "attack": "holdAttack"}
+ON_FAIL = ("continue", "end", "stop")
+
+# Resources each action occupies; overlapping steps must not share one
+RESOURCES: Dict[str, Set[str]] = {
+    "goto": {"movement", "view", "baritone"},
+    "baritone": {"baritone", "movement"},
+    "settings": {"settings"},
+    "look_at": {"view"},
+    "click": {"input", "view"},
+    "hold": {"input", "view"},
+    "call": set(),
+    "sleep": set(),
+}
+WAIT_RESOURCES = {"arrival": {"movement"}, "facing": {"view"}, "log": set()}
+# Actions that move the player (an arrival wait only watches it move)
+MOVES = ("goto", "baritone")
+
+
+def action_of(step: Dict[str, Any]) -> str:
+    found = [key for key in ACTIONS if key in step]
+    if len(found) != 1:
+        raise ValueError(f"step needs exactly one of {', '.join(ACTIONS)}: {step}")
+    return found[0]
+
+
+def resources_of(step: Dict[str, Any]) -> Set[str]:
+    action = action_of(step)
+    if "uses" in step:
+        return set(step["uses"])
+    return WAIT_RESOURCES[step["wait"]] if action == "wait" else RESOURCES[action]
+
+
+def validate_plan(name: str, plan: Plan):
+    """Raise ValueError describing the first malformed step."""
+    if not isinstance(plan, list) or not plan:
+        raise ValueError(f"plan '{name}' must be a non-empty list of steps")
+    for i, step in enumerate(plan):
+        where = f"plan '{name}' step {i + 1}"
+        if not isinstance(step, dict):
+            raise ValueError(f"{where} is not an object")
+        try:
+            action = action_of(step)
+        except ValueError as e:
+            raise ValueError(f"{where}: {e}") from None
+        if action == "wait" and step["wait"] not in WAITS:
+            raise ValueError(f"{where}: wait must be one of {', '.join(WAITS)}")
+        if action == "click" and step["click"] not in CLICKS:
+            raise ValueError(f"{where}: click must be one of {', '.join(CLICKS)}")
+        if action == "hold" and step["hold"] not in HOLDS:
+            raise ValueError(f"{where}: hold must be one of {', '.join(HOLDS)}")
+        if step.get("on_fail", "continue") not in ON_FAIL:
+            raise ValueError(f"{where}: on_fail must be one of {', '.join(ON_FAIL)}")
+
+
+class PlanBook:
+    """Built-in plans, overridden by a JSON file that is reloaded when it changes."""
+
+    def __init__(self, path: Optional[str] = PLANS_FILE, defaults: Optional[Dict[str, Plan]] = None):
+        self.path = path
+        self.defaults = DEFAULT_PLANS if defaults is None else defaults
+        self._plans: Dict[str, Plan] = dict(self.defaults)
+        self._mtime: Optional[float] = None
+        self._lock = threading.Lock()
+        self.reloads = 0
+
+    def _refresh(self):
+        if not self.path:
+            return
+        try:
+            mtime = os.stat(self.path).st_mtime
+        except FileNotFoundError:
+            mtime = None
+        if mtime == self._mtime:
+            return
+        with self._lock:
+            if mtime == self._mtime:
+                return
+            self._mtime = mtime
+            if mtime is None:
+                self._plans = dict(self.defaults)
+                return
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    loaded = json.load(f)
+                if not isinstance(loaded, dict):
+                    raise ValueError("expected an object of plan name -> steps")
+                for name, plan in loaded.items():
+                    validate_plan(name, plan)
+            except (OSError, ValueError) as e:
+                # Keep running the last good plans until the file is fixed
+                print(f"❌ Not reloading {self.path}: {e}")
+                return
+            self._plans = {**self.defaults, **loaded}
+            self.reloads += 1
+            print(f"📜 Loaded {len(loaded)} plan(s) from {self.path}")
+
+    def get(self, name: str) -> Plan:
+        self._refresh()
+        plan = self._plans.get(name)
+        if plan is None:
+            raise KeyError(f"No plan named '{name}'")
+        return plan
+
+    def names(self) -> List[str]:
+        self._refresh()
+        return sorted(self._plans)
+
+
+class PlanExecutor:
+    """Runs plans against one client.
+
+    `world` (a WorldCache) answers `look_at: {"find": ...}` steps, `log_path`
+    is where `wait: log` steps listen, and `hooks` are the Python callables
+    `call` steps can name; each gets (executor, vars) and returns True/False.
+    """
+
+    def __init__(self, client, world=None, log_path: Optional[str] = None,
+                 hooks: Optional[Dict[str, Callable[["PlanExecutor", Dict[str, Any]], Any]]] = None,
+                 cancel: Optional[threading.Event] = None):
+        self.client = client
+        self.world = world
+        self.log_path = log_path
+        self.hooks = hooks or {}
+        self.cancel = cancel
+        self.stats = {"steps": 0, "prefetched": 0, "prefetch_hits": 0, "overlapped": 0}
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._prefetched: Dict[int, Future] = {}
+
+    # --- Arguments ---
+
+    @staticmethod
+    def resolve(value: Any, vars: Dict[str, Any]) -> Any:
+        """Substitute "$name" values and "{name}" placeholders from `vars`."""
+        if isinstance(value, str):
+            if value.startswith("$"):
+                return vars[value[1:]]
+            return value.format(**vars) if "{" in value else value
+        if isinstance(value, list):
+            return [PlanExecutor.resolve(v, vars) for v in value]
+        if isinstance(value, dict):
+            return {k: PlanExecutor.resolve(v, vars) for k, v in value.items()}
+        return value
+
+    def _cancelled(self) -> bool:
+        return self.cancel is not None and self.cancel.is_set()
+
+    def _sleep(self, seconds: float) -> bool:
+        """Sleep, waking early on cancel. Returns True if cancelled."""
+        if self.cancel is None:
+            time.sleep(seconds)
+            return False
+        return self.cancel.wait(seconds)
+
+    def _submit(self, fn, *args) -> Future:
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="plan")
+        # Spans are per thread: carry the routine's trace into the worker
+        trace = TRACER.current()
+        if trace is None:
+            return self._pool.submit(fn, *args)
+        return self._pool.submit(_in_trace, trace, fn, *args)
+
+    # --- Prefetch ---
+
+    def _prefetch(self, plan: Plan, current: int, vars: Dict[str, Any]):
+        """Start work for steps after `current` whose inputs are already known."""
+        for j in range(current + 1, min(current + PREFETCH_AHEAD + 1, len(plan))):
+            if j in self._prefetched:
+                continue
+            step = plan[j]
+            action = action_of(step)
+            if action == "wait" and step["wait"] == "log" and j == current + 1 and self.log_path:
+                # Armed before the step that triggers the message runs
+                from .log_waiters import get_waiters
+                patterns = self.resolve(step.get("success", []) + step.get("failure", []), vars)
+                self._prefetched[j] = get_waiters(self.log_path).register(patterns, step.get("timeout"))
+                self.stats["prefetched"] += 1
+            elif (action == "look_at" and isinstance(step["look_at"], dict) and self.world
+                  and not any(action_of(s) in MOVES for s in plan[current:j])):
+                # Nothing still to run before it moves the player, so it only
+                # has to wait for the player to stand still
+                target = self.resolve(step["look_at"], vars)
+                self._prefetched[j] = self._submit(self._find_when_still, target)
+                self.stats["prefetched"] += 1
+
+    def _find_when_still(self, target: Dict[str, Any]):
+        """A look_at step's block lookup, once the player has stopped moving."""
+        tracker = MovementTracker(tolerance=0.2, settle_time=STILL_TIME, min_interval=TICK,
+                                  max_interval=STILL_TIME, max_wait=60)
+        while tracker.update(self.client.get_position()) == MOVING:
+            if self._sleep(tracker.next_delay()):
+                return None
+        if tracker.state != ARRIVED:
+            return None
+        with TRACER.span("prefetch lookup", cat="prefetch", find=target["find"]):
+            return self.world.find_nearest(self.client, target["find"], int(target.get("radius", 5)))
+
+    def _discard_prefetched(self):
+        """Drop prefetches a stopped plan never used (unregistering log waiters)."""
+        pending = [future for future in self._prefetched.values() if not future.done()]
+        self._prefetched.clear()
+        if pending and self.log_path:
+            from .log_waiters import get_waiters
+            for future in pending:
+                get_waiters(self.log_path).cancel(future)
+
+    # --- Steps ---
+
+    def _goto(self, step, vars, j):
+        x, y, z = self.resolve(step["goto"], vars)
+        return self.client.goto(x, y, z, tolerance=step.get("tolerance", 2), max_wait=step.get("max_wait"),
+                                cancel=self.cancel)
+
+    def _baritone(self, step, vars, j):
+        self.client.send_chat_message(self.resolve(step["baritone"], vars))
+        return True
+
+    def _settings(self, step, vars, j):
+        for key, value in self.resolve(step["settings"], vars).items():
+            value = str(value).lower() if isinstance(value, bool) else value
+            self.client.send_chat_message(f"#settings {key} {value}")
+        return True
+
+    def _look_at(self, step, vars, j):
+        target = self.resolve(step["look_at"], vars)
+        if isinstance(target, dict):
+            pending = self._prefetched.pop(j, None)
+            found = pending.result() if pending is not None else None
+            if found:
+                self.stats["prefetch_hits"] += 1
+            elif self.world is not None:
+                found = self.world.find_nearest(self.client, target["find"], int(target.get("radius", 5)))
+            else:
+                print("❌ look_at find needs a world cache")
+                return False
+            if not found:
+                return False
+            target = found[0]
+            print(f"👀 Looking at {step['look_at']['find'].format(**vars)} at {target}")
+        self.client.look_at(*target)
+        return True
+
+    def _wait(self, step, vars, j):
+        kind = step["wait"]
+        if kind == "arrival":
+            return self._wait_arrival(step)
+        if kind == "facing":
+            return self._wait_facing(step)
+        return self._wait_log(step, vars, j)
+
+    def _wait_arrival(self, step):
+        stable = step.get("stable", 1)
+        tracker = MovementTracker(tolerance=step.get("tolerance", 0.2), settle_time=stable,
+                                  max_interval=1.0, max_wait=step.get("max_wait", 60))
+        while tracker.update(self.client.get_position()) == MOVING:
+            if self._sleep(tracker.next_delay()):
+                tracker.cancel()
+                break
+        print(f"📍 Arrival check: {tracker.summary()}")
+        return tracker.state == ARRIVED
+
+    def _wait_facing(self, step):
+        """Until the view holds still for a tick after look_at, or `timeout`."""
+        deadline = time.monotonic() + step.get("timeout", 1.0)
+        tolerance = step.get("tolerance", 0.5)
+        last = None
+        while time.monotonic() < deadline:
+            pos = self.client.get_position(max_age=0)
+            if pos is not None:
+                view = (pos.yaw, pos.pitch)
+                if last is not None and _angle_moved(last, view) <= tolerance:
+                    return True
+                last = view
+            if self._sleep(TICK):
+                return False
+        return True  # same as the fixed sleep this replaces
+
+    def _wait_log(self, step, vars, j):
+        success = self.resolve(step.get("success", []), vars)
+        failure = self.resolve(step.get("failure", []), vars)
+        if not self.log_path:
+            print("❌ wait: log needs a log path")
+            return False
+        future = self._prefetched.pop(j, None)
+        if future is not None:
+            self.stats["prefetch_hits"] += 1
+        else:
+            from .log_waiters import get_waiters
+            future = get_waiters(self.log_path).register(success + failure, step.get("timeout"))
+        print(f"🕵️ Waiting for any of {success + failure} in logs...")
+        while True:
+            if self._cancelled():
+                from .log_waiters import get_waiters
+                get_waiters(self.log_path).cancel(future)
+                return None
+            try:
+                match = future.result(timeout=0.2)
+                break
+            except FuturesTimeout:
+                continue
+        if match is None:
+            print(f"❌ Timeout: none of {success + failure} found.")
+            return False
+        print(f"✅ Found in log: {match.line.strip()}")
+        return match.pattern.lower() in (p.lower() for p in success)
+
+    def _click(self, step, vars, j):
+        getattr(self.client, step["click"])()
+        return True
+
+    def _hold(self, step, vars, j):
+        self.client.inputs.hold(HOLDS[step["hold"]], step.get("seconds", 0.5)).wait()
+        return True
+
+    def _call(self, step, vars, j):
+        hook = self.hooks.get(step["call"])
+        if hook is None:
+            print(f"❌ No plan hook named '{step['call']}'")
+            return False
+        return hook(self, vars)
+
+    def _sleep_step(self, step, vars, j):
+        return not self._sleep(step["sleep"])
+
+    def run_step(self, step: Dict[str, Any], vars: Dict[str, Any], index: int = -1):
+        """Run one step. Returns True/False, or None if cancelled."""
+        action = action_of(step)
+        if "say" in step:
+            print(self.resolve(step["say"], vars))
+        handler = self._sleep_step if action == "sleep" else getattr(self, f"_{action}")
+        self.stats["steps"] += 1
+        with TRACER.span(step.get("name", action), cat="plan", action=action) as span:
+            outcome = handler(step, vars, index)
+            span.set(outcome=outcome)
+        if outcome is False and "fail_say" in step:
+            print(self.resolve(step["fail_say"], vars))
+        return outcome
+
+    # --- Plans ---
+
+    def run(self, plan: Plan, vars: Optional[Dict[str, Any]] = None):
+        """Run a plan. Returns its result (True unless a step marked "result"
+        says otherwise, False if an on_fail=stop step failed), or None if
+        cancelled. Steps marked "always" run even after a stop or cancel.
+
+        A step followed by an "overlap" step runs in the background so the
+        overlap step can start alongside it. A step waits for the running
+        steps it shares a resource with and, unless it is marked "overlap"
+        itself, for the previous steps that aren't. stats["overlapped"]
+        counts steps started while another step was still running."""
+        vars = dict(vars or {})
+        result, stopped = True, None
+        running: List[tuple] = []  # (future, step, resources)
+
+        def settle(outcome, step):
+            nonlocal result, stopped
+            if outcome is None and self._cancelled():
+                stopped = stopped or "cancelled"
+            elif step.get("result"):
+                result = bool(outcome)
+            if outcome is False and stopped is None:
+                on_fail = step.get("on_fail", "continue")
+                if on_fail != "continue":
+                    stopped = on_fail
+
+        def join(step: Optional[Dict[str, Any]] = None, uses: Set[str] = frozenset()):
+            """Wait for the running steps `step` depends on (all of them if None)."""
+            for entry in list(running):
+                future, other, other_uses = entry
+                if (step is None or other_uses & uses
+                        or not (step.get("overlap") or other.get("overlap"))):
+                    running.remove(entry)
+                    settle(future.result(), other)
+
+        try:
+            for i, step in enumerate(plan):
+                uses = resources_of(step)
+                join(step, uses)
+                if stopped is None and self._cancelled():
+                    stopped = "cancelled"
+                if stopped is not None:
+                    if step.get("always"):
+                        join()
+                        settle(self.run_step(step, vars, i), step)
+                    continue
+                self._prefetch(plan, i, vars)
+                if any(not future.done() for future, _, _ in running):
+                    self.stats["overlapped"] += 1
+                following = plan[i + 1] if i + 1 < len(plan) else {}
+                if step.get("overlap") or following.get("overlap"):
+                    running.append((self._submit(self.run_step, step, vars, i), step, uses))
+                else:
+                    settle(self.run_step(step, vars, i), step)
+            join()
+        finally:
+            self._discard_prefetched()
+        if stopped == "cancelled" or self._cancelled():
+            return None
+        if stopped == "stop":
+            return False
+        return result
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False)
+            self._pool = None
+
+
+def _in_trace(trace, fn, *args):
+    with TRACER.attached(trace):
+        return fn(*args)
+
+
+def _angle_moved(a, b) -> float:
+    """Largest yaw/pitch change between two (yaw, pitch) views, in degrees."""
+    dyaw = abs((a[0] - b[0] + 180) % 360 - 180)
+    return max(dyaw, abs(a[1] - b[1]))
+
+
+if __name__ == "__main__":
+    print(json.dumps(DEFAULT_PLANS, indent=2, ensure_ascii=False))
@@ -0,0 +1,170 @@
+"""
+Plan multi-farm tours instead of one home round trip per farm job.
+
+When several `farm home` jobs are waiting, the bot visits all of the farms
+in one tour and only goes home at the end. Stops are ordered with a
+nearest-neighbour start, then 2-opt and single-stop moves over estimated
+travel times. The estimates come from a TravelModel that learns from
+finished `goto` trips: a running average speed, plus per-leg timings for
+routes walked before (the actual path can be much longer than the straight
+line).
+"""
+
+import json
+import math
+import os
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+Point = Tuple[float, float, float]
+
+# Legs are remembered between 16-block cells, so nearby start/end points share timings
+LEG_CELL = 16
+
+
+def _cell(p: Point) -> Tuple[int, int, int]:
+    return tuple(math.floor(c) // LEG_CELL for c in p)
+
+
+class TravelModel:
+    """Travel-time estimates learned from past goto timings."""
+
+    def __init__(self, path: Optional[str] = None, speed: float = 4.3, overhead: float = 1.0,
+                 alpha: float = 0.3):
+        self.path = path
+        self.speed = speed          # blocks/second, running average
+        self.overhead = overhead    # seconds of Baritone path calculation per goto
+        self.alpha = alpha
+        self._legs: Dict[str, float] = {}
+        if path and os.path.exists(path):
+            try:
+                with open(path, 'r') as f:
+                    saved = json.load(f)
+                self.speed = saved.get("speed", speed)
+                self._legs = saved.get("legs", {})
+            except (OSError, ValueError) as e:
+                print(f"⚠️ Ignoring unreadable travel times {path}: {e}")
+
+    @staticmethod
+    def _key(a: Point, b: Point) -> str:
+        return f"{_cell(a)}->{_cell(b)}"
+
+    def estimate(self, a: Point, b: Point) -> float:
+        """Seconds to walk from a to b."""
+        if _cell(a) == _cell(b):
+            return 0.0
+        known = self._legs.get(self._key(a, b))
+        if known is not None:
+            return known
+        return self.overhead + math.dist(a, b) / max(self.speed, 0.1)
+
+    def record(self, a: Point, b: Point, seconds: float):
+        """Learn from one finished trip a -> b."""
+        distance = math.dist(a, b)
+        if seconds <= 0 or distance < LEG_CELL:
+            return
+        key = self._key(a, b)
+        old = self._legs.get(key)
+        self._legs[key] = seconds if old is None else old + self.alpha * (seconds - old)
+        observed = distance / max(seconds - self.overhead, 0.1)
+        self.speed += self.alpha * (observed - self.speed)
+        self.save()
+
+    def save(self):
+        if not self.path:
+            return
+        tmp = self.path + ".tmp"
+        try:
+            with open(tmp, 'w') as f:
+                json.dump({"speed": self.speed, "legs": self._legs}, f)
+            os.replace(tmp, self.path)
+        except OSError as e:
+            print(f"⚠️ Could not save travel times: {e}")
+
+
+class RoutePlan(NamedTuple):
+    order: List[int]          # indices into the stops, in visiting order
+    distance: float           # blocks, start -> stops -> end
+    time: float               # estimated seconds of walking
+    baseline_distance: float  # blocks for home -> farm -> home per stop, in request order
+    baseline_time: float
+
+    @property
+    def distance_saved(self) -> float:
+        return self.baseline_distance - self.distance
+
+    @property
+    def time_saved(self) -> float:
+        return self.baseline_time - self.time
+
+    def summary(self) -> str:
+        return (f"{len(self.order)} farm(s), {self.distance:.0f} blocks, ~{self.time / 60:.1f} min "
+                f"(saves {self.distance_saved:.0f} blocks, ~{self.time_saved / 60:.1f} min "
+                f"vs one home trip per farm)")
+
+
+class RoutePlanner:
+    """Order farm stops between a start point and home."""
+
+    def __init__(self, model: Optional[TravelModel] = None):
+        self.model = model or TravelModel()
+        self.total_distance_saved = 0.0
+        self.total_time_saved = 0.0
+
+    def _path_cost(self, path: Sequence[Point]) -> float:
+        return sum(self.model.estimate(a, b) for a, b in zip(path, path[1:]))
+
+    def _nearest_neighbour(self, start: Point, stops: Sequence[Point]) -> List[int]:
+        remaining = list(range(len(stops)))
+        order = []
+        here = start
+        while remaining:
+            nxt = min(remaining, key=lambda i: self.model.estimate(here, stops[i]))
+            remaining.remove(nxt)
+            order.append(nxt)
+            here = stops[nxt]
+        return order
+
+    def _two_opt(self, start: Point, end: Point, stops: Sequence[Point], order: List[int]) -> List[int]:
+        # Costs may be asymmetric (learned legs), so score whole paths rather
+        # than the usual two-edge delta; tours are a handful of stops
+        best = order
+        best_cost = self._path_cost([start] + [stops[i] for i in best] + [end])
+        improved = True
+        while improved:
+            improved = False
+            for i in range(len(best) - 1):
+                for j in range(i + 1, len(best)):
+                    candidate = best[:i] + best[i:j + 1][::-1] + best[j + 1:]
+                    cost = self._path_cost([start] + [stops[k] for k in candidate] + [end])
+                    if cost < best_cost - 1e-9:
+                        best, best_cost = candidate, cost
+                        improved = True
+            # Or-opt: move a single stop elsewhere, which 2-opt alone can't
+            # do without reversing the segment in between
+            for i in range(len(best)):
+                rest = best[:i] + best[i + 1:]
+                for j in range(len(rest) + 1):
+                    candidate = rest[:j] + [best[i]] + rest[j:]
+                    cost = self._path_cost([start] + [stops[k] for k in candidate] + [end])
+                    if cost < best_cost - 1e-9:
+                        best, best_cost = candidate, cost
+                        improved = True
+                        break
+        return best
+
+    def plan(self, start: Point, stops: Sequence[Point], home: Point) -> RoutePlan:
+        """Visit every stop once, starting at `start` and ending at `home`."""
+        order = self._two_opt(start, home, stops, self._nearest_neighbour(start, stops))
+        path = [start] + [stops[i] for i in order] + [home]
+        distance = sum(math.dist(a, b) for a, b in zip(path, path[1:]))
+        baseline_distance = baseline_time = 0.0
+        here = start
+        for stop in stops:
+            baseline_distance += math.dist(here, stop) + math.dist(stop, home)
+            baseline_time += self.model.estimate(here, stop) + self.model.estimate(stop, home)
+            here = home
+        return RoutePlan(order, distance, self._path_cost(path), baseline_distance, baseline_time)
+
+    def record_plan(self, plan: RoutePlan):
+        self.total_distance_saved += plan.distance_saved
+        self.total_time_saved += plan.time_saved
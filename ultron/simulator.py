@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for Minecraft + the GameQuery mod, for testing and benchmarks.
+
+Speaks the same newline-delimited JSON protocol on a TCP port and simulates
+one player: `#goto` walks toward the target at a fixed speed, `#farm` "farms"
+for a while and then reports `goal reached` (or `Farm failed`), and chat is
+written to a fake latest.log in the real log format, so the listener, MCBot and
+the log tailer all run unmodified against it.
+
+    ultron-sim [--port 25566] [--log sim/latest.log] [--speed 5] [--latency-ms 0]
+"""
+
+import argparse
+import math
+import os
+import random
+import socket
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from .codec import get_codec
+
+TICK = 0.05  # 20 ticks per second, like the game
+
+Point = Tuple[float, float, float]
+
+
+class SimWorld:
+    """Deterministic terrain plus a few placed blocks (beds, chests, ...)."""
+
+    def __init__(self, ground: int = 59):
+        self.ground = ground
+        self.placed: Dict[Tuple[int, int, int], str] = {}
+
+    def place(self, x: int, y: int, z: int, kind: str):
+        self.placed[(int(x), int(y), int(z))] = kind
+
+    def block(self, x: int, y: int, z: int) -> str:
+        kind = self.placed.get((x, y, z))
+        if kind is not None:
+            return kind
+        if y < self.ground:
+            return "stone"
+        if y == self.ground:
+            return "grass_block"
+        if y == self.ground + 1 and (x * 7 + z * 3) % 23 == 0:
+            return "wheat"
+        return "air"
+
+    def nearest(self, kind: str, pos: Point) -> Optional[Tuple[int, int, int]]:
+        hits = [c for c, k in self.placed.items() if k == kind]
+        return min(hits, key=lambda c: math.dist(c, pos)) if hits else None
+
+
+class SimPlayer:
+    """The simulated player; moves on a tick thread so log lines appear on time."""
+
+    def __init__(self, world: SimWorld, log_path: str, name: str = "SimBot", spawn: Point = (0, 60, 0),
+                 speed: float = 5.0, farm_time: float = 5.0, fail_rate: float = 0.0):
+        self.world = world
+        self.log_path = log_path
+        self.name = name
+        self.pos = [float(c) for c in spawn]
+        self.yaw = 0.0
+        self.pitch = 0.0
+        self.health = 20.0
+        self.food = 20
+        self.speed = speed
+        self.farm_time = farm_time
+        self.fail_rate = fail_rate
+        self.inventory: Dict[int, Tuple[str, int]] = {0: ("wheat", 32), 1: ("wheat_seeds", 12), 2: ("iron_ingot", 5)}
+        self.target: Optional[Point] = None
+        self.farm_until: Optional[float] = None
+        self.settings: Dict[str, str] = {}
+        self.lock = threading.Lock()
+        self._rng = random.Random(7)
+        os.makedirs(os.path.dirname(os.path.abspath(log_path)), exist_ok=True)
+        self._log = open(log_path, 'a', buffering=1, encoding='utf-8')
+        self._log_lock = threading.Lock()
+
+    # --- Log ---
+
+    def log(self, message: str, thread: str = "Render thread"):
+        with self._log_lock:
+            self._log.write(f"[{time.strftime('%H:%M:%S')}] [{thread}/INFO]: {message}\n")
+
+    def say(self, user: str, msg: str):
+        """Another player says something in public chat."""
+        self.log(f"[CHAT] <{user}> {msg}")
+
+    def whisper(self, user: str, msg: str):
+        self.log(f"[CHAT] {user} whispers to you: {msg}")
+
+    # --- Simulation ---
+
+    def tick(self, dt: float):
+        with self.lock:
+            if self.target is not None:
+                remaining = math.dist(self.pos, self.target)
+                step = self.speed * dt
+                if remaining <= step:
+                    self.pos = list(self.target)
+                    self.target = None
+                    self.log("[CHAT] [Baritone] Goal reached")
+                else:
+                    self.pos = [p + (t - p) * step / remaining for p, t in zip(self.pos, self.target)]
+            if self.farm_until is not None and time.monotonic() >= self.farm_until:
+                self.farm_until = None
+                if self._rng.random() < self.fail_rate:
+                    self.log("[CHAT] [Baritone] Farm failed")
+                else:
+                    self.log("[CHAT] [Baritone] Farm goal reached")
+
+    def command(self, message: str):
+        """Handle a chat message sent by the bot (Baritone commands start with #)."""
+        if not message.startswith("#"):
+            self.log(f"[CHAT] <{self.name}> {message}")
+            return
+        words = message[1:].split()
+        if not words:
+            return
+        with self.lock:
+            name, args = words[0].lower(), words[1:]
+            if name == "goto":
+                self.farm_until = None
+                if len(args) == 3:
+                    try:
+                        self.target = tuple(float(a) for a in args)
+                    except ValueError:
+                        self.target = None
+                elif args:
+                    found = self.world.nearest(args[0], tuple(self.pos))
+                    if found is None:
+                        self.log(f"[CHAT] [Baritone] No locations found for {args[0]}")
+                    else:
+                        # Stand next to it, like Baritone does
+                        self.target = (found[0] + 1, found[1], found[2])
+            elif name == "farm":
+                self.target = None
+                self.farm_until = time.monotonic() + self.farm_time
+            elif name in ("stop", "cancel"):
+                self.target = None
+                self.farm_until = None
+            elif name == "settings" and len(args) >= 2:
+                self.settings[args[0]] = args[1]
+            self.log(f"[CHAT] [Baritone] {message[1:]}")
+
+    # --- Queries ---
+
+    def handle(self, query: Dict[str, Any]) -> Dict[str, Any]:
+        kind = query.get("type")
+        if kind == "position":
+            with self.lock:
+                x, y, z = self.pos
+                return {"position": {"x": x, "y": y, "z": z, "yaw": self.yaw, "pitch": self.pitch,
+                                     "health": self.health, "maxHealth": 20.0, "food": self.food,
+                                     "level": 3, "experience": 42}}
+        if kind == "send_chat":
+            self.command(str(query.get("message", "")))
+            return {"result": {"success": True, "message": "Message sent"}}
+        if kind == "get_block":
+            x, y, z = int(query.get("x", 0)), int(query.get("y", 0)), int(query.get("z", 0))
+            return {"block": {"type": f"Block{{minecraft:{self.world.block(x, y, z)}}}", "x": x, "y": y, "z": z}}
+        if kind == "blocks":
+            r = int(query.get("range", 5))
+            with self.lock:
+                cx, cy, cz = (math.floor(c) for c in self.pos)
+            blocks = []
+            for x in range(cx - r, cx + r + 1):
+                for y in range(cy - r, cy + r + 1):
+                    for z in range(cz - r, cz + r + 1):
+                        block = self.world.block(x, y, z)
+                        if block != "air":
+                            blocks.append({"type": f"Block{{minecraft:{block}}}", "x": x, "y": y, "z": z})
+            return {"blocks": {"blocks": blocks}}
+        if kind == "rotate":
+            with self.lock:
+                self.yaw = float(query.get("yaw", self.yaw))
+                self.pitch = float(query.get("pitch", self.pitch))
+            return {"result": {"success": True, "message": "Player rotated"}}
+        if kind == "point_to_xyz":
+            with self.lock:
+                dx, dy, dz = (float(query.get(k, 0)) - p for k, p in zip("xyz", self.pos))
+                self.yaw = math.degrees(math.atan2(-dx, dz))
+                self.pitch = -math.degrees(math.atan2(dy, math.hypot(dx, dz)))
+            return {"result": {"success": True}}
+        if kind in ("right_click", "left_click", "attack", "open_container"):
+            return {"result": {"success": True}}
+        if kind == "inventory":
+            with self.lock:
+                items = [{"slot": slot, "item": f"minecraft:{item}", "count": count}
+                         for slot, (item, count) in sorted(self.inventory.items())]
+            return {"inventory": {"items": items}}
+        if kind == "drop_item":
+            with self.lock:
+                if "slot" in query:
+                    item = self.inventory.pop(int(query["slot"]), None)
+                    if item is None:
+                        return {"result": {"success": False, "error": "Slot is empty"}}
+                    return {"result": {"success": True, "message": f"Dropped {item[1]} {item[0]}"}}
+                name = str(query.get("name", "")).lower()
+                slots = [s for s, (item, _) in self.inventory.items() if name in item]
+                for slot in slots:
+                    del self.inventory[slot]
+                if not slots:
+                    return {"result": {"success": False, "error": f"No items matching {name}"}}
+                return {"result": {"success": True, "message": f"Dropped {len(slots)} stacks"}}
+        return {"error": f"Unknown query type: {kind}"}
+
+    def close(self):
+        self._log.close()
+
+
+class SimServer:
+    """Threaded TCP server for one SimPlayer, with optional injected latency."""
+
+    def __init__(self, player: SimPlayer, host: str = "127.0.0.1", port: int = 25566,
+                 latency: float = 0.0, jitter: float = 0.0):
+        self.player = player
+        self.latency = latency
+        self.jitter = jitter
+        self.queries = 0
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._sock.bind((host, port))
+        self._sock.listen(64)
+        self.host, self.port = self._sock.getsockname()
+        self._running = True
+        self._rng = random.Random(11)
+
+    def start(self) -> "SimServer":
+        threading.Thread(target=self._accept, name="sim-accept", daemon=True).start()
+        threading.Thread(target=self._tick, name="sim-tick", daemon=True).start()
+        return self
+
+    def _tick(self):
+        last = time.monotonic()
+        while self._running:
+            time.sleep(TICK)
+            now = time.monotonic()
+            self.player.tick(now - last)
+            last = now
+
+    def _accept(self):
+        while self._running:
+            try:
+                conn, _ = self._sock.accept()
+            except OSError:
+                return
+            conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            threading.Thread(target=self._serve, args=(conn,), daemon=True).start()
+
+    def _serve(self, conn: socket.socket):
+        reader = conn.makefile('rb')
+        codec = get_codec()
+        try:
+            for line in reader:
+                if not line.strip():
+                    continue
+                try:
+                    reply = self.player.handle(codec.decode(line))
+                except (ValueError, TypeError) as e:
+                    reply = {"error": f"Bad query: {e}"}
+                self.queries += 1
+                delay = self.latency + (self._rng.random() * self.jitter if self.jitter else 0.0)
+                if delay > 0:
+                    time.sleep(delay)
+                conn.sendall(codec.encode_line(reply))
+        except OSError:
+            pass
+        finally:
+            reader.close()
+            conn.close()
+
+    def close(self):
+        self._running = False
+        self._sock.close()
+
+
+def start_simulator(log_path: str, port: int = 0, speed: float = 5.0, farm_time: float = 5.0,
+                    fail_rate: float = 0.0, latency: float = 0.0, jitter: float = 0.0,
+                    spawn: Point = (0, 60, 0)) -> SimServer:
+    """Start a simulator in background threads (port 0 = any free port)."""
+    world = SimWorld(ground=int(spawn[1]) - 1)
+    # A bed and a chest next to spawn so #goto white_bed / #goto chest work
+    world.place(int(spawn[0]) + 3, int(spawn[1]), int(spawn[2]), "white_bed")
+    world.place(int(spawn[0]) - 3, int(spawn[1]), int(spawn[2]), "chest")
+    player = SimPlayer(world, log_path, spawn=spawn, speed=speed, farm_time=farm_time, fail_rate=fail_rate)
+    return SimServer(player, port=port, latency=latency, jitter=jitter).start()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local GameQuery simulator")
+    parser.add_argument("--port", type=int, default=25566)
+    parser.add_argument("--log", default=os.path.join("sim", "latest.log"))
+    parser.add_argument("--speed", type=float, default=5.0, help="walking speed in blocks/s")
+    parser.add_argument("--farm-time", type=float, default=5.0, help="seconds #farm takes")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="chance #farm fails")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="delay added to every reply")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="random extra delay, up to this much")
+    parser.add_argument("--spawn", type=float, nargs=3, default=(0, 60, 0))
+    args = parser.parse_args()
+
+    server = start_simulator(args.log, args.port, args.speed, args.farm_time, args.fail_rate,
+                             args.latency_ms / 1000, args.jitter_ms / 1000, tuple(args.spawn))
+    print(f"🧪 Simulator listening on {server.host}:{server.port}, writing {args.log}")
+    print("   Type '<user> <message>' to inject chat, Ctrl+C to quit")
+    try:
+        while True:
+            line = input()
+            user, _, msg = line.partition(" ")
+            if msg:
+                server.player.say(user, msg)
+    except (KeyboardInterrupt, EOFError):
+        print("\n👋 Simulator stopped")
+    finally:
+        server.close()
+        server.player.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,248 @@
+"""
+Shared player-state sampling.
+
+Every routine used to send its own `position` query, so two routines (or
+goto plus get_player_status) polling together doubled the traffic. A
+TelemetrySampler sits in front of the `position` query:
+
+  * reads within `ttl` seconds of the last sample are served from cache
+  * concurrent reads while a query is on the wire wait for that reply
+    instead of sending another (request coalescing)
+  * an optional background thread publishes each PlayerState to subscribers.
+    While readers are polling it follows their cadence and only queries when
+    nobody else refreshed the state in time, so it never outpaces a sparse
+    (e.g. ETA-based) poller; with no readers it polls faster while the
+    player moves and backs off when idle
+"""
+
+import math
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+
+class PlayerState:
+    """One `position` reply. Unpacks like the old 10-tuple
+    (x, y, z, yaw, pitch, health, max_health, food, level, experience)."""
+    __slots__ = ("x", "y", "z", "yaw", "pitch", "health", "max_health", "food", "level",
+                 "experience", "sampled_at")
+
+    def __init__(self, x: float, y: float, z: float, yaw: float = 0.0, pitch: float = 0.0,
+                 health: float = 0.0, max_health: float = 0.0, food: int = 0, level: int = 0,
+                 experience: int = 0, sampled_at: Optional[float] = None):
+        self.x = x
+        self.y = y
+        self.z = z
+        self.yaw = yaw
+        self.pitch = pitch
+        self.health = health
+        self.max_health = max_health
+        self.food = food
+        self.level = level
+        self.experience = experience
+        self.sampled_at = time.monotonic() if sampled_at is None else sampled_at
+
+    @classmethod
+    def from_reply(cls, pos: Dict[str, Any]) -> "PlayerState":
+        return cls(pos.get('x', 0), pos.get('y', 0), pos.get('z', 0), pos.get('yaw', 0), pos.get('pitch', 0),
+                   pos.get('health', 0), pos.get('maxHealth', 0), pos.get('food', 0), pos.get('level', 0),
+                   pos.get('experience', 0))
+
+    @property
+    def pos(self):
+        return self.x, self.y, self.z
+
+    @property
+    def age(self) -> float:
+        return time.monotonic() - self.sampled_at
+
+    def distance_to(self, other) -> float:
+        return math.dist(self.pos, tuple(other)[:3])
+
+    # Tuple compatibility for callers that unpack or index get_position()
+    def __iter__(self):
+        return iter((self.x, self.y, self.z, self.yaw, self.pitch, self.health, self.max_health,
+                     self.food, self.level, self.experience))
+
+    def __len__(self):
+        return 10
+
+    def __getitem__(self, index):
+        return tuple(self)[index]
+
+    def __eq__(self, other):
+        if isinstance(other, PlayerState):
+            return tuple(self) == tuple(other)
+        return NotImplemented
+
+    def __repr__(self):
+        return (f"PlayerState(pos=({self.x:.1f}, {self.y:.1f}, {self.z:.1f}), "
+                f"health={self.health:.1f}/{self.max_health:.1f}, food={self.food})")
+
+
+class _Fetch:
+    """A `position` query on the wire, shared by every reader that arrives meanwhile."""
+    __slots__ = ("done", "state")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.state: Optional[PlayerState] = None
+
+
+# Gaps between reads longer than this many max_intervals start a new cadence estimate
+CADENCE_RESET = 4
+
+
+class TelemetrySampler:
+    """TTL cache, request coalescing and optional background polling for
+    one client's `position` query."""
+
+    def __init__(self, fetch: Callable[[], Optional[PlayerState]], ttl: float = 0.1,
+                 min_interval: float = 0.25, max_interval: float = 2.0):
+        self.fetch = fetch
+        self.ttl = ttl
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.latest: Optional[PlayerState] = None
+        self.hits = 0
+        self.coalesced = 0
+        self.fetches = 0
+        self.background_fetches = 0
+        self._lock = threading.Lock()
+        self._inflight: Optional[_Fetch] = None
+        self._last_read = 0.0
+        self._read_gap: Optional[float] = None  # smoothed seconds between reads
+        self._subscribers: List[Callable[[PlayerState], None]] = []
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def get(self, max_age: Optional[float] = None) -> Optional[PlayerState]:
+        """Latest state no older than `max_age` (default: the TTL)."""
+        return self._get(self.ttl if max_age is None else max_age, reader=True)
+
+    def _get(self, max_age: float, reader: bool) -> Optional[PlayerState]:
+        now = time.monotonic()
+        with self._lock:
+            if reader:
+                self._note_read(now)
+            state = self.latest
+            if state is not None and now - state.sampled_at <= max_age:
+                self.hits += reader
+                return state
+            inflight = self._inflight
+            if inflight is None:
+                inflight = self._inflight = _Fetch()
+                leader = True
+                self.background_fetches += not reader
+            else:
+                self.coalesced += reader
+                leader = False
+        if not leader:
+            inflight.done.wait()
+            return inflight.state
+        return self._refresh(inflight)
+
+    def _note_read(self, now: float):
+        gap = now - self._last_read
+        if gap > CADENCE_RESET * self.max_interval:
+            self._read_gap = None
+        elif gap > 0:
+            self._read_gap = gap if self._read_gap is None else (self._read_gap + gap) / 2
+        self._last_read = now
+
+    def reader_cadence(self, now: Optional[float] = None) -> Optional[float]:
+        """Seconds between reads while someone is polling, else None."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            # One read so far: assume the slowest pace until a second one shows the real one
+            gap = self.max_interval if self._read_gap is None else self._read_gap
+            if now - self._last_read > max(2 * gap, self.max_interval):
+                return None
+            return gap
+
+    def _refresh(self, inflight: _Fetch) -> Optional[PlayerState]:
+        state = None
+        try:
+            state = self.fetch()
+        finally:
+            with self._lock:
+                self.fetches += 1
+                if state is not None:
+                    self.latest = state
+                self._inflight = None
+                subscribers = list(self._subscribers)
+            inflight.state = state
+            inflight.done.set()
+        if state is None:
+            return None
+        for callback in subscribers:
+            try:
+                callback(state)
+            except Exception as e:
+                print(f"⚠️ Telemetry subscriber {getattr(callback, '__name__', callback)} failed: {e}")
+        return state
+
+    def invalidate(self):
+        """Force the next read onto the wire (e.g. right after a teleport)."""
+        with self._lock:
+            self.latest = None
+
+    # --- Subscribers ---
+
+    def subscribe(self, callback: Callable[[PlayerState], None]):
+        """Call `callback(state)` for every new sample, from whichever thread fetched it."""
+        with self._lock:
+            self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable[[PlayerState], None]):
+        with self._lock:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+
+    # --- Background polling ---
+
+    def start(self) -> threading.Thread:
+        if self._thread is not None and self._thread.is_alive():
+            return self._thread
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="telemetry", daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.max_interval + 1)
+            self._thread = None
+
+    def _run(self):
+        interval = self.min_interval
+        max_age = interval / 2
+        previous = None
+        while not self._stop.is_set():
+            state = self._get(max_age, reader=False)
+            moving = (state is not None and previous is not None
+                      and math.dist(state.pos, previous.pos) > 0.1)
+            cadence = self.reader_cadence()
+            if cadence is not None:
+                # Readers keep the state fresh themselves; only step in once
+                # they've missed a whole beat
+                interval = max(cadence, self.min_interval)
+                max_age = 2 * interval
+            else:
+                interval = self.min_interval if moving else min(interval * 2, self.max_interval)
+                max_age = interval / 2
+            previous = state or previous
+            self._stop.wait(interval)
+
+    def stats(self) -> Dict[str, Any]:
+        # `fetches` is every `position` query sent; background ones aren't reads
+        reads = self.hits + self.coalesced + self.fetches - self.background_fetches
+        return {
+            "reads": reads,
+            "fetches": self.fetches,
+            "background_fetches": self.background_fetches,
+            "cache_hits": self.hits,
+            "coalesced": self.coalesced,
+            "saved": (self.hits + self.coalesced) / reads if reads else 0.0,
+        }
@@ -0,0 +1,180 @@
+"""
+Step-level tracing of bot routines in Chrome trace-event format.
+
+A routine (farm run, sleep, get_iron, ...) opens a root trace; everything it
+does (each plan step, goto, poll waits, each send_query) records nested spans.
+Spans are per thread, so work handed to other threads carries the trace
+along: chat messages record their send on the chat-queue thread, and plan
+steps and prefetches run on pool threads under attached(). When the root
+ends, its events are written to TRACE_DIR as JSON that opens in
+chrome://tracing or Perfetto.
+
+Only a TRACE_SAMPLE fraction of routines is traced (default 0 = off). Spans
+outside a sampled trace cost one thread-local lookup, so tracing can stay
+enabled under load.
+"""
+
+import itertools
+import json
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+from typing import Any, Callable, Dict, List, Optional
+
+# Cap per trace so a routine stuck in a polling loop can't grow without bound
+MAX_EVENTS = 100_000
+
+
+class _NullSpan:
+    """Returned when the current thread isn't being traced."""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def set(self, **args):
+        pass
+
+
+NULL_SPAN = _NullSpan()
+
+
+class _Trace:
+    __slots__ = ("name", "events", "dropped", "closed")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.events: List[Dict[str, Any]] = []
+        self.dropped = 0
+        self.closed = False
+
+
+class _Span:
+    __slots__ = ("tracer", "trace", "name", "cat", "args", "start", "root")
+
+    def __init__(self, tracer: "Tracer", trace: _Trace, name: str, cat: str, args: Dict[str, Any], root: bool):
+        self.tracer = tracer
+        self.trace = trace
+        self.name = name
+        self.cat = cat
+        self.args = args
+        self.root = root
+
+    def set(self, **args):
+        """Attach extra arguments (shown in the viewer's detail pane)."""
+        self.args.update(args)
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end = time.perf_counter_ns()
+        trace = self.trace
+        if exc_type is not None:
+            self.args["error"] = f"{exc_type.__name__}: {exc}"
+        if trace.closed:
+            return False  # a worker outlived the routine that traced it
+        if len(trace.events) < MAX_EVENTS:
+            trace.events.append({
+                "name": self.name, "cat": self.cat, "ph": "X",
+                "ts": (self.start - self.tracer.epoch) / 1000, "dur": (end - self.start) / 1000,
+                "pid": self.tracer.pid, "tid": threading.get_ident(),
+                "args": self.args,
+            })
+        else:
+            trace.dropped += 1
+        if self.root:
+            self.tracer._finish(trace)
+        return False
+
+
+class Tracer:
+    """Per-thread span recorder with per-routine sampling."""
+
+    def __init__(self, directory: str = "traces", sample_rate: float = 0.0):
+        self.directory = directory
+        self.sample_rate = sample_rate
+        self.epoch = time.perf_counter_ns()
+        self.pid = os.getpid()
+        self.written: List[str] = []
+        self._local = threading.local()
+        self._rng = random.Random()
+        self._seq = itertools.count(1)
+
+    @property
+    def active(self) -> bool:
+        return getattr(self._local, "trace", None) is not None
+
+    def span(self, name: str, cat: str = "step", **args):
+        """Nested span inside the current trace; a no-op outside one."""
+        trace = getattr(self._local, "trace", None)
+        if trace is None:
+            return NULL_SPAN
+        return _Span(self, trace, name, cat, args, root=False)
+
+    def trace(self, name: str, cat: str = "routine", **args):
+        """Start a root trace (sampled), or a nested span if one is running."""
+        trace = getattr(self._local, "trace", None)
+        if trace is not None:
+            return _Span(self, trace, name, cat, args, root=False)
+        if self.sample_rate <= 0 or self._rng.random() >= self.sample_rate:
+            return NULL_SPAN
+        trace = self._local.trace = _Trace(name)
+        return _Span(self, trace, name, cat, args, root=True)
+
+    def current(self) -> Optional[_Trace]:
+        """This thread's running trace, to hand to work it starts on other threads."""
+        return getattr(self._local, "trace", None)
+
+    @contextmanager
+    def attached(self, trace: Optional[_Trace]):
+        """Record this thread's spans into `trace` (from current()) for the
+        duration of the block, without ending it here."""
+        if trace is None or self.active:
+            yield
+            return
+        self._local.trace = trace
+        try:
+            yield
+        finally:
+            self._local.trace = None
+
+    def traced(self, name: Optional[str] = None, cat: str = "routine") -> Callable:
+        """Decorator form of trace()."""
+        def wrap(fn):
+            label = name or fn.__name__
+
+            @wraps(fn)
+            def run(*args, **kwargs):
+                with self.trace(label, cat):
+                    return fn(*args, **kwargs)
+            return run
+        return wrap
+
+    def _finish(self, trace: _Trace):
+        self._local.trace = None
+        trace.closed = True
+        if trace.dropped:
+            print(f"⚠️ Trace {trace.name} dropped {trace.dropped} events (limit {MAX_EVENTS})")
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        safe = "".join(c if c.isalnum() else "-" for c in trace.name)
+        path = os.path.join(self.directory, f"{safe}-{stamp}-{next(self._seq)}.json")
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(path, 'w') as f:
+                json.dump({"traceEvents": list(trace.events), "displayTimeUnit": "ms"}, f)
+        except OSError as e:
+            print(f"⚠️ Could not write trace {path}: {e}")
+            return
+        self.written.append(path)
+        print(f"🧵 Trace written to {path} ({len(trace.events)} spans)")
+
+
+TRACER = Tracer(os.environ.get("TRACE_DIR", "traces"), float(os.environ.get("TRACE_SAMPLE", "0")))
@@ -0,0 +1,294 @@
+"""
+Client-side cache of `blocks` scans, keyed by 16x16x16 chunk section.
+
+Every scan is stored per section along with the box it covered and when, so
+the cache knows which parts of the world it has fresh data for. Each block
+type also gets a grid index (section -> block coordinates), so "nearest
+white_bed / chest / wheat" searches outward section by section instead of
+looping over every block and string-comparing its type.
+
+The mod can only scan a cube around the player, so a refresh is one `blocks`
+query; find_nearest() just skips it while the cube around the player is
+still fresh.
+
+The cache is shared by the listener, the job worker and the asyncio loop,
+so every read and update holds one lock.
+"""
+
+import math
+import re
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+SECTION = 16
+
+Coord = Tuple[int, int, int]
+Box = Tuple[Coord, Coord]  # inclusive (lo, hi)
+
+_TYPE_PATTERN = re.compile(r"^(?:block\{)?(?:minecraft:)?([^}\[]+)")
+
+
+def block_type(raw: str) -> str:
+    """'Block{minecraft:white_bed}' -> 'white_bed'."""
+    m = _TYPE_PATTERN.match(raw.strip().lower())
+    return m.group(1) if m else raw.lower()
+
+
+def scanned_blocks(reply: Optional[Dict[str, Any]]) -> Optional[List[Dict[str, Any]]]:
+    """Block list of a `blocks` reply, or None if the scan failed. An empty
+    list is a real scan of nothing but air; None must not be ingested."""
+    if not reply or "error" in reply:
+        return None
+    blocks = reply.get("blocks")
+    if isinstance(blocks, dict):
+        blocks = blocks.get("blocks")
+    return blocks if isinstance(blocks, list) else None
+
+
+def section_of(x: float, y: float, z: float) -> Coord:
+    return (math.floor(x) // SECTION, math.floor(y) // SECTION, math.floor(z) // SECTION)
+
+
+def _section_box(key: Coord) -> Box:
+    lo = (key[0] * SECTION, key[1] * SECTION, key[2] * SECTION)
+    return lo, (lo[0] + SECTION - 1, lo[1] + SECTION - 1, lo[2] + SECTION - 1)
+
+
+def _clip(box: Box, other: Box) -> Optional[Box]:
+    lo = tuple(max(a, b) for a, b in zip(box[0], other[0]))
+    hi = tuple(min(a, b) for a, b in zip(box[1], other[1]))
+    if any(l > h for l, h in zip(lo, hi)):
+        return None
+    return lo, hi
+
+
+def _contains(outer: Box, inner: Box) -> bool:
+    return all(o <= i for o, i in zip(outer[0], inner[0])) and all(i <= o for o, i in zip(outer[1], inner[1]))
+
+
+def _inside(coord: Coord, box: Box) -> bool:
+    return all(l <= c <= h for c, l, h in zip(coord, box[0], box[1]))
+
+
+def _sections_in(box: Box) -> Iterator[Coord]:
+    lo, hi = section_of(*box[0]), section_of(*box[1])
+    for sx in range(lo[0], hi[0] + 1):
+        for sy in range(lo[1], hi[1] + 1):
+            for sz in range(lo[2], hi[2] + 1):
+                yield sx, sy, sz
+
+
+def _ring(center: Coord, k: int) -> Iterator[Coord]:
+    """Sections at Chebyshev distance exactly `k` from `center`."""
+    cx, cy, cz = center
+    if k == 0:
+        yield center
+        return
+    for dx in range(-k, k + 1):
+        for dy in range(-k, k + 1):
+            edge = abs(dx) == k or abs(dy) == k
+            for dz in ((range(-k, k + 1)) if edge else (-k, k)):
+                yield cx + dx, cy + dy, cz + dz
+
+
+class Section:
+    __slots__ = ("blocks", "scans")
+
+    def __init__(self, history: int = 4):
+        self.blocks: Dict[Coord, str] = {}
+        # (covered box clipped to this section, scan time), newest last
+        self.scans: Deque[Tuple[Box, float]] = deque(maxlen=history)
+
+
+class WorldCache:
+    """Sectioned block cache with per-type nearest-block indexes."""
+
+    def __init__(self, max_age: float = 60.0):
+        self.max_age = max_age
+        self._sections: Dict[Coord, Section] = {}
+        # type -> section -> coordinates of that type in the section
+        self._index: Dict[str, Dict[Coord, Set[Coord]]] = {}
+        # type -> [min section, max section] ever indexed, bounds the ring search
+        self._extent: Dict[str, List[List[int]]] = {}
+        self.hits = 0
+        self.refreshes = 0
+        self.failed_scans = 0
+        self._lock = threading.RLock()
+
+    # --- Updates ---
+
+    def _index_add(self, kind: str, key: Coord, coord: Coord):
+        self._index.setdefault(kind, {}).setdefault(key, set()).add(coord)
+        extent = self._extent.get(kind)
+        if extent is None:
+            self._extent[kind] = [list(key), list(key)]
+        else:
+            extent[0] = [min(a, b) for a, b in zip(extent[0], key)]
+            extent[1] = [max(a, b) for a, b in zip(extent[1], key)]
+
+    def _index_remove(self, kind: str, key: Coord, coord: Coord):
+        grid = self._index.get(kind)
+        if grid is None or key not in grid:
+            return
+        grid[key].discard(coord)
+        if not grid[key]:
+            del grid[key]
+            if not grid:
+                del self._index[kind]
+                del self._extent[kind]
+
+    def ingest(self, blocks: Iterable[Dict[str, Any]], center: Tuple[float, float, float], radius: int,
+               now: Optional[float] = None):
+        """Store one `blocks` scan of `radius` around `center`. Everything the
+        scan covered is replaced, so blocks that disappeared are dropped."""
+        now = time.monotonic() if now is None else now
+        cx, cy, cz = (math.floor(c) for c in center)
+        box: Box = ((cx - radius, cy - radius, cz - radius), (cx + radius, cy + radius, cz + radius))
+        with self._lock:
+            for key in _sections_in(box):
+                section = self._sections.get(key)
+                if section is None:
+                    section = self._sections[key] = Section()
+                covered = _clip(box, _section_box(key))
+                for coord in [c for c in section.blocks if _inside(c, covered)]:
+                    self._index_remove(section.blocks.pop(coord), key, coord)
+                section.scans.append((covered, now))
+            for block in blocks:
+                coord = (int(block.get('x', 0)), int(block.get('y', 0)), int(block.get('z', 0)))
+                kind = block_type(block.get('type', ''))
+                key = section_of(*coord)
+                section = self._sections.get(key)
+                if section is None:
+                    section = self._sections[key] = Section()
+                old = section.blocks.get(coord)
+                if old is not None:
+                    self._index_remove(old, key, coord)
+                section.blocks[coord] = kind
+                self._index_add(kind, key, coord)
+            self.refreshes += 1
+
+    def ingest_reply(self, reply: Optional[Dict[str, Any]], center: Tuple[float, float, float], radius: int,
+                     now: Optional[float] = None) -> bool:
+        """ingest() a raw `blocks` reply. A failed scan (no reply, an error)
+        leaves the cache as it was and returns False."""
+        blocks = scanned_blocks(reply)
+        if blocks is None:
+            with self._lock:
+                self.failed_scans += 1
+            print(f"⚠️ Block scan failed, keeping cached blocks: {(reply or {}).get('error', 'no reply')}")
+            return False
+        self.ingest(blocks, center, radius, now)
+        return True
+
+    def invalidate(self, center: Tuple[float, float, float], radius: int = 0):
+        """Forget scan times around `center` (e.g. after placing or breaking blocks)."""
+        cx, cy, cz = (math.floor(c) for c in center)
+        box: Box = ((cx - radius, cy - radius, cz - radius), (cx + radius, cy + radius, cz + radius))
+        with self._lock:
+            for key in _sections_in(box):
+                section = self._sections.get(key)
+                if section is not None:
+                    section.scans.clear()
+
+    def clear(self):
+        with self._lock:
+            self._sections.clear()
+            self._index.clear()
+            self._extent.clear()
+
+    # --- Queries ---
+
+    def is_fresh(self, center: Tuple[float, float, float], radius: int, now: Optional[float] = None) -> bool:
+        """True if every block within `radius` of `center` was scanned less
+        than max_age seconds ago."""
+        now = time.monotonic() if now is None else now
+        cx, cy, cz = (math.floor(c) for c in center)
+        box: Box = ((cx - radius, cy - radius, cz - radius), (cx + radius, cy + radius, cz + radius))
+        with self._lock:
+            for key in _sections_in(box):
+                section = self._sections.get(key)
+                if section is None:
+                    return False
+                wanted = _clip(box, _section_box(key))
+                if not any(now - t <= self.max_age and _contains(scanned, wanted) for scanned, t in section.scans):
+                    return False
+        return True
+
+    def block_at(self, x: int, y: int, z: int) -> Optional[str]:
+        with self._lock:
+            section = self._sections.get(section_of(x, y, z))
+            return None if section is None else section.blocks.get((x, y, z))
+
+    def nearest(self, kind: str, pos: Tuple[float, float, float],
+                max_distance: Optional[float] = None) -> Optional[Tuple[Coord, float]]:
+        """Nearest cached block of `kind` to `pos` as ((x, y, z), distance).
+
+        Searches rings of sections outward from the one containing `pos` and
+        stops as soon as no further ring can hold anything closer."""
+        with self._lock:
+            return self._nearest(block_type(kind), pos, max_distance)
+
+    def _nearest(self, kind: str, pos: Tuple[float, float, float],
+                 max_distance: Optional[float]) -> Optional[Tuple[Coord, float]]:
+        grid = self._index.get(kind)
+        if not grid:
+            return None
+        center = section_of(*pos)
+        lo, hi = self._extent[kind]
+        last_ring = max(max(abs(c - l), abs(c - h)) for c, l, h in zip(center, lo, hi))
+        if max_distance is not None:
+            last_ring = min(last_ring, int(max_distance // SECTION) + 1)
+        best: Optional[Coord] = None
+        best_d2 = math.inf if max_distance is None else max_distance * max_distance
+        for k in range(last_ring + 1):
+            # Anything in ring k is at least (k - 1) whole sections away
+            bound = max(k - 1, 0) * SECTION
+            if best is not None and bound * bound >= best_d2:
+                break
+            for key in _ring(center, k):
+                coords = grid.get(key)
+                if not coords:
+                    continue
+                for coord in coords:
+                    d2 = (coord[0] - pos[0]) ** 2 + (coord[1] - pos[1]) ** 2 + (coord[2] - pos[2]) ** 2
+                    if d2 < best_d2:
+                        best, best_d2 = coord, d2
+        if best is None:
+            return None
+        return best, math.sqrt(best_d2)
+
+    def count(self, kind: str) -> int:
+        with self._lock:
+            return sum(len(coords) for coords in self._index.get(block_type(kind), {}).values())
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "sections": len(self._sections),
+                "blocks": sum(len(s.blocks) for s in self._sections.values()),
+                "types": len(self._index),
+                "hits": self.hits,
+                "refreshes": self.refreshes,
+                "failed_scans": self.failed_scans,
+            }
+
+    # --- Client helpers ---
+
+    def find_nearest(self, client, kind: str, radius: int = 5) -> Optional[Tuple[Coord, float]]:
+        """Nearest `kind` within `radius` of the player, rescanning only when
+        the cube around the player isn't fresh in the cache."""
+        pos = client.get_position()
+        if pos is not None and self.is_fresh(pos[:3], radius):
+            with self._lock:
+                self.hits += 1
+            return self.nearest(kind, pos[:3], max_distance=radius * math.sqrt(3))
+        # Position and scan in one round trip so the scan's center is exact
+        position, scan = client.batch([{"type": "position"}, {"type": "blocks", "range": radius}])
+        pos = client.parse_position(position)
+        if pos is None:
+            return None
+        # On a failed scan, answer from whatever is still cached
+        self.ingest_reply(scan, pos[:3], radius)
+        return self.nearest(kind, pos[:3], max_distance=radius * math.sqrt(3))